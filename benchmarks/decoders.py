@@ -0,0 +1,35 @@
+"""
+Compare the generated decoders against dataclasses_json on the recorded conversation payload in
+``tests/data``.
+
+Usage: python benchmarks/decoders.py [pages]
+"""
+
+import json
+import sys
+import timeit
+import warnings
+from pathlib import Path
+
+from linkedin_messaging.api_objects import ConversationsResponse
+from linkedin_messaging.decoders import from_json
+
+warnings.simplefilter("ignore")
+
+payload = json.loads(
+    Path(__file__).parent.parent.joinpath("tests", "data", "conversations.json").read_text()
+)
+# A full page is 20 conversations.
+payload["elements"] = (payload["elements"] * 10)[:20]
+text = json.dumps(payload)
+
+assert ConversationsResponse.from_json(text) == from_json(ConversationsResponse, text)
+
+pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+baseline = timeit.timeit(lambda: ConversationsResponse.from_json(text), number=pages)
+generated = timeit.timeit(lambda: from_json(ConversationsResponse, text), number=pages)
+
+print(f"{pages} pages of {len(payload['elements'])} conversations ({len(text)} bytes each)")
+print(f"dataclasses_json: {baseline / pages * 1000:8.3f} ms/page")
+print(f"generated:        {generated / pages * 1000:8.3f} ms/page")
+print(f"speedup:          {baseline / generated:8.1f}x")
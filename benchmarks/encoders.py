@@ -0,0 +1,61 @@
+"""
+Compare the hand-written message encoders against ``to_dict`` and ``json.dumps``, which is what
+``send_message`` used to do.
+
+Usage: python benchmarks/encoders.py [messages]
+"""
+
+import json
+import sys
+import timeit
+
+from linkedin_messaging.api_objects import (
+    URN,
+    Attribute,
+    AttributedBody,
+    AttributeType,
+    MessageAttachmentCreate,
+    MessageCreate,
+    TextEntity,
+)
+from linkedin_messaging.encoders import encode_message_event
+
+message_create = MessageCreate(
+    AttributedBody(
+        "Hey @Jane, did you see the deck? I attached the latest version.",
+        [
+            Attribute(
+                4, 5, AttributeType(TextEntity(URN("urn:li:fs_miniProfile:ACoAAB9q8w7e6r5t")))
+            )
+        ],
+    ),
+    body="Hey @Jane, did you see the deck? I attached the latest version.",
+    attachments=[
+        MessageAttachmentCreate(
+            48213, URN("urn:li:digitalmediaAsset:C4D06AQH1"), "application/pdf", "deck.pdf"
+        )
+    ],
+)
+
+
+def baseline() -> bytes:
+    message_event = {
+        "eventCreate": {
+            "value": {
+                "com.linkedin.voyager.messaging.create.MessageCreate": message_create.to_dict()
+            }
+        }
+    }
+    return json.dumps(message_event).encode()
+
+
+assert baseline() == encode_message_event(message_create)
+
+messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+to_dict = timeit.timeit(baseline, number=messages)
+encoded = timeit.timeit(lambda: encode_message_event(message_create), number=messages)
+
+print(f"{messages} messages ({len(baseline())} bytes each)")
+print(f"to_dict + json.dumps: {to_dict / messages * 1e6:8.2f} µs/message")
+print(f"encode_message_event: {encoded / messages * 1e6:8.2f} µs/message")
+print(f"speedup:              {to_dict / encoded:8.1f}x")
@@ -0,0 +1,96 @@
+"""
+Compare the SSE parser against the previous ``readline`` loop of the event stream listener on
+the recorded stream in ``tests/data``.
+
+Usage: python benchmarks/sse.py [repetitions]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+from unittest import mock
+
+import aiohttp
+
+from linkedin_messaging.sse import SSEParser
+
+recorded = Path(__file__).parent.parent.joinpath("tests", "data", "realtime_stream.txt")
+repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+stream = recorded.read_bytes() * repetitions
+# Roughly the size of the chunks that aiohttp hands out when reading from a TLS socket.
+chunk_size = 16 * 1024
+
+
+def make_reader() -> aiohttp.StreamReader:
+    reader = aiohttp.StreamReader(mock.Mock(_reading_paused=False), 2**16)
+    for i in range(0, len(stream), chunk_size):
+        reader.feed_data(stream[i : i + chunk_size])
+    reader.feed_eof()
+    return reader
+
+
+async def readline_loop(reader: aiohttp.StreamReader) -> int:
+    frames = 0
+    while True:
+        line = await reader.readline()
+        if reader.at_eof():
+            break
+        if not line.startswith(b"data:"):
+            continue
+        json.loads(line.decode("utf-8")[6:])
+        frames += 1
+    return frames
+
+
+async def parser_loop(reader: aiohttp.StreamReader) -> int:
+    frames = 0
+    parser = SSEParser()
+    async for chunk in reader.iter_any():
+        for event in parser.feed(chunk):
+            json.loads(event.data)
+            frames += 1
+    return frames
+
+
+async def readline_only_loop(reader: aiohttp.StreamReader) -> int:
+    frames = 0
+    while True:
+        line = await reader.readline()
+        if reader.at_eof():
+            break
+        if line.startswith(b"data:"):
+            frames += 1
+    return frames
+
+
+async def parser_only_loop(reader: aiohttp.StreamReader) -> int:
+    frames = 0
+    parser = SSEParser()
+    async for chunk in reader.iter_any():
+        frames += len(parser.feed(chunk))
+    return frames
+
+
+async def measure(name: str, loop: Callable[[aiohttp.StreamReader], Coroutine[Any, Any, int]]):
+    reader = make_reader()
+    start = time.perf_counter()
+    frames = await loop(reader)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<24} {frames:>8} frames  {frames / elapsed:>10.0f} frames/s  "
+        f"{len(stream) / elapsed / 2**20:>7.1f} MiB/s"
+    )
+
+
+async def main():
+    print(f"{len(stream) / 2**20:.1f} MiB recorded stream, {chunk_size} byte chunks")
+    await measure("readline + json", readline_loop)
+    await measure("SSEParser + json", parser_loop)
+    await measure("readline only", readline_only_loop)
+    await measure("SSEParser only", parser_only_loop)
+
+
+asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Microbenchmarks for URN construction, hashing and dictionary lookups, compared against the
+previous (uncached, mutable) URN implementation.
+
+Usage: python benchmarks/urn.py [iterations]
+"""
+
+import sys
+import timeit
+from typing import Any
+
+from linkedin_messaging import URN
+
+
+class LegacyURN:
+    def __init__(self, urn_str: str):
+        urn_parts = urn_str.split(":")
+        self.prefix = ":".join(urn_parts[:-1])
+        self.id_parts = urn_parts[-1].strip("()").split(",")
+
+    def id_str(self) -> str:
+        return ",".join(self.id_parts)
+
+    def __hash__(self) -> int:
+        return hash(self.id_str())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, LegacyURN):
+            return False
+        return self.id_parts == other.id_parts
+
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+# The same handful of conversation and event URNs show up over and over in the event stream.
+urn_strs = [
+    f"urn:li:fs_event:(2-Y29udmVyc2F0aW9u{i % 50}==,2-ZXZlbnQ{i}==)" for i in range(1_000)
+] + [f"urn:li:fs_conversation:2-Y29udmVyc2F0aW9u{i % 50}==" for i in range(1_000)]
+
+
+def report(name: str, legacy: float, current: float):
+    per_op = 1e9 / iterations
+    print(
+        f"{name:<20} legacy {legacy * per_op:7.1f} ns  "
+        f"current {current * per_op:7.1f} ns  ({legacy / current:4.1f}x)"
+    )
+
+
+for cls in (LegacyURN, URN):
+    # Warm up the parse cache the same way that a running listener would.
+    for s in urn_strs:
+        cls(s)
+
+s = urn_strs[-1]
+report(
+    "construct",
+    timeit.timeit(lambda: LegacyURN(s), number=iterations),
+    timeit.timeit(lambda: URN(s), number=iterations),
+)
+
+legacy_urn, urn = LegacyURN(s), URN(s)
+report(
+    "hash",
+    timeit.timeit(lambda: hash(legacy_urn), number=iterations),
+    timeit.timeit(lambda: hash(urn), number=iterations),
+)
+
+legacy_dict = {LegacyURN(s): s for s in urn_strs}
+current_dict = {URN(s): s for s in urn_strs}
+legacy_key, key = LegacyURN(urn_strs[500]), URN(urn_strs[500])
+report(
+    "dict lookup",
+    timeit.timeit(lambda: legacy_dict[legacy_key], number=iterations),
+    timeit.timeit(lambda: current_dict[key], number=iterations),
+)
@@ -4,7 +4,7 @@ from .api_objects import URN
 from .linkedin import ChallengeException, LinkedInMessaging
 
 __title__ = "linkedin_messaging"
-__version__ = "0.6.0"
+__version__ = "0.7.0"
 __description__ = "An unofficial API for interacting with LinkedIn Messaging"
 
 __license__ = "Apache License 2.0"
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Any, Hashable, Optional
+
+import aiohttp
+
+from .connection_pool import PoolStats, get_pool_stats, make_connector
+from .linkedin import LinkedInMessaging
+
+
+class AccountManager:
+    """
+    Runs the clients for many accounts on one connection pool.
+
+    Each account has its own :class:`LinkedInMessaging` client with its own session, so cookies
+    and CSRF tokens are never shared between accounts. The connections, DNS cache and
+    keep-alive connections are shared. The connector's ``limit`` is the connection budget for
+    the API requests and media downloads of all of the accounts together, and
+    ``max_concurrent_requests`` limits the number of them that all of the accounts have in
+    flight at once.
+
+    The real-time event stream of each account that is listening holds a connection for as
+    long as it is open, so the event streams use a separate connector, :attr:`stream_connector`.
+    It has no connection limit, because there is at most one event stream per account. This
+    way, listening accounts never use up the connections for requests.
+
+    The ``limit``, ``limit_per_host``, ``keepalive_timeout`` and ``ttl_dns_cache`` parameters
+    are passed to :func:`linkedin_messaging.connection_pool.make_connector`. ``client_class``
+    is the class of the clients, which can be a subclass of :class:`LinkedInMessaging`.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        ttl_dns_cache: Optional[int] = 300,
+        max_concurrent_requests: Optional[int] = None,
+        client_class: type[LinkedInMessaging] = LinkedInMessaging,
+    ):
+        self.connector: aiohttp.BaseConnector = make_connector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=ttl_dns_cache,
+        )
+        self.stream_connector: aiohttp.BaseConnector = make_connector(
+            limit=0,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=ttl_dns_cache,
+        )
+        self.request_semaphore = (
+            asyncio.Semaphore(max_concurrent_requests) if max_concurrent_requests else None
+        )
+        self.client_class = client_class
+        self.accounts: dict[Hashable, LinkedInMessaging] = {}
+        self._listeners: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def __getitem__(self, account_id: Hashable) -> LinkedInMessaging:
+        return self.accounts[account_id]
+
+    def add_account(
+        self,
+        account_id: Hashable,
+        li_at: Optional[str] = None,
+        jsessionid: Optional[str] = None,
+        **kwargs: Any,
+    ) -> LinkedInMessaging:
+        """
+        Create the client for an account. If ``li_at`` and ``jsessionid`` are given, the client
+        is logged in with them.
+
+        :param kwargs: passed to :class:`LinkedInMessaging`.
+        """
+        if account_id in self.accounts:
+            raise ValueError(f"Account {account_id} already exists")
+        kwargs.update(
+            connector=self.connector,
+            stream_connector=self.stream_connector,
+            request_semaphore=self.request_semaphore,
+        )
+        if li_at and jsessionid:
+            linkedin = self.client_class.from_cookies(li_at, jsessionid, **kwargs)
+        else:
+            linkedin = self.client_class(**kwargs)
+        self.accounts[account_id] = linkedin
+        return linkedin
+
+    def start_account(self, account_id: Hashable, **kwargs: Any) -> asyncio.Task:
+        """
+        Start listening to the real-time event stream of an account.
+
+        :param kwargs: passed to :meth:`LinkedInMessaging.start_listener`.
+        """
+        if (task := self._listeners.get(account_id)) and not task.done():
+            return task
+        task = asyncio.create_task(self._listen(account_id, **kwargs))
+        self._listeners[account_id] = task
+        return task
+
+    async def _listen(self, account_id: Hashable, **kwargs: Any):
+        try:
+            await self.accounts[account_id].start_listener(**kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logging.exception(f"Listener for account {account_id} failed")
+
+    async def stop_account(self, account_id: Hashable):
+        """Stop listening to the real-time event stream of an account."""
+        if task := self._listeners.pop(account_id, None):
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def remove_account(self, account_id: Hashable):
+        """Stop the account and close its client."""
+        await self.stop_account(account_id)
+        if linkedin := self.accounts.pop(account_id, None):
+            await linkedin.close()
+
+    async def close(self):
+        """Remove all of the accounts and close the connectors."""
+        await asyncio.gather(*(self.remove_account(a) for a in list(self.accounts)))
+        await self.connector.close()
+        await self.stream_connector.close()
+
+    def pool_stats(self) -> PoolStats:
+        """Get the usage of the shared connection pool."""
+        return get_pool_stats(self.connector)
@@ -1,16 +1,47 @@
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Callable, Optional, Union
 
 import dataclasses_json
 from dataclasses_json import DataClassJsonMixin, LetterCase, Undefined, config, dataclass_json
 
+URN_CACHE_SIZE = 16384
+"""
+Maximum number of parsed URN strings that are kept around so that parsing the same string again
+returns the same :class:`URN` instance.
+"""
+
 
 class URN:
-    def __init__(self, urn_str: str):
-        urn_parts = urn_str.split(":")
-        self.prefix = ":".join(urn_parts[:-1])
-        self.id_parts = urn_parts[-1].strip("()").split(",")
+    """
+    An immutable LinkedIn URN such as ``urn:li:fs_conversation:123`` or
+    ``urn:li:fs_event:(123,456)``.
+
+    URNs compare equal if their ID parts are equal, regardless of the prefix. Constructing a URN
+    from a string that was recently parsed returns the cached instance.
+    """
+
+    __slots__ = ("prefix", "id_parts", "_hash")
+
+    prefix: str
+    id_parts: tuple[str, ...]
+    _hash: int
+
+    def __new__(cls, urn_str: str) -> "URN":
+        if cls is URN:
+            return _parse_urn(urn_str)
+        return cls._from_str(urn_str)
+
+    @classmethod
+    def _from_str(cls, urn_str: str) -> "URN":
+        prefix, _, id_str = urn_str.rpartition(":")
+        id_parts = tuple(id_str.strip("()").split(","))
+        urn = object.__new__(cls)
+        object.__setattr__(urn, "prefix", prefix)
+        object.__setattr__(urn, "id_parts", id_parts)
+        object.__setattr__(urn, "_hash", hash(id_parts))
+        return urn
 
     def get_id(self) -> str:
         assert len(self.id_parts) == 1
@@ -26,24 +57,47 @@ class URN:
         )
 
     def __hash__(self) -> int:
-        return hash(self.id_str())
+        return self._hash
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, URN):
             return False
-        return self.id_parts == other.id_parts
+        return self._hash == other._hash and self.id_parts == other.id_parts
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple[type["URN"], tuple[str]]:
+        return (type(self), (str(self),))
 
     def __repr__(self) -> str:
         return f"URN('{str(self)}')"
 
 
+_parse_urn = lru_cache(maxsize=URN_CACHE_SIZE)(URN._from_str)
+
+
+def _encode_datetime(d: Optional[datetime]) -> Optional[int]:
+    if not d:
+        return None
+    # Decoded datetimes are naive UTC, so they must not be interpreted as local time.
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=timezone.utc)
+    return round(d.timestamp() * 1000)
+
+
 # Use milliseconds instead of seconds from the UNIX epoch.
 decoder_functions = {
     datetime: (lambda s: datetime.utcfromtimestamp(int(s) / 1000) if s else None),
     URN: (lambda s: URN(s) if s else None),
 }
 encoder_functions: dict[Any, Callable[[Any], Any]] = {
-    datetime: (lambda d: int(d.timestamp() * 1000) if d else None),
+    datetime: _encode_datetime,
     URN: (lambda u: str(u) if u else None),
 }
 
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Hashable, Optional, Union
+
+from .api_objects import URN, MessageCreate, SendMessageResponse
+
+
+@dataclass
+class BulkMessage:
+    conversation_urn_or_recipients: Union[URN, list[URN]]
+    """The conversation to send the message to, or the recipients of a new conversation."""
+    message_create: MessageCreate
+    idempotency_key: Optional[str] = None
+    """
+    Messages with the same key are only sent once. If sending the message fails, the key can be
+    used again.
+    """
+
+    @property
+    def conversation_key(self) -> Hashable:
+        """Identifies the conversation that the message is sent to."""
+        if isinstance(self.conversation_urn_or_recipients, URN):
+            return self.conversation_urn_or_recipients
+        return frozenset(self.conversation_urn_or_recipients)
+
+
+@dataclass
+class BulkSendResult:
+    message: BulkMessage
+    response: Optional[SendMessageResponse] = None
+    """The response to sending the message, if it was sent."""
+    error: Optional[Exception] = None
+    """The error that occurred when sending the message, if it wasn't sent."""
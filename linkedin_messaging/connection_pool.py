@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+
+
+@dataclass
+class PoolStats:
+    limit: int
+    """The maximum number of simultaneous connections (0 means unlimited)."""
+    limit_per_host: int
+    """The maximum number of simultaneous connections per host (0 means unlimited)."""
+    in_use: int
+    """The number of connections that are currently handling a request."""
+    idle: int
+    """The number of keep-alive connections that are available for reuse."""
+    waiters: int
+    """The number of requests that are waiting for a connection to become available."""
+
+
+def make_connector(
+    limit: int = 100,
+    limit_per_host: int = 0,
+    keepalive_timeout: float = 15,
+    ttl_dns_cache: Optional[int] = 300,
+) -> aiohttp.TCPConnector:
+    """
+    Create a connector for :class:`linkedin_messaging.LinkedInMessaging`.
+
+    :param limit: the maximum number of simultaneous connections (0 for unlimited).
+    :param limit_per_host: the maximum number of simultaneous connections to a single host
+        (0 for unlimited).
+    :param keepalive_timeout: the number of seconds an idle connection is kept open for reuse.
+    :param ttl_dns_cache: the number of seconds that DNS lookups are cached for (``None`` to
+        cache forever).
+    """
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+    )
+
+
+def get_pool_stats(connector: aiohttp.BaseConnector) -> PoolStats:
+    # aiohttp doesn't expose these counts publicly, so they are read from the connector's
+    # bookkeeping. If that ever changes shape, the counts fall back to 0.
+    idle = getattr(connector, "_conns", {})
+    waiters = getattr(connector, "_waiters", {})
+    return PoolStats(
+        limit=connector.limit,
+        limit_per_host=connector.limit_per_host,
+        in_use=len(getattr(connector, "_acquired", ())),
+        idle=sum(len(conns) for conns in idle.values()),
+        waiters=sum(len(w) for w in waiters.values()),
+    )
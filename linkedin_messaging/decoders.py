@@ -0,0 +1,231 @@
+"""
+Generated decoders for the :mod:`linkedin_messaging.api_objects` dataclasses.
+
+``dataclasses_json`` re-inspects every field of every nested dataclass on each call to
+``from_json``. The decoders in this module do that inspection once per class and compile a
+specialised function which only has to do the dictionary lookups and the conversions that are
+actually needed for the class.
+
+The generated functions honour the same configuration as ``dataclasses_json``: the class
+``letter_case``, ``field_name`` overrides and the global URN/datetime decoders registered in
+:mod:`linkedin_messaging.api_objects`.
+"""
+
+import json
+from dataclasses import MISSING, fields, is_dataclass
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import dataclasses_json.core
+from dataclasses_json.core import _user_overrides_or_exts
+
+# Older versions of dataclasses_json (such as the pinned 0.6.3) don't have _decode_type.
+# Classes with fields that would need it are decoded by their own from_dict instead.
+_decode_type: Optional[Callable[[Any, Any, bool], Any]] = getattr(
+    dataclasses_json.core, "_decode_type", None
+)
+
+T = TypeVar("T")
+
+_PRIMITIVES = (int, float, str, bool)
+_NONE_TYPE = type(None)
+
+_decoders: dict[type, Callable[[Any], Any]] = {}
+
+
+class _Unsupported(Exception):
+    """A field has a type that the generated code can't decode."""
+
+
+def _strip_optional(type_: Any) -> Any:
+    """Return ``X`` if ``type_`` is ``Optional[X]``, and ``type_`` otherwise."""
+    if get_origin(type_) is Union:
+        args = tuple(a for a in get_args(type_) if a is not _NONE_TYPE)
+        if len(args) != len(get_args(type_)):
+            return args[0] if len(args) == 1 else Union[args]  # type: ignore
+    return type_
+
+
+class _Generator:
+    """
+    Builds the source code for the decoder of a single dataclass. Every non-trivial object
+    that the generated code needs (decoders, defaults, the class itself) is bound into the
+    namespace of the function rather than looked up at runtime.
+    """
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.namespace: dict[str, Any] = {"_cls": cls, "_MISSING": MISSING}
+
+    def bind(self, name: str, value: Any) -> str:
+        self.namespace[name] = value
+        return name
+
+    def value_expr(self, type_: Any, var: str, idx: str) -> list[str]:
+        """
+        Statements that convert the (non-``None``) JSON value in ``var`` to ``type_``, in
+        place.
+        """
+        inner = _strip_optional(type_)
+
+        if is_dataclass(inner):
+            dec = self.bind(f"_dec{idx}", get_decoder(cast(type, inner)))
+            return [f"{var} = {dec}({var})"]
+
+        if get_origin(inner) is list:
+            (item_type,) = get_args(inner) or (Any,)
+            item_type = _strip_optional(item_type)
+            if item_type is Any:
+                return [f"{var} = list({var})"]
+            if is_dataclass(item_type):
+                dec = self.bind(f"_dec{idx}", get_decoder(cast(type, item_type)))
+                return [f"{var} = [{dec}(x) for x in {var}]"]
+            if item_type in _PRIMITIVES:
+                t = self.bind(f"_t{idx}", item_type)
+                return [f"{var} = [x if isinstance(x, {t}) else {t}(x) for x in {var}]"]
+
+        if get_origin(inner) is Union:
+            # dataclasses_json only tries the dataclass options of a Union when the value is a
+            # dict, otherwise the value is left untouched.
+            options = tuple(
+                self.bind(f"_dec{idx}_{i}", get_decoder(cast(type, option)))
+                for i, option in enumerate(get_args(inner))
+                if is_dataclass(option)
+            )
+            if not options:
+                return []
+            return self._union_lines(var, options)
+
+        if inner in _PRIMITIVES:
+            t = self.bind(f"_t{idx}", inner)
+            return [f"if not isinstance({var}, {t}):", f"    {var} = {t}({var})"]
+
+        if inner is Any:
+            return []
+
+        # Anything that doesn't have a specialisation falls back to dataclasses_json.
+        if _decode_type is None:
+            raise _Unsupported(type_)
+        t = self.bind(f"_t{idx}", type_)
+        self.bind("_decode_type", _decode_type)
+        return [f"{var} = _decode_type({t}, {var}, False)"]
+
+    def _union_lines(self, var: str, options: tuple[str, ...]) -> list[str]:
+        lines = [f"if {var}.__class__ is dict:"]
+        indent = "    "
+        for option in options:
+            lines += [
+                f"{indent}try:",
+                f"{indent}    {var} = {option}({var})",
+                f"{indent}except (KeyError, ValueError, AttributeError):",
+            ]
+            indent += "    "
+        lines.append(f"{indent}pass")
+        return lines
+
+    def generate(self) -> Callable[[Any], Any]:
+        cls = self.cls
+        overrides = _user_overrides_or_exts(cls)
+        type_hints = get_type_hints(cls)
+        init_fields = [f for f in fields(cls) if f.init]
+        body = ["if isinstance(d, _cls):", "    return d", "get = d.get"]
+        args = []
+
+        for i, f in enumerate(init_fields):
+            override = overrides[f.name]
+            key = override.letter_case(f.name) if override.letter_case else f.name
+            var = f"v{i}"
+
+            body.append(f"{var} = get({key!r}, _MISSING)")
+            if key != f.name:
+                # dataclasses_json also accepts the Python name of the field.
+                body += [f"if {var} is _MISSING:", f"    {var} = get({f.name!r}, _MISSING)"]
+
+            if override.decoder is not None:
+                decoder = self.bind(f"_decoder{i}", override.decoder)
+                convert = [f"{var} = {decoder}({var})"]
+                if isinstance(type_hints[f.name], type):
+                    # Values that already have the right type are passed through as-is.
+                    t = self.bind(f"_t{i}", type_hints[f.name])
+                    convert = [f"if {var}.__class__ is not {t}:", f"    {convert[0]}"]
+            else:
+                convert = self.value_expr(type_hints[f.name], var, str(i))
+
+            if f.default is not MISSING:
+                default = self.bind(f"_default{i}", f.default)
+                body += [f"if {var} is _MISSING:", f"    {var} = {default}"]
+                condition = f"elif {var} is not None:"
+            elif f.default_factory is not MISSING:
+                factory = self.bind(f"_factory{i}", f.default_factory)
+                body += [f"if {var} is _MISSING:", f"    {var} = {factory}()"]
+                condition = f"elif {var} is not None:"
+            else:
+                # Same as dataclasses_json, a missing required field is a KeyError.
+                body += [f"if {var} is _MISSING:", f"    raise KeyError({f.name!r})"]
+                condition = f"elif {var} is not None:"
+
+            if convert:
+                body.append(condition)
+                body += ["    " + line for line in convert]
+            args.append(var)
+
+        init = cls.__init__  # type: ignore[misc]
+        if hasattr(init, "__wrapped__") and cls.__new__ is object.__new__:
+            # Undefined.EXCLUDE wraps __init__ in a function which re-binds the signature on
+            # every call to drop unknown keyword arguments. The decoder only ever passes the
+            # dataclass fields, so it can call the original __init__ directly.
+            self.bind("_new", object.__new__)
+            self.bind("_init", init.__wrapped__)
+            body += ["o = _new(_cls)", f"_init(o, {', '.join(args)})", "return o"]
+        else:
+            body.append(f"return _cls({', '.join(args)})")
+        name = f"decode_{cls.__name__}"
+        source = f"def {name}(d):\n" + "\n".join("    " + line for line in body)
+        filename = f"<decoder {cls.__module__}.{cls.__qualname__}>"
+        exec(compile(source, filename, "exec"), self.namespace)
+        return cast(Callable[[Any], Any], self.namespace[name])
+
+
+def get_decoder(cls: type[T]) -> Callable[[Any], T]:
+    """
+    Get the generated decoder for ``cls``. The decoder is generated on the first call and
+    cached for subsequent calls.
+    """
+    if (decoder := _decoders.get(cls)) is None:
+        # Nested dataclasses are generated eagerly. If a dataclass (indirectly) refers to
+        # itself, the nested reference goes through this trampoline instead.
+        _decoders[cls] = lambda kvs: _decoders[cls](kvs)
+        try:
+            decoder = _decoders[cls] = _Generator(cls).generate()
+        except _Unsupported:
+            decoder = _decoders[cls] = _from_dict_decoder(cls)
+        except BaseException:
+            del _decoders[cls]
+            raise
+    return cast(Callable[[Any], T], decoder)
+
+
+def _from_dict_decoder(cls: type) -> Callable[[Any], Any]:
+    def decode(kvs: Any) -> Any:
+        return kvs if isinstance(kvs, cls) else cls.from_dict(kvs)  # type: ignore
+
+    return decode
+
+
+def from_dict(cls: type[T], kvs: Any) -> T:
+    """Equivalent to ``cls.from_dict(kvs)``, using the generated decoder."""
+    return get_decoder(cls)(kvs)
+
+
+def from_json(cls: type[T], s: Union[str, bytes]) -> T:
+    """Equivalent to ``cls.from_json(s)``, using the generated decoder."""
+    return get_decoder(cls)(json.loads(s))
@@ -0,0 +1,159 @@
+"""
+Filters out real-time events that have already been dispatched.
+
+Reconnecting to the event stream, backfilling the events that were missed while it was
+disconnected, and overlapping pages can all deliver the same event more than once.
+"""
+
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+def event_key(data: Any) -> Optional[tuple[str, str]]:
+    """
+    Get the key that identifies the thing that a raw real-time event frame is about, and the
+    version of it that the frame contains. A frame is a duplicate if a frame with the same key
+    and version has already been seen. Frames that aren't about a message, reaction or seen
+    receipt have no key.
+
+    >>> event_key({"com.linkedin.realtimefrontend.DecoratedEvent": {"payload": {
+    ...     "reactionAdded": True,
+    ...     "actorMiniProfileUrn": "urn:li:fs_miniProfile:abc",
+    ...     "eventUrn": "urn:li:fs_event:(2-abc,2-def)",
+    ...     "reactionSummary": {"emoji": "👍", "count": 1},
+    ... }}})
+    ('reaction urn:li:fs_event:(2-abc,2-def) urn:li:fs_miniProfile:abc 👍', 'True')
+    """
+    payload = data.get("com.linkedin.realtimefrontend.DecoratedEvent", {}).get("payload", {})
+
+    # Edited and recalled messages are sent again with the same URN.
+    if isinstance(event := payload.get("event"), dict) and (urn := event.get("entityUrn")):
+        content = event.get("eventContent") or {}
+        message = content.get("com.linkedin.voyager.messaging.event.MessageEvent") or {}
+        return f"event {urn}", f"{message.get('lastEditedAt')} {message.get('recalledAt')}"
+
+    # Reactions can be removed and added again.
+    if (urn := payload.get("eventUrn")) and "reactionAdded" in payload:
+        emoji = (payload.get("reactionSummary") or {}).get("emoji")
+        actor = payload.get("actorMiniProfileUrn")
+        return f"reaction {urn} {actor} {emoji}", str(payload["reactionAdded"])
+
+    # Each member has one seen receipt per conversation, which moves to newer events.
+    if isinstance(seen_receipt := payload.get("seenReceipt"), dict):
+        return f"seenReceipt {payload.get('fromEntity')}", str(seen_receipt.get("eventUrn"))
+
+    return None
+
+
+@dataclass
+class DedupeStats:
+    entries: int
+    """The number of keys in the index."""
+    max_entries: int
+    """The maximum number of keys to keep in the index."""
+    hits: int
+    """The number of frames that were duplicates."""
+    misses: int
+    """The number of frames that were not duplicates."""
+
+
+class DedupeIndex:
+    """
+    A bounded index of the real-time events that have been seen.
+
+    The index holds at most ``max_entries`` keys and evicts the least recently seen ones when
+    it is full. Keys that were first seen more than ``ttl`` seconds ago are no longer
+    considered duplicates.
+
+    :param max_entries: the maximum number of keys to keep. ``0`` disables deduplication.
+    :param ttl: the number of seconds after which a key is forgotten. If ``None``, keys are
+        only forgotten when they are evicted.
+    :param path: if given, the index is loaded from this SQLite database, and is written to it
+        by :meth:`save` and :meth:`close`, so that it survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: Optional[float] = 3600,
+        path: Union[str, os.PathLike, None] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._seen: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.executescript(_SCHEMA)
+            self._load()
+
+    def _load(self):
+        assert self._db
+        rows = self._db.execute(
+            "SELECT key, version, seen_at FROM seen ORDER BY rowid DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        now = time.time()
+        for key, version, seen_at in reversed(rows):
+            if self.ttl is None or now - seen_at < self.ttl:
+                self._seen[key] = (version, seen_at)
+
+    def save(self):
+        """Write the index to its database, if it has one."""
+        if not self._db:
+            return
+        with self._db:
+            self._db.execute("DELETE FROM seen")
+            self._db.executemany(
+                "INSERT INTO seen (key, version, seen_at) VALUES (?, ?, ?)",
+                ((key, version, seen_at) for key, (version, seen_at) in self._seen.items()),
+            )
+
+    def close(self):
+        if self._db:
+            self.save()
+            self._db.close()
+            self._db = None
+
+    def seen(self, key: str, version: str = "") -> bool:
+        """
+        Check whether the key has been seen with this version, and record that it has.
+
+        :returns: whether the key is a duplicate.
+        """
+        now = time.time()
+        if entry := self._seen.get(key):
+            if entry[0] == version and (self.ttl is None or now - entry[1] < self.ttl):
+                self._seen.move_to_end(key)
+                self.hits += 1
+                return True
+
+        self.misses += 1
+        if self.max_entries > 0:
+            self._seen[key] = (version, now)
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+        return False
+
+    def stats(self) -> DedupeStats:
+        return DedupeStats(
+            entries=len(self._seen),
+            max_entries=self.max_entries,
+            hits=self.hits,
+            misses=self.misses,
+        )
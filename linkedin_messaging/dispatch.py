@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .api_objects import URN
+
+
+def conversation_id(data: Any) -> Optional[str]:
+    """
+    Get the ID of the conversation that a raw real-time event frame belongs to without
+    deserialising it.
+
+    >>> conversation_id({"com.linkedin.realtimefrontend.DecoratedEvent": {"payload": {
+    ...     "eventUrn": "urn:li:fs_event:(2-abc,2-def)"
+    ... }}})
+    '2-abc'
+    """
+    payload = data.get("com.linkedin.realtimefrontend.DecoratedEvent", {}).get("payload", {})
+
+    # Message and reaction events contain event URNs, which are (conversation ID, event ID)
+    # pairs. Seen receipts are from messaging members, which are (conversation ID, member ID)
+    # pairs.
+    urn = payload.get("conversation")
+    if isinstance(urn, dict):
+        urn = urn.get("entityUrn")
+    if not urn and isinstance(event := payload.get("event"), dict):
+        urn = event.get("entityUrn")
+    if not urn:
+        urn = payload.get("eventUrn")
+    if not urn and isinstance(seen_receipt := payload.get("seenReceipt"), dict):
+        urn = seen_receipt.get("eventUrn")
+    if not urn:
+        urn = payload.get("fromEntity")
+
+    return URN(urn).id_parts[0] if isinstance(urn, str) and urn else None
+
+
+class ConcurrentDispatcher:
+    """
+    Runs a handler on a pool of worker tasks.
+
+    Each item is submitted with a key. The items with the same key are handled one at a time, in
+    the order in which they were submitted, while items with different keys are handled
+    concurrently (up to ``concurrency`` at a time). Any free worker handles the next item of
+    any key that has items waiting, so a slow item only holds up the items with its own key.
+
+    At most ``queue_size`` items of each key, and ``concurrency * queue_size`` items in total,
+    wait to be handled. When either is reached, :meth:`submit` waits until the workers catch
+    up, which applies backpressure to whatever is producing the items.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        concurrency: int = 8,
+        queue_size: int = 256,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._handler = handler
+        self._concurrency = concurrency
+        self._queue_size = queue_size
+        # The items of each key that has items waiting or being handled. A key is in _ready
+        # while it has items waiting and no worker is handling one of them.
+        self._queues: dict[Optional[Hashable], deque] = {}
+        self._ready: asyncio.Queue[Optional[Hashable]] = asyncio.Queue()
+        self._space = asyncio.Condition()
+        self._waiting = 0
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        """The number of items that are waiting to be handled."""
+        return self._waiting
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self._concurrency)]
+
+    def _is_full(self, key: Optional[Hashable]) -> bool:
+        return (
+            len(self._queues.get(key, ())) >= self._queue_size
+            or self._waiting >= self._queue_size * self._concurrency
+        )
+
+    async def submit(self, key: Optional[Hashable], item: Any):
+        self.start()
+        if self._is_full(key):
+            async with self._space:
+                await self._space.wait_for(lambda: not self._is_full(key))
+        if (items := self._queues.get(key)) is None:
+            items = self._queues[key] = deque()
+            self._ready.put_nowait(key)
+        items.append(item)
+        self._waiting += 1
+        self._unfinished += 1
+        self._finished.clear()
+
+    async def _work(self):
+        while True:
+            key = await self._ready.get()
+            items = self._queues[key]
+            item = items.popleft()
+            self._waiting -= 1
+            try:
+                await self._handler(item)
+            except Exception:
+                logging.exception(f"Failed to handle {item}")
+            finally:
+                # Other keys that are waiting go first.
+                if items:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._queues[key]
+                self._unfinished -= 1
+                if not self._unfinished:
+                    self._finished.set()
+            async with self._space:
+                self._space.notify_all()
+
+    async def join(self):
+        """Wait until all of the submitted items have been handled."""
+        await self._finished.wait()
+
+    async def close(self, drain: bool = True):
+        """
+        Stop the workers. If ``drain`` is true, the items that were already submitted are
+        handled first. Otherwise, they are dropped.
+        """
+        try:
+            if drain and self._workers:
+                await self.join()
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self._queues.clear()
+            self._ready = asyncio.Queue()
+            self._waiting = self._unfinished = 0
+            self._finished.set()
@@ -0,0 +1,90 @@
+"""
+Hand-written JSON encoders for the objects that are sent with every message.
+
+``MessageCreate.to_dict`` goes through ``dataclasses_json`` for every nested object, and the
+resulting dictionary is then serialised again by ``json.dumps``. These encoders write the JSON
+directly instead. The output is identical to ``json.dumps`` of the ``to_dict`` result.
+"""
+
+import json
+from typing import Optional
+
+from .api_objects import URN, Attribute, AttributedBody, MessageAttachmentCreate, MessageCreate
+
+_encode_str = json.encoder.encode_basestring_ascii  # type: ignore
+
+MESSAGE_CREATE_KEY = "com.linkedin.voyager.messaging.create.MessageCreate"
+
+
+def _encode_urn(urn: Optional[URN]) -> str:
+    return "null" if urn is None else _encode_str(str(urn))
+
+
+def encode_attribute(attribute: Attribute) -> str:
+    attribute_type = attribute.type_
+    if attribute_type is None:
+        type_json = "null"
+    elif attribute_type.text_entity is None:
+        type_json = '{"com.linkedin.pemberly.text.Entity": null}'
+    else:
+        type_json = (
+            '{"com.linkedin.pemberly.text.Entity": {"urn": '
+            + _encode_urn(attribute_type.text_entity.urn)
+            + "}}"
+        )
+    return f'{{"start": {attribute.start}, "length": {attribute.length}, "type": {type_json}}}'
+
+
+def encode_attributed_body(attributed_body: AttributedBody) -> str:
+    return (
+        '{"text": '
+        + _encode_str(attributed_body.text)
+        + ', "attributes": ['
+        + ", ".join([encode_attribute(a) for a in attributed_body.attributes])
+        + "]}"
+    )
+
+
+def encode_message_attachment_create(attachment: MessageAttachmentCreate) -> str:
+    return (
+        f'{{"byteSize": {attachment.byte_size}, "id": {_encode_urn(attachment.id_)}, '
+        f'"mediaType": {_encode_str(attachment.media_type)}, '
+        f'"name": {_encode_str(attachment.name)}}}'
+    )
+
+
+def encode_message_create(message_create: MessageCreate) -> str:
+    """
+    >>> encode_message_create(MessageCreate(AttributedBody("Hi"), body="Hi"))
+    '{"attributedBody": {"text": "Hi", "attributes": []}, "body": "Hi", "attachments": []}'
+    """
+    attributed_body = message_create.attributed_body
+    return (
+        '{"attributedBody": '
+        + ("null" if attributed_body is None else encode_attributed_body(attributed_body))
+        + ', "body": '
+        + _encode_str(message_create.body)
+        + ', "attachments": ['
+        + ", ".join([encode_message_attachment_create(a) for a in message_create.attachments])
+        + "]}"
+    )
+
+
+def _encode_event_create(message_create: MessageCreate) -> str:
+    return f'{{"value": {{"{MESSAGE_CREATE_KEY}": {encode_message_create(message_create)}}}}}'
+
+
+def encode_message_event(message_create: MessageCreate) -> bytes:
+    """Encode the body of a request to send a message to an existing conversation."""
+    return f'{{"eventCreate": {_encode_event_create(message_create)}}}'.encode()
+
+
+def encode_conversation_create(message_create: MessageCreate, recipients: list[URN]) -> bytes:
+    """Encode the body of a request to send a message to a new conversation."""
+    return (
+        '{"keyVersion": "LEGACY_INBOX", "conversationCreate": {"eventCreate": '
+        + _encode_event_create(message_create)
+        + ', "recipients": ['
+        + ", ".join([_encode_str(r.get_id()) for r in recipients])
+        + '], "subtype": "MEMBER_TO_MEMBER"}}'
+    ).encode()
@@ -1,2 +1,17 @@
+from typing import Optional
+
+
 class TooManyRequestsError(Exception):
     pass
+
+
+class RangeNotSatisfiableError(Exception):
+    """The server responded to a Range request for media with 416 Range Not Satisfiable."""
+
+    def __init__(self, message: str, total: Optional[int]):
+        super().__init__(message, total)
+        self.total = total
+        """The size of the media according to the ``Content-Range`` header, if it was given."""
+
+    def __str__(self) -> str:
+        return str(self.args[0])
@@ -1,9 +1,25 @@
 import asyncio
 import json
 import logging
+import os
+import random
+import time
 from collections import defaultdict
-from datetime import datetime
-from typing import Any, AsyncGenerator, Awaitable, Callable, Optional, TypeVar, Union, cast
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import aiohttp
 import aiohttp.client_exceptions
@@ -12,7 +28,9 @@ from dataclasses_json.api import DataClassJsonMixin
 
 from .api_objects import (
     URN,
+    Artifact,
     Conversation,
+    ConversationEvent,
     ConversationResponse,
     ConversationsResponse,
     Error,
@@ -23,8 +41,35 @@ from .api_objects import (
     RealTimeEventStreamEvent,
     SendMessageResponse,
     UserProfileResponse,
+    encoder_functions,
+)
+from .bulk import BulkMessage, BulkSendResult
+from .connection_pool import PoolStats, get_pool_stats, make_connector
+from .decoders import from_dict, from_json
+from .dedupe import DedupeIndex, event_key
+from .dispatch import ConcurrentDispatcher, conversation_id
+from .encoders import encode_conversation_create, encode_message_event
+from .exceptions import RangeNotSatisfiableError, TooManyRequestsError
+from .media import (
+    MEDIA_CHUNK_SIZE,
+    DownloadStats,
+    MediaSource,
+    ProgressCallback,
+    get_media_size,
+    iter_media,
+    parse_content_range_total,
+    track_progress,
 )
-from .exceptions import TooManyRequestsError
+from .media_cache import MediaCache
+from .metrics import Metrics, request_size
+from .paging import prefetch
+from .rate_limit import EndpointClass, RateLimiter
+from .read_receipts import ReadReceiptBatcher
+from .request_cache import RequestKey, ResponseCache, request_key
+from .sse import SSEParser
+from .store import ConversationStore
+from .stream_health import HEARTBEAT_KEY, StreamHealth
+from .typing_indicators import TypingManager
 
 REQUEST_HEADERS = {
     "user-agent": " ".join(
@@ -50,6 +95,8 @@ REQUEST_HEADERS = {
     ),
 }
 
+JSON_CONTENT_TYPE = {"content-type": "application/json"}
+
 LINKEDIN_BASE_URL = "https://www.linkedin.com"
 LOGIN_URL = f"{LINKEDIN_BASE_URL}/checkpoint/lg/login-submit"
 LOGOUT_URL = f"{LINKEDIN_BASE_URL}/uas/logout"
@@ -62,14 +109,32 @@ SEED_URL = f"{LINKEDIN_BASE_URL}/login"
 URL to seed all of the auth requests
 """
 
+LOGIN_PATHS = ("/login", "/uas/login", "/checkpoint/")
+"""
+Paths that requests are redirected to when the session is no longer valid.
+"""
+
+SPECIAL_EVENT_TYPES = frozenset(("ALL_EVENTS", "TIMEOUT"))
+"""
+Event types that :meth:`LinkedInMessaging.add_event_listener` accepts which are not keys of the
+real-time event payload.
+"""
+
 
 T = TypeVar("T", bound=DataClassJsonMixin)
 
+# Naive datetimes are UTC, like the ones that are decoded from responses.
+_encode_datetime = encoder_functions[datetime]
+
 
-async def try_from_json(deserialise_to: T, response: aiohttp.ClientResponse) -> T:
+async def try_from_json(
+    deserialise_to: T,
+    response: aiohttp.ClientResponse,
+    metrics: Optional[Metrics] = None,
+) -> T:
     if response.status < 200 or 300 <= response.status:
         try:
-            error = Error.from_json(await response.text())
+            error = from_json(Error, await response.text())
         except:
             raise Exception(
                 f"Deserialising to {deserialise_to} failed because response "
@@ -78,16 +143,22 @@ async def try_from_json(deserialise_to: T, response: aiohttp.ClientResponse) ->
         raise error
 
     text = await response.text()
+    start = time.perf_counter() if metrics else 0.0
     try:
-        return deserialise_to.from_json(text)
+        return from_json(cast(type[T], deserialise_to), text)
     except (json.JSONDecodeError, ValueError) as e:
         try:
-            error = Error.from_json(text)
+            error = from_json(Error, text)
         except:
             raise Exception(
                 f"Deserialising to {deserialise_to} failed. Error: {e}. " f"Response: {text}."
             )
         raise error
+    finally:
+        if metrics:
+            metrics.decode_duration.observe(
+                time.perf_counter() - start, cast(type, deserialise_to).__name__
+            )
 
 
 class ChallengeException(Exception):
@@ -95,8 +166,32 @@ class ChallengeException(Exception):
 
 
 class LinkedInMessaging:
+    connector: aiohttp.BaseConnector
     session: aiohttp.ClientSession
     two_factor_payload: dict[str, Any]
+    _payload_listeners: Optional[dict[str, list[Any]]]
+    _dispatcher: Optional[ConcurrentDispatcher] = None
+    last_event_id: Optional[str] = None
+    """
+    The ID of the last event received from the real-time event stream. It is sent as the
+    ``Last-Event-ID`` when the event stream reconnects.
+    """
+    last_event_at: Optional[datetime] = None
+    """
+    When the newest message event handled by the real-time event listener was created. Events
+    since then are backfilled when the event stream reconnects.
+    """
+    last_event_urn: Optional[URN] = None
+    """The URN of the message event at :attr:`last_event_at`."""
+    _backfill_on_reconnect: bool = False
+    _stream_idle_timeout: float = 60
+    auth_valid: Optional[bool]
+    """
+    Whether the session was valid according to the last authenticated response, or ``None`` if
+    there hasn't been one since logging in.
+    """
+    stream_health: StreamHealth
+    """The connections to the real-time event stream, such as the age of the current one."""
     event_listeners: defaultdict[
         str,
         list[
@@ -108,55 +203,311 @@ class LinkedInMessaging:
         ],
     ]
 
-    def __init__(self):
-        self.session = aiohttp.ClientSession()
+    def __init__(
+        self,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        ttl_dns_cache: Optional[int] = 300,
+        rate_limiter: Optional[RateLimiter] = None,
+        store: Optional[ConversationStore] = None,
+        media_cache: Optional[MediaCache] = None,
+        response_cache_ttls: Optional[dict[str, float]] = None,
+        profile_ttl: float = 300,
+        auth_state_ttl: float = 60,
+        read_receipt_delay: float = 1.0,
+        read_receipt_concurrency: int = 4,
+        typing_interval: float = 5.0,
+        request_semaphore: Optional[asyncio.Semaphore] = None,
+        dedupe: Optional[DedupeIndex] = None,
+        metrics: Optional[Metrics] = None,
+        stream_connector: Optional[aiohttp.BaseConnector] = None,
+    ):
+        """
+        :param connector: the connector to use for all requests. If it is provided, it is not
+            closed by :meth:`close`, so it can be shared by multiple clients. Otherwise, a
+            connector is created using the ``limit``, ``limit_per_host``,
+            ``keepalive_timeout`` and ``ttl_dns_cache`` parameters. See
+            :func:`linkedin_messaging.connection_pool.make_connector` for their meaning.
+        :param rate_limiter: the rate limiter for requests to LinkedIn. Defaults to a
+            :class:`linkedin_messaging.rate_limit.RateLimiter` with the default rate limits.
+        :param store: a local store of conversations and events. It is used by
+            :meth:`incremental_sync`, and the events received by the real-time event listener
+            are written to it.
+        :param media_cache: an on-disk cache for :meth:`download_linkedin_media` and
+            :meth:`download_profile_picture`.
+        :param response_cache_ttls: the number of seconds to cache responses to GET requests
+            for, by URL prefix relative to the API base URL. See
+            :class:`linkedin_messaging.request_cache.ResponseCache`. By default, responses are
+            not cached.
+        :param profile_ttl: the number of seconds that :meth:`get_user_profile` returns the
+            cached profile for.
+        :param auth_state_ttl: the number of seconds that :meth:`logged_in` trusts the
+            validity of the session as observed from the responses to other requests.
+        :param read_receipt_delay: the number of seconds that
+            :meth:`mark_conversation_as_read_later` collects read receipts for before sending
+            them.
+        :param read_receipt_concurrency: the maximum number of read receipts that are sent at
+            once.
+        :param typing_interval: the minimum number of seconds between typing notifications to
+            a conversation sent by :meth:`notify_typing`.
+        :param request_semaphore: limits the number of API requests and uploads that are in
+            flight at once. It can be shared by multiple clients to limit them together.
+        :param dedupe: the index of real-time events that have been dispatched, which is used
+            to skip events that are received more than once. Defaults to an in-memory
+            :class:`linkedin_messaging.dedupe.DedupeIndex`. It is closed by :meth:`close`.
+        :param metrics: if given, the latency, sizes and statuses of requests, the time spent
+            deserialising, and the real-time events and the time spent handling them are
+            recorded in it. See :class:`linkedin_messaging.metrics.Metrics`.
+        :param stream_connector: the connector to use for the real-time event stream, which
+            holds a connection for as long as it is open. It is not closed by :meth:`close`.
+            If it isn't given, the event stream uses ``connector``.
+        """
+        self._owns_connector = connector is None
+        self.connector = connector or make_connector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=ttl_dns_cache,
+        )
+        self.session = self._new_session()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.request_semaphore = request_semaphore
         self.event_listeners = defaultdict(list)
-
-    @staticmethod
-    def from_cookies(li_at: str, jsessionid: str) -> "LinkedInMessaging":
-        linkedin = LinkedInMessaging()
+        self._payload_listeners = None
+        self.store = store
+        self.media_cache = media_cache
+        self.response_cache = ResponseCache(response_cache_ttls) if response_cache_ttls else None
+        self.profile_ttl = profile_ttl
+        self.auth_state_ttl = auth_state_ttl
+        self._reset_session_state()
+        self.read_receipts = ReadReceiptBatcher(
+            self.mark_conversation_as_read, read_receipt_delay, read_receipt_concurrency
+        )
+        self.typing_indicators = TypingManager(self.set_typing, typing_interval)
+        self.dedupe = dedupe or DedupeIndex()
+        self.stream_health = StreamHealth()
+        self.metrics = metrics
+        self.stream_connector = stream_connector
+        if store:
+            self.add_event_listener("event", self._store_event)
+
+    @classmethod
+    def from_cookies(cls, li_at: str, jsessionid: str, **kwargs: Any) -> "LinkedInMessaging":
+        linkedin = cls(**kwargs)
         linkedin.session.cookie_jar.update_cookies({"li_at": li_at, "JSESSIONID": jsessionid})
         linkedin.session.headers["csrf-token"] = jsessionid
         return linkedin
 
+    def _new_session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(connector=self.connector, connector_owner=False)
+
+    @asynccontextmanager
+    async def _stream_session(self) -> AsyncGenerator[aiohttp.ClientSession, None]:
+        """
+        Get a session for the real-time event stream. If there is a :attr:`stream_connector`,
+        it is a session on that connector with the cookies and headers of :attr:`session`.
+        """
+        if not self.stream_connector:
+            yield self.session
+            return
+        async with aiohttp.ClientSession(
+            connector=self.stream_connector,
+            connector_owner=False,
+            cookie_jar=self.session.cookie_jar,
+            headers=self.session.headers,
+        ) as session:
+            yield session
+
     async def close(self):
+        await self.typing_indicators.close()
+        await self.read_receipts.close()
+        self.dedupe.close()
         await self.session.close()
+        if self._owns_connector:
+            await self.connector.close()
 
-    async def _get(self, relative_url: str, **kwargs: Any) -> aiohttp.ClientResponse:
-        return await self.session.get(API_BASE_URL + relative_url, **kwargs)
+    def pool_stats(self) -> PoolStats:
+        """Get the usage of the connection pool."""
+        return get_pool_stats(self.connector)
 
-    async def _post(self, relative_url: str, **kwargs: Any) -> aiohttp.ClientResponse:
-        return await self.session.post(API_BASE_URL + relative_url, **kwargs)
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        endpoint: Optional[EndpointClass],
+        **kwargs: Any,
+    ) -> aiohttp.ClientResponse:
+        """
+        Perform a request and read the whole response body before releasing the connection
+        back to the pool. The returned response can still be read (using ``text``, ``json``,
+        etc.), but it doesn't hold on to a connection.
+
+        :param endpoint: the class of endpoint to rate limit the request as, or ``None`` if
+            the request should not be rate limited.
+        """
+        if endpoint:
+            await self.rate_limiter.acquire(endpoint)
+        if self.request_semaphore:
+            async with self.request_semaphore:
+                response = await self._send_request(method, url, **kwargs)
+        else:
+            response = await self._send_request(method, url, **kwargs)
+        if endpoint:
+            self.rate_limiter.record(
+                endpoint, response.status, response.headers.get("retry-after")
+            )
+        if url.startswith(API_BASE_URL):
+            self._observe_auth(response)
+        return response
+
+    async def _send_request(self, method: str, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        if not (metrics := self.metrics):
+            async with self.session.request(method, url, **kwargs) as response:
+                await response.read()
+            return response
+
+        start = time.perf_counter()
+        status, received = "error", 0
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                received = len(await response.read())
+            status = str(response.status)
+            return response
+        finally:
+            metrics.record_request(
+                method, url, status, time.perf_counter() - start, request_size(kwargs), received
+            )
+
+    async def _get(
+        self,
+        relative_url: str,
+        endpoint: EndpointClass = EndpointClass.CONVERSATION_READ,
+        **kwargs: Any,
+    ) -> aiohttp.ClientResponse:
+        """
+        Perform a GET request. Identical requests that are made while one is already in flight
+        share its response instead of making another request, and responses are served from
+        :attr:`response_cache` if it is enabled.
+        """
+        if kwargs.keys() - {"params"}:
+            return await self._request("GET", API_BASE_URL + relative_url, endpoint, **kwargs)
+
+        key = request_key(relative_url, kwargs.get("params"))
+        if self.response_cache and (response := self.response_cache.get(key)):
+            return response
+
+        if not (task := self._pending_gets.get(key)):
+            task = asyncio.create_task(self._fetch(key, relative_url, endpoint, **kwargs))
+            self._pending_gets[key] = task
+            task.add_done_callback(lambda t: self._finish_get(key, t))
+        # The request is shielded so that cancelling one of the callers doesn't cancel it for
+        # the others.
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: RequestKey,
+        relative_url: str,
+        endpoint: EndpointClass,
+        **kwargs: Any,
+    ) -> aiohttp.ClientResponse:
+        generation = self.response_cache.generation if self.response_cache else 0
+        response = await self._request("GET", API_BASE_URL + relative_url, endpoint, **kwargs)
+        if self.response_cache and response.status == 200:
+            self.response_cache.put(key, response, generation)
+        return response
+
+    def _finish_get(self, key: RequestKey, task: asyncio.Task):
+        if self._pending_gets.get(key) is task:
+            del self._pending_gets[key]
+        # If every caller was cancelled, nothing else retrieves the exception.
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate_cache(self, prefix: str = ""):
+        """
+        Remove the cached responses for URLs (relative to the API base URL) that start with
+        ``prefix``. This is done automatically for the URLs that are affected by the methods
+        that change things, such as :meth:`send_message`.
+        """
+        if self.response_cache:
+            self.response_cache.invalidate(prefix)
+
+    async def _post(
+        self,
+        relative_url: str,
+        endpoint: EndpointClass = EndpointClass.MESSAGING_WRITE,
+        **kwargs: Any,
+    ) -> aiohttp.ClientResponse:
+        return await self._request("POST", API_BASE_URL + relative_url, endpoint, **kwargs)
 
     # region Authentication
 
+    def _reset_session_state(self):
+        # GETs that are in flight were made with the previous session, so later GETs must not
+        # be coalesced with them.
+        self._pending_gets: dict[RequestKey, asyncio.Task] = {}
+        self.auth_valid = None
+        self._auth_observed_at = 0.0
+        self._user_profile: Optional[UserProfileResponse] = None
+        self._user_profile_fetched_at = 0.0
+
+    def _observe_auth(self, response: aiohttp.ClientResponse):
+        """Update :attr:`auth_valid` from the response to an authenticated request."""
+        if response.status in (401, 403) or (
+            response.history and response.url.path.startswith(LOGIN_PATHS)
+        ):
+            self.auth_valid = False
+            self._user_profile = None
+        elif 200 <= response.status < 300:
+            self.auth_valid = True
+        else:
+            return
+        self._auth_observed_at = time.monotonic()
+
     @property
     def has_auth_cookies(self) -> bool:
         cookie_names = {c.key for c in self.session.cookie_jar}
         return "li_at" in cookie_names and "JSESSIONID" in cookie_names
 
     async def logged_in(self) -> bool:
+        """
+        Check whether the session is valid. This is answered from the responses to recent
+        requests if there are any (see ``auth_state_ttl``), and otherwise by fetching the user
+        profile.
+        """
         if not self.has_auth_cookies:
             return False
+        if (
+            self.auth_valid is not None
+            and time.monotonic() - self._auth_observed_at < self.auth_state_ttl
+        ):
+            return self.auth_valid
         try:
-            return bool(await self.get_user_profile())
+            return bool(await self.get_user_profile(refresh=True))
         except Exception as e:
             logging.exception(f"Failed getting the user profile: {e}")
             return False
 
     async def login_manual(self, li_at: str, jsessionid: str, new_session: bool = True):
+        self.invalidate_cache()
+        self._reset_session_state()
         if new_session:
             if self.session:
                 await self.session.close()
-            self.session = aiohttp.ClientSession()
+            self.session = self._new_session()
         self.session.cookie_jar.update_cookies({"li_at": li_at, "JSESSIONID": jsessionid})
         self.session.headers["csrf-token"] = jsessionid.strip('"')
 
     async def login(self, email: str, password: str, new_session: bool = True):
+        self.invalidate_cache()
+        self._reset_session_state()
         if new_session:
             if self.session:
                 await self.session.close()
-            self.session = aiohttp.ClientSession()
+            self.session = self._new_session()
 
         # Get the CSRF token.
         async with self.session.get(SEED_URL) as seed_response:
@@ -228,11 +579,15 @@ class LinkedInMessaging:
         csrf_token = self.session.headers.get("csrf-token")
         if not csrf_token:
             return True
-        response = await self.session.get(
+        response = await self._request(
+            "GET",
             LOGOUT_URL,
+            None,
             params={"csrfToken": csrf_token},
             allow_redirects=False,
         )
+        self.invalidate_cache()
+        self._reset_session_state()
         return response.status == 303
 
     # endregion
@@ -242,47 +597,76 @@ class LinkedInMessaging:
     async def get_conversations(
         self,
         last_activity_before: Optional[datetime] = None,
+        count: Optional[int] = None,
     ) -> ConversationsResponse:
         """
         Fetch list of conversations the user is in.
 
         :param last_activity_before: :class:`datetime` of the last chat activity to
-            consider
+            consider. Naive datetimes are treated as UTC.
+        :param count: the number of conversations to request. If not specified, LinkedIn
+            returns 20 conversations.
         """
         if last_activity_before is None:
-            last_activity_before = datetime.now()
+            last_activity_before = datetime.utcnow()
 
         params = {
             "keyVersion": "LEGACY_INBOX",
             # For some reason, createdBefore is the key, even though that makes
             # absolutely no sense whatsoever.
-            "createdBefore": int(last_activity_before.timestamp() * 1000),
+            "createdBefore": _encode_datetime(last_activity_before),
         }
+        if count:
+            params["count"] = count
 
         res = await self._get("/messaging/conversations", params=params)
-        return cast(ConversationsResponse, await try_from_json(ConversationsResponse, res))
+        return cast(
+            ConversationsResponse, await try_from_json(ConversationsResponse, res, self.metrics)
+        )
 
-    async def get_all_conversations(self) -> AsyncGenerator[Conversation, None]:
-        """
-        A generator of all of the user's conversations using paging.
-        """
-        last_activity_before = datetime.now()
+    async def _get_conversation_pages(
+        self, count: Optional[int] = None
+    ) -> AsyncGenerator[ConversationsResponse, None]:
+        last_activity_before = datetime.utcnow()
         while True:
             conversations_response = await self.get_conversations(
-                last_activity_before=last_activity_before
+                last_activity_before=last_activity_before, count=count
             )
-            for c in conversations_response.elements:
-                yield c
-
-            # The page size is 20, by default, so if we get less than 20, we are at the
-            # end of the list so we should stop.
-            if len(conversations_response.elements) < 20:
+            yield conversations_response
+
+            # If we get less than a full page, we are at the end of the list so we should
+            # stop.
+            paging = conversations_response.paging
+            page_size = paging.count if paging and paging.count > 0 else count
+            elements = conversations_response.elements
+            if not elements or (page_size and len(elements) < page_size):
                 break
 
-            if last_activity_at := conversations_response.elements[-1].last_activity_at:
-                last_activity_before = last_activity_at
-            else:
+            last_activity_at = elements[-1].last_activity_at
+            if not last_activity_at or last_activity_at == last_activity_before:
                 break
+            last_activity_before = last_activity_at
+
+    async def get_all_conversations(
+        self,
+        count: Optional[int] = None,
+        lookahead: int = 1,
+    ) -> AsyncGenerator[Conversation, None]:
+        """
+        A generator of all of the user's conversations using paging.
+
+        :param count: the number of conversations to request per page.
+        :param lookahead: the number of pages to fetch in the background while the current
+            page is being consumed. Set to 0 to only fetch a page once the previous one has
+            been consumed.
+        """
+        pages = prefetch(self._get_conversation_pages(count), lookahead)
+        try:
+            async for conversations_response in pages:
+                for c in conversations_response.elements:
+                    yield c
+        finally:
+            await pages.aclose()
 
     async def get_conversation(
         self,
@@ -293,47 +677,236 @@ class LinkedInMessaging:
         Fetch the given conversation.
 
         :param conversation_urn_id: LinkedIn URN for a conversation
-        :param created_before: datetime of the last chat activity to consider
+        :param created_before: datetime of the last chat activity to consider. Naive
+            datetimes are treated as UTC.
         """
         if len(conversation_urn.id_parts) != 1:
             raise TypeError(f"Invalid conversation URN {conversation_urn}.")
 
         if created_before is None:
-            created_before = datetime.now()
+            created_before = datetime.utcnow()
 
         params = {
-            "createdBefore": int(created_before.timestamp() * 1000),
+            "createdBefore": _encode_datetime(created_before),
         }
 
         res = await self._get(
             f"/messaging/conversations/{conversation_urn.id_parts[0]}/events",
             params=params,
         )
-        return cast(ConversationResponse, await try_from_json(ConversationResponse, res))
+        return cast(
+            ConversationResponse, await try_from_json(ConversationResponse, res, self.metrics)
+        )
+
+    async def _get_conversation_event_pages(
+        self,
+        conversation_urn: URN,
+        since: Optional[datetime] = None,
+    ) -> AsyncGenerator[ConversationResponse, None]:
+        created_before = datetime.utcnow()
+        while True:
+            conversation_response = await self.get_conversation(conversation_urn, created_before)
+            yield conversation_response
+
+            paging = conversation_response.paging
+            elements = conversation_response.elements
+            if not elements or (paging and 0 < paging.count and len(elements) < paging.count):
+                break
+
+            oldest = min((e.created_at for e in elements if e.created_at), default=None)
+            if not oldest or oldest == created_before or (since and oldest <= since):
+                break
+            created_before = oldest
+
+    async def get_all_conversation_events(
+        self,
+        conversation_urn: URN,
+        since: Union[datetime, URN, None] = None,
+        lookahead: int = 1,
+    ) -> AsyncGenerator[ConversationEvent, None]:
+        """
+        A generator of the events in the given conversation, from newest to oldest, using
+        paging.
+
+        :param conversation_urn: LinkedIn URN for a conversation
+        :param since: stop at the first event created at or before this :class:`datetime`,
+            or at the event with this URN. Neither is included.
+        :param lookahead: the number of pages to fetch in the background while the current
+            page is being consumed.
+        """
+        pages = prefetch(
+            self._get_conversation_event_pages(
+                conversation_urn, since if isinstance(since, datetime) else None
+            ),
+            lookahead,
+        )
+        # Pages can overlap on events created at the same time as the page boundary.
+        previous_page_urns: set[URN] = set()
+        try:
+            async for conversation_response in pages:
+                page_urns = set()
+                for event in sorted(
+                    conversation_response.elements,
+                    key=lambda e: e.created_at or datetime.min,
+                    reverse=True,
+                ):
+                    if isinstance(since, URN) and event.entity_urn == since:
+                        return
+                    if (
+                        isinstance(since, datetime)
+                        and event.created_at
+                        and event.created_at <= since
+                    ):
+                        return
+                    if event.entity_urn:
+                        if event.entity_urn in previous_page_urns:
+                            continue
+                        page_urns.add(event.entity_urn)
+                    yield event
+                previous_page_urns = page_urns
+        finally:
+            await pages.aclose()
+
+    async def backfill_events(
+        self,
+        since: datetime,
+        since_urn: Optional[URN] = None,
+        until: Optional[datetime] = None,
+    ) -> list[ConversationEvent]:
+        """
+        Fetch the events created since ``since`` in all conversations, oldest first. Only the
+        conversations that have been active since then are fetched.
+
+        :param since: the (naive UTC) time of the newest event that was already seen.
+        :param since_urn: the URN of that event, which is not included. Other events created at
+            the same time are.
+        :param until: if given, events created after this time are not included.
+        """
+        events = []
+        # Usually only the first page is needed, so pages aren't fetched ahead of time.
+        async for conversation in self.get_all_conversations(lookahead=0):
+            last_activity_at = conversation.last_activity_at
+            if last_activity_at and last_activity_at < since:
+                break
+            if not conversation.entity_urn:
+                continue
+            async for event in self.get_all_conversation_events(
+                conversation.entity_urn, since=since - timedelta(milliseconds=1), lookahead=0
+            ):
+                if event.entity_urn == since_urn:
+                    continue
+                if until and event.created_at and event.created_at > until:
+                    continue
+                events.append(event)
+        events.sort(key=lambda e: e.created_at or datetime.min)
+        return events
+
+    async def incremental_sync(self) -> list[Conversation]:
+        """
+        Bring :attr:`store` up to date. Only the conversations that have been active since the
+        previous sync are fetched, along with their events since then. The first sync fetches
+        everything.
+
+        :returns: the conversations that were updated, from most to least recently active.
+        """
+        if not self.store:
+            raise ValueError("incremental_sync requires a store")
+        store = self.store
+        loop = asyncio.get_running_loop()
+
+        high_water_mark = await loop.run_in_executor(None, lambda: store.high_water_mark)
+        updated = []
+        # Conversations are returned from most to least recently active, so the ones that are
+        # already up to date come last.
+        async for conversation in self.get_all_conversations():
+            last_activity_at = conversation.last_activity_at
+            if high_water_mark and last_activity_at and last_activity_at <= high_water_mark:
+                break
+            if not conversation.entity_urn:
+                continue
+
+            # The events are fetched since the last activity that was synced rather than since
+            # the newest stored event, because events from the real-time event stream may
+            # have been stored without the ones that were missed while it was disconnected.
+            stored = await loop.run_in_executor(
+                None, store.get_conversation, conversation.entity_urn
+            )
+            events = [
+                e
+                async for e in self.get_all_conversation_events(
+                    conversation.entity_urn, since=stored.last_activity_at if stored else None
+                )
+            ]
+            # The conversation is stored in the same transaction as its events, so that its
+            # last activity is never stored without them.
+            await loop.run_in_executor(None, store.save_conversations, [conversation], events)
+            updated.append(conversation)
+
+        # The high-water mark is only moved once everything before it is stored, so an
+        # interrupted sync is picked up again by the next one.
+        newest = max((c.last_activity_at for c in updated if c.last_activity_at), default=None)
+        if newest:
+            await loop.run_in_executor(None, setattr, store, "high_water_mark", newest)
+        return updated
 
     async def mark_conversation_as_read(self, conversation_urn: URN) -> bool:
         res = await self._post(
             f"/messaging/conversations/{conversation_urn.id_parts[-1]}",
             json={"patch": {"$set": {"read": True}}},
         )
+        self.invalidate_cache("/messaging/conversations")
         return res.status == 200
 
+    def mark_conversation_as_read_later(self, conversation_urn: URN) -> "asyncio.Future[bool]":
+        """
+        Mark the conversation as read after ``read_receipt_delay`` seconds. Marking the same
+        conversation again before then doesn't send another request. Pending read receipts
+        are sent by :meth:`close`.
+
+        :returns: a future that resolves to whether the conversation was marked as read.
+        """
+        return self.read_receipts.mark(conversation_urn)
+
     # endregion
 
     # region Messages
 
     async def upload_media(
         self,
-        data: bytes,
+        data: MediaSource,
         filename: str,
         media_type: str,
+        media_upload_type: str = "MESSAGING_PHOTO_ATTACHMENT",
+        size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> MessageAttachmentCreate:
+        """
+        Upload media to attach to a message.
+
+        :param data: the contents of the file. Anything other than ``bytes`` is streamed to
+            LinkedIn in chunks rather than read into memory. See
+            :data:`linkedin_messaging.media.MediaSource`.
+        :param filename: the name of the file.
+        :param media_type: the MIME type of the file.
+        :param media_upload_type: the kind of upload, such as ``MESSAGING_PHOTO_ATTACHMENT``,
+            ``MESSAGING_FILE_ATTACHMENT`` or ``VOICE_MESSAGE``.
+        :param size: the number of bytes in ``data``. This is required if ``data`` is an async
+            iterator, and otherwise it is determined from ``data``.
+        :param progress: called with the number of bytes uploaded so far and the total
+            number of bytes after each chunk is sent.
+        """
+        if size is None:
+            size = get_media_size(data)
+            if size is None:
+                raise ValueError("size is required when uploading from an async iterator")
+
         upload_metadata_response = await self._post(
             "/voyagerMediaUploadMetadata",
+            EndpointClass.MEDIA,
             params={"action": "upload"},
             json={
-                "mediaUploadType": "MESSAGING_PHOTO_ATTACHMENT",
-                "fileSize": len(data),
+                "mediaUploadType": media_upload_type,
+                "fileSize": size,
                 "filename": filename,
             },
         )
@@ -345,13 +918,25 @@ class LinkedInMessaging:
         if not upload_url:
             raise Exception("No upload URL provided")
 
-        upload_response = await self.session.put(upload_url, data=data)
+        body: Any = data
+        if not isinstance(data, bytes) or progress:
+            body = iter_media(data)
+            if progress:
+                body = track_progress(body, size, progress)
+        upload_response = await self._request(
+            "PUT",
+            upload_url,
+            EndpointClass.MEDIA,
+            data=body,
+            # Otherwise, streamed bodies are sent with chunked transfer encoding.
+            headers={"content-length": str(size)},
+        )
         if upload_response.status != 201:
             # TODO (#2) is there any other data that we get?
             raise Exception("Failed to upload file.")
 
         return MessageAttachmentCreate(
-            len(data),
+            size,
             URN(upload_metadata_response_json.get("urn")),
             media_type,
             filename,
@@ -363,34 +948,106 @@ class LinkedInMessaging:
         message_create: MessageCreate,
     ) -> SendMessageResponse:
         params = {"action": "create"}
-        message_create_key = "com.linkedin.voyager.messaging.create.MessageCreate"
-
-        message_event: dict[str, Any] = {
-            "eventCreate": {"value": {message_create_key: message_create.to_dict()}}
-        }
 
         if isinstance(conversation_urn_or_recipients, list):
-            message_event["recipients"] = [r.get_id() for r in conversation_urn_or_recipients]
-            message_event["subtype"] = "MEMBER_TO_MEMBER"
-            payload = {
-                "keyVersion": "LEGACY_INBOX",
-                "conversationCreate": message_event,
-            }
             res = await self._post(
                 "/messaging/conversations",
                 params=params,
-                json=payload,
+                data=encode_conversation_create(message_create, conversation_urn_or_recipients),
+                headers=JSON_CONTENT_TYPE,
             )
         else:
+            self.typing_indicators.stop(conversation_urn_or_recipients)
             conversation_id = conversation_urn_or_recipients.get_id()
             res = await self._post(
                 f"/messaging/conversations/{conversation_id}/events",
                 params=params,
-                json=message_event,
-                headers=REQUEST_HEADERS,
+                data=encode_message_event(message_create),
+                headers={**REQUEST_HEADERS, **JSON_CONTENT_TYPE},
             )
 
-        return cast(SendMessageResponse, await try_from_json(SendMessageResponse, res))
+        self.invalidate_cache("/messaging/conversations")
+        return cast(
+            SendMessageResponse, await try_from_json(SendMessageResponse, res, self.metrics)
+        )
+
+    async def send_messages(
+        self,
+        messages: Union[Iterable[BulkMessage], AsyncIterable[BulkMessage]],
+        concurrency: int = 8,
+        queue_size: int = 256,
+        sent_keys: Optional[set[str]] = None,
+    ) -> AsyncGenerator[BulkSendResult, None]:
+        """
+        Send many messages, up to ``concurrency`` at a time. Messages to the same conversation
+        are sent one at a time, in order.
+
+        The messages are read from ``messages`` as they are sent, with at most ``queue_size``
+        waiting to be sent per conversation and ``concurrency * queue_size`` in total, so it can
+        be a generator of any length.
+
+        :param sent_keys: the idempotency keys of messages that have already been sent.
+            Messages with one of these keys are skipped, and the key of each message is added
+            to it once the message has been sent. Pass the same set to multiple calls to
+            deduplicate across them, including to resume after stopping early.
+        :returns: an async generator of the result of sending each message, in the order in
+            which they finish. Messages that are skipped because of their idempotency key
+            don't have a result.
+        """
+        results: asyncio.Queue[Optional[BulkSendResult]] = asyncio.Queue()
+        sent = sent_keys if sent_keys is not None else set()
+        # The keys of messages that have been submitted but not sent yet. They are only added
+        # to sent once sending succeeds, so that messages that fail or are dropped because the
+        # caller stopped early aren't skipped by a later call.
+        in_flight: set[str] = set()
+
+        async def send(message: BulkMessage):
+            key = message.idempotency_key
+            try:
+                response = await self.send_message(
+                    message.conversation_urn_or_recipients, message.message_create
+                )
+            except Exception as e:
+                results.put_nowait(BulkSendResult(message, error=e))
+            else:
+                if key:
+                    sent.add(key)
+                results.put_nowait(BulkSendResult(message, response=response))
+            finally:
+                if key:
+                    in_flight.discard(key)
+
+        dispatcher = ConcurrentDispatcher(send, concurrency, queue_size)
+
+        async def submit(message: BulkMessage):
+            if key := message.idempotency_key:
+                if key in sent or key in in_flight:
+                    return
+                in_flight.add(key)
+            await dispatcher.submit(message.conversation_key, message)
+
+        async def produce():
+            try:
+                if isinstance(messages, AsyncIterable):
+                    async for message in messages:
+                        await submit(message)
+                else:
+                    for message in messages:
+                        await submit(message)
+                await dispatcher.join()
+            finally:
+                results.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while result := await results.get():
+                yield result
+            # Raise any error from iterating over the messages.
+            await producer
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            await dispatcher.close(drain=False)
 
     async def delete_message(self, conversation_urn: URN, message_urn: URN) -> bool:
         res = await self._post(
@@ -399,13 +1056,170 @@ class LinkedInMessaging:
             ),
             params={"action": "recall"},
         )
+        self.invalidate_cache("/messaging/conversations")
         return res.status == 204
 
+    @asynccontextmanager
+    async def _open_media(
+        self,
+        url: str,
+        offset: int = 0,
+    ) -> AsyncGenerator[aiohttp.ClientResponse, None]:
+        """
+        Start downloading media. If ``offset`` is given, a Range request is made for the
+        content from that offset. The server may ignore it and respond with the whole content
+        (with a status of 200 rather than 206).
+        """
+        await self.rate_limiter.acquire(EndpointClass.MEDIA)
+        # The download holds a connection until the caller has finished reading it, so it
+        # counts against the request semaphore for that long.
+        if self.request_semaphore:
+            async with self.request_semaphore:
+                async with self._get_media(url, offset) as media_resp:
+                    yield media_resp
+        else:
+            async with self._get_media(url, offset) as media_resp:
+                yield media_resp
+
+    @asynccontextmanager
+    async def _get_media(
+        self,
+        url: str,
+        offset: int,
+    ) -> AsyncGenerator[aiohttp.ClientResponse, None]:
+        headers = {"range": f"bytes={offset}-"} if offset else None
+        start = time.perf_counter()
+        async with self.session.get(url, headers=headers) as media_resp:
+            self.rate_limiter.record(
+                EndpointClass.MEDIA, media_resp.status, media_resp.headers.get("retry-after")
+            )
+            try:
+                if media_resp.status == 416:
+                    raise RangeNotSatisfiableError(
+                        f"Failed downloading media. Response code {media_resp.status}",
+                        parse_content_range_total(media_resp.headers.get("content-range")),
+                    )
+                if not media_resp.ok:
+                    raise Exception(f"Failed downloading media. Response code {media_resp.status}")
+                yield media_resp
+            finally:
+                if self.metrics:
+                    self.metrics.record_request(
+                        "GET",
+                        url,
+                        str(media_resp.status),
+                        time.perf_counter() - start,
+                        received=media_resp.content.total_bytes,
+                    )
+
+    async def _download_cached(self, url: str, expires_at: Optional[datetime] = None) -> bytes:
+        loop = asyncio.get_running_loop()
+        if self.media_cache:
+            data = await loop.run_in_executor(None, self.media_cache.get, url)
+            if data is not None:
+                return data
+        async with self._open_media(url) as media_resp:
+            data = await media_resp.content.read()
+        if self.media_cache:
+            await loop.run_in_executor(None, self.media_cache.put, url, data, expires_at)
+        return data
+
     async def download_linkedin_media(self, url: str) -> bytes:
-        async with self.session.get(url) as media_resp:
-            if not media_resp.ok:
-                raise Exception(f"Failed downloading media. Response code {media_resp.status}")
-            return await media_resp.content.read()
+        return await self._download_cached(url)
+
+    async def iter_linkedin_media(
+        self,
+        url: str,
+        chunk_size: int = MEDIA_CHUNK_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Download media in chunks of at most ``chunk_size`` bytes, without reading the whole
+        response into memory.
+        """
+        async with self._open_media(url) as media_resp:
+            async for chunk in media_resp.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def download_to(
+        self,
+        url: str,
+        path: Union[str, os.PathLike],
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = MEDIA_CHUNK_SIZE,
+        max_retries: int = 3,
+    ) -> DownloadStats:
+        """
+        Download media to a file, one chunk at a time.
+
+        The content is written to ``<path>.part`` and moved to ``path`` once it is complete. If
+        the connection fails, the download is resumed from where it left off using a Range
+        request, up to ``max_retries`` times. A ``.part`` file left behind by a previous call
+        is resumed the same way. If it is already complete, it is moved to ``path``, and if it
+        is bigger than the media, the download starts again from the beginning.
+
+        :param progress: called with the number of bytes written so far and the total size
+            (if it is known) after each chunk.
+        :returns: the size of the file and the download speed.
+        """
+        loop = asyncio.get_running_loop()
+        path = Path(path)
+        partial_path = path.with_name(path.name + ".part")
+        offset = partial_path.stat().st_size if partial_path.exists() else 0
+        initial_offset = offset
+        retries = 0
+        start = time.monotonic()
+
+        with partial_path.open("ab") as file:
+            while True:
+                try:
+                    async with self._open_media(url, offset) as media_resp:
+                        if media_resp.status == 206:
+                            total = parse_content_range_total(
+                                media_resp.headers.get("content-range")
+                            )
+                        else:
+                            if offset:
+                                # The Range header was ignored, so start again.
+                                await loop.run_in_executor(None, file.truncate, 0)
+                                offset = initial_offset = 0
+                            total = media_resp.content_length
+
+                        async for chunk in media_resp.content.iter_chunked(chunk_size):
+                            await loop.run_in_executor(None, file.write, chunk)
+                            offset += len(chunk)
+                            if progress:
+                                progress(offset, total)
+                    break
+                except RangeNotSatisfiableError as e:
+                    # The server responds with 416 if the offset is at or past the end.
+                    if not offset:
+                        raise
+                    if e.total == offset:
+                        # A previous call downloaded everything but didn't move the file.
+                        if progress:
+                            progress(offset, offset)
+                        break
+                    logging.warning(f"{partial_path} doesn't match the media, starting again")
+                    await loop.run_in_executor(None, file.truncate, 0)
+                    offset = initial_offset = 0
+                except (
+                    aiohttp.ClientPayloadError,
+                    aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError,
+                ):
+                    if retries >= max_retries:
+                        raise
+                    retries += 1
+                    logging.warning(f"Download interrupted at {offset} bytes, resuming")
+                    await loop.run_in_executor(None, file.flush)
+
+        os.replace(partial_path, path)
+        return DownloadStats(
+            size=offset,
+            downloaded=offset - initial_offset,
+            retries=retries,
+            elapsed=time.monotonic() - start,
+        )
 
     # endregion
 
@@ -424,6 +1238,8 @@ class LinkedInMessaging:
             params={"action": "reactWithEmoji"},
             json={"emoji": emoji},
         )
+        self.invalidate_cache("/messaging/conversations")
+        self.invalidate_cache("/voyagerMessagingDashReactors")
         return res.status == 204
 
     async def remove_emoji_reaction(
@@ -439,6 +1255,8 @@ class LinkedInMessaging:
             params={"action": "unreactWithEmoji"},
             json={"emoji": emoji},
         )
+        self.invalidate_cache("/messaging/conversations")
+        self.invalidate_cache("/voyagerMessagingDashReactors")
         return res.status == 204
 
     async def get_reactors(self, message_urn: URN, emoji: str) -> ReactorsResponse:
@@ -449,7 +1267,7 @@ class LinkedInMessaging:
             "q": "messageAndEmoji",
         }
         res = await self._get("/voyagerMessagingDashReactors", params=params)
-        return cast(ReactorsResponse, await try_from_json(ReactorsResponse, res))
+        return cast(ReactorsResponse, await try_from_json(ReactorsResponse, res, self.metrics))
 
     # endregion
 
@@ -462,27 +1280,61 @@ class LinkedInMessaging:
             json={"conversationId": conversation_urn.get_id()},
         )
 
+    def notify_typing(self, conversation_urn: URN):
+        """
+        Show that the user is typing in the conversation. Unlike :meth:`set_typing`, this can
+        be called on every keystroke: typing notifications are sent at most once every
+        ``typing_interval`` seconds while the user keeps typing, and stop when a message is
+        sent to the conversation with :meth:`send_message`.
+        """
+        self.typing_indicators.typing(conversation_urn)
+
     # endregion
 
     # region Profiles
 
-    async def get_user_profile(self) -> UserProfileResponse:
+    async def get_user_profile(self, refresh: bool = False) -> UserProfileResponse:
+        """
+        Get the profile of the logged in user. It is cached for ``profile_ttl`` seconds.
+
+        :param refresh: fetch the profile even if it is cached.
+        """
+        if (
+            not refresh
+            and self._user_profile
+            and time.monotonic() - self._user_profile_fetched_at < self.profile_ttl
+        ):
+            return self._user_profile
         res = await self._get("/me")
-        return cast(UserProfileResponse, await try_from_json(UserProfileResponse, res))
+        profile = cast(
+            UserProfileResponse, await try_from_json(UserProfileResponse, res, self.metrics)
+        )
+        self._user_profile = profile
+        self._user_profile_fetched_at = time.monotonic()
+        return profile
 
-    async def download_profile_picture(self, picture: Picture) -> bytes:
+    @staticmethod
+    def _get_profile_picture_artifact(picture: Picture) -> tuple[str, Artifact]:
         if not picture.vector_image:
             raise Exception(
                 "Failed downloading media. Invalid Picture object with no vector_image."
             )
-        url = (
-            picture.vector_image.root_url
-            + picture.vector_image.artifacts[-1].file_identifying_url_path_segment
-        )
-        async with await self.session.get(url) as profile_resp:
-            if not profile_resp.ok:
-                raise Exception(f"Failed downloading media. Response code {profile_resp.status}")
-            return await profile_resp.content.read()
+        artifact = picture.vector_image.artifacts[-1]
+        return picture.vector_image.root_url + artifact.file_identifying_url_path_segment, artifact
+
+    async def download_profile_picture(self, picture: Picture) -> bytes:
+        url, artifact = self._get_profile_picture_artifact(picture)
+        return await self._download_cached(url, artifact.expires_at)
+
+    async def iter_profile_picture(
+        self,
+        picture: Picture,
+        chunk_size: int = MEDIA_CHUNK_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """Download a profile picture in chunks of at most ``chunk_size`` bytes."""
+        url, _ = self._get_profile_picture_artifact(picture)
+        async for chunk in self.iter_linkedin_media(url, chunk_size):
+            yield chunk
 
     # endregion
 
@@ -505,74 +1357,270 @@ class LinkedInMessaging:
         * ``TIMEOUT`` - an event fired if the event listener connection times out
         """
         self.event_listeners[payload_key].append(fn)
+        self._payload_listeners = None
+
+    def _get_payload_listeners(self) -> dict[str, list[Any]]:
+        """
+        The listeners for keys of the real-time event payload, excluding the special event
+        types. This is rebuilt whenever a listener is added.
+        """
+        if self._payload_listeners is None:
+            self._payload_listeners = {
+                key: listeners
+                for key, listeners in self.event_listeners.items()
+                if listeners and key not in SPECIAL_EVENT_TYPES
+            }
+        return self._payload_listeners
+
+    async def _dispatch_event(self, data: Any):
+        # Special handling for ALL_EVENTS handler.
+        if self.event_listeners.get("ALL_EVENTS"):
+            await self._fire("ALL_EVENTS", data)
+
+        event_payload = data.get("com.linkedin.realtimefrontend.DecoratedEvent", {}).get(
+            "payload", {}
+        )
+        if metrics := self.metrics:
+            for key, value in event_payload.items():
+                if value is not None:
+                    metrics.events.inc(key)
+
+        if not (payload_listeners := self._get_payload_listeners()):
+            return
+
+        # The payload is only deserialised if there is a listener for one of its keys, and
+        # then only once for all of the listeners.
+        event: Optional[RealTimeEventStreamEvent] = None
+        for key, value in event_payload.items():
+            if value is None or key not in payload_listeners:
+                continue
+            if event is None:
+                start = time.perf_counter() if metrics else 0.0
+                event = from_dict(RealTimeEventStreamEvent, event_payload)
+                if metrics:
+                    metrics.decode_duration.observe(
+                        time.perf_counter() - start, "RealTimeEventStreamEvent"
+                    )
+            await self._fire(key, event)
+
+    async def _store_event(self, event: RealTimeEventStreamEvent):
+        if self.store and event.event:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.store.save_events, [event.event])
 
     async def _fire(self, payload_key: str, event: Any):
+        metrics = self.metrics
         for listener in self.event_listeners[payload_key]:
+            start = time.perf_counter() if metrics else 0.0
             try:
                 await listener(event)
             except Exception:
                 logging.exception(f"Listener {listener} failed to handle {event}")
+            if metrics:
+                metrics.handler_duration.observe(time.perf_counter() - start, payload_key)
+
+    def _observe_event(self, data: Any):
+        """Track the newest message event in a raw real-time event frame."""
+        payload = data.get("com.linkedin.realtimefrontend.DecoratedEvent", {}).get("payload", {})
+        event = payload.get("event")
+        if not isinstance(event, dict) or not (created_at_ms := event.get("createdAt")):
+            return
+        created_at = datetime.utcfromtimestamp(created_at_ms / 1000)
+        if self.last_event_at is None or created_at >= self.last_event_at:
+            self.last_event_at = created_at
+            entity_urn = event.get("entityUrn")
+            self.last_event_urn = URN(entity_urn) if entity_urn else None
+
+    async def _handle_frame(self, data: Any):
+        # Reconnects and backfills can deliver the same event more than once.
+        if (key := event_key(data)) and self.dedupe.seen(*key):
+            return
+        self._observe_event(data)
+        if self._dispatcher:
+            await self._dispatcher.submit(conversation_id(data), data)
+        else:
+            await self._dispatch_event(data)
+
+    async def _backfill(self, until: datetime):
+        """
+        Dispatch the message events that were created while the event stream was disconnected,
+        oldest first, as if they had been received from the event stream.
+        """
+        if not self.last_event_at:
+            return
+        try:
+            events = await self.backfill_events(self.last_event_at, self.last_event_urn, until)
+        except Exception:
+            logging.exception(f"Failed to backfill events since {self.last_event_at}")
+            return
+
+        if events:
+            logging.info(f"Backfilling {len(events)} events since {self.last_event_at}")
+        for event in events:
+            await self._handle_frame(
+                {
+                    "com.linkedin.realtimefrontend.DecoratedEvent": {
+                        "payload": {
+                            "event": cast(DataClassJsonMixin, event).to_dict(encode_json=True)
+                        }
+                    }
+                }
+            )
 
     async def _listen_to_event_stream(self):
         logging.info("Starting event stream listener")
 
-        async with self.session.get(
+        headers = {
+            "accept": "text/event-stream",
+            "connection": "keep-alive",
+            "x-li-accept": "application/vnd.linkedin.normalized+json+2.1",
+            **REQUEST_HEADERS,
+        }
+        if self.last_event_id:
+            headers["last-event-id"] = self.last_event_id
+
+        await self.rate_limiter.acquire(EndpointClass.REALTIME_CONNECT)
+        async with self._stream_session() as session, session.get(
             REALTIME_CONNECT_URL,
-            headers={
-                "accept": "text/event-stream",
-                "connection": "keep-alive",
-                "x-li-accept": "application/vnd.linkedin.normalized+json+2.1",
-                **REQUEST_HEADERS,
-            },
-            # The event stream normally stays open for about 3 minutes, but this will
-            # automatically close it more agressively so that we don't get into a weird
-            # state where it's not receiving any data, but simultaneously isn't closed.
-            timeout=120,
+            headers=headers,
+            # The event stream stays open for as long as the server keeps it open. The server
+            # sends heartbeats while there are no events, so if nothing at all is received for
+            # the idle timeout, the connection is dead even if it hasn't been closed.
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=30, sock_read=self._stream_idle_timeout
+            ),
         ) as resp:
+            self.rate_limiter.record(
+                EndpointClass.REALTIME_CONNECT, resp.status, resp.headers.get("retry-after")
+            )
+            self._observe_auth(resp)
             if resp.status != 200:
                 raise TooManyRequestsError(f"Failed to connect. Status {resp.status}.")
-
-            while True:
-                line = await resp.content.readline()
-                if resp.content.at_eof():
-                    break
-
-                if not line.startswith(b"data:"):
-                    continue
-                data = json.loads(line.decode("utf-8")[6:])
-
-                # Special handling for ALL_EVENTS handler.
-                if all_events_handlers := self.event_listeners.get("ALL_EVENTS"):
-                    for handler in all_events_handlers:
-                        try:
-                            await handler(data)
-                        except Exception:
-                            logging.exception(f"Handler {handler} failed to handle {data}")
-
-                event_payload = data.get("com.linkedin.realtimefrontend.DecoratedEvent", {}).get(
-                    "payload", {}
-                )
-
-                for key in self.event_listeners.keys():
-                    if event_payload.get(key) is not None:
-                        await self._fire(key, RealTimeEventStreamEvent.from_dict(event_payload))
+            health = self.stream_health
+            health.on_connect()
+            try:
+                # Events that were created while the stream was disconnected are dispatched
+                # before any of the events from the new stream.
+                if self._backfill_on_reconnect:
+                    await self._backfill(until=datetime.utcnow())
+
+                parser = SSEParser(self.last_event_id)
+                async for chunk in resp.content.iter_any():
+                    health.on_read()
+                    for event in parser.feed(chunk):
+                        self.last_event_id = event.last_event_id
+                        if not event.data:
+                            continue
+                        data = json.loads(event.data)
+                        health.on_frame(HEARTBEAT_KEY in data)
+                        if self.metrics:
+                            # Frames are objects with a single key, such as
+                            # com.linkedin.realtimefrontend.Heartbeat.
+                            frame_type = next(iter(data), "").rpartition(".")[2]
+                            self.metrics.stream_frames.inc(frame_type)
+                        await self._handle_frame(data)
+            finally:
+                health.on_disconnect()
 
         logging.info("Event stream closed")
 
-    async def start_listener(self):
-        while True:
-            try:
-                await self._listen_to_event_stream()
-            except asyncio.exceptions.TimeoutError as te:
-                # Special handling for TIMEOUT handler.
-                if timeout_handlers := self.event_listeners.get("TIMEOUT"):
-                    for handler in timeout_handlers:
-                        try:
-                            await handler(te)
-                        except Exception:
-                            logging.exception(f"Handler {handler} failed to handle {te}")
-            except Exception as e:
-                logging.exception(f"Got exception in listener: {e}")
-                raise
+    async def start_listener(
+        self,
+        handler_concurrency: Optional[int] = None,
+        handler_queue_size: int = 256,
+        backfill: bool = True,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        max_reconnect_attempts: Optional[int] = 5,
+        idle_timeout: float = 60,
+    ):
+        """
+        Listen to the real-time event stream and call the event listeners.
+
+        By default, the listeners are awaited one after another while reading from the event
+        stream, so a slow listener delays reading the next event.
+
+        The event stream is kept open until the server closes it, or until nothing has been
+        received from it for ``idle_timeout`` seconds. The server sends heartbeats while there
+        are no events, so a healthy stream is never idle for long. The state of the connection
+        is available from :attr:`stream_health`.
+
+        When the event stream closes or times out, it is reconnected after a random delay of up
+        to ``reconnect_delay`` seconds. If connecting fails, the maximum delay doubles with each
+        attempt up to ``max_reconnect_delay``.
+
+        :param handler_concurrency: if set, events are queued and the listeners are run by
+            this many worker tasks instead. Events for the same conversation are still handled
+            in order, while events for different conversations are handled concurrently.
+        :param handler_queue_size: the maximum number of events queued per conversation. At
+            most ``handler_concurrency`` times as many are queued in total. When either is
+            reached, reading from the event stream pauses until the workers catch up.
+        :param backfill: if true, the message events that were created while the event stream
+            was disconnected are fetched after reconnecting (see :meth:`backfill_events`) and
+            dispatched before the events from the new stream.
+        :param max_reconnect_attempts: the number of times in a row that connecting can fail
+            before the error is raised. If ``None``, it is retried forever. Errors that show
+            that the session is no longer valid are always raised.
+        """
+        self._backfill_on_reconnect = backfill
+        self._stream_idle_timeout = idle_timeout
+        if handler_concurrency:
+            self._dispatcher = ConcurrentDispatcher(
+                self._dispatch_event, handler_concurrency, handler_queue_size
+            )
+        drain = True
+        failures = 0
+
+        def give_up() -> bool:
+            return self.auth_valid is False or (
+                max_reconnect_attempts is not None
+                and failures >= max_reconnect_attempts
+                and self.stream_health.connects == connects
+            )
+
+        try:
+            while True:
+                connects = self.stream_health.connects
+                try:
+                    await self._listen_to_event_stream()
+                except asyncio.exceptions.TimeoutError as te:
+                    # Timing out while connecting counts as a failed attempt, the same as any
+                    # other connection error.
+                    if give_up():
+                        logging.exception(f"Got exception in listener: {te}")
+                        raise
+                    # Special handling for TIMEOUT handler.
+                    if timeout_handlers := self.event_listeners.get("TIMEOUT"):
+                        for handler in timeout_handlers:
+                            try:
+                                await handler(te)  # type: ignore[arg-type]
+                            except Exception:
+                                logging.exception(f"Handler {handler} failed to handle {te}")
+                except (aiohttp.ClientError, TooManyRequestsError) as e:
+                    if give_up():
+                        logging.exception(f"Got exception in listener: {e}")
+                        raise
+                    logging.warning(f"Event stream failed, reconnecting: {e}")
+                except Exception as e:
+                    logging.exception(f"Got exception in listener: {e}")
+                    raise
+
+                if self.stream_health.connects != connects:
+                    failures = 0
+                else:
+                    failures += 1
+                    self.stream_health.on_failure()
+                # Full jitter, so that many clients that were disconnected at the same time
+                # don't reconnect at the same time.
+                await asyncio.sleep(
+                    random.uniform(0, min(max_reconnect_delay, reconnect_delay * 2**failures))
+                )
+        except asyncio.CancelledError:
+            drain = False
+            raise
+        finally:
+            if dispatcher := self._dispatcher:
+                self._dispatcher = None
+                await dispatcher.close(drain=drain)
 
     # endregion
@@ -0,0 +1,118 @@
+"""
+Helpers for streaming media to and from LinkedIn without holding it in memory.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import AsyncGenerator, AsyncIterable, BinaryIO, Callable, Optional, Union
+
+MEDIA_CHUNK_SIZE = 256 * 1024
+"""The number of bytes that are read from a media source at a time."""
+
+MediaSource = Union[bytes, str, os.PathLike, BinaryIO, AsyncIterable[bytes]]
+"""
+The contents of a media upload: the bytes themselves, the path of a file, a binary file object
+(which is read from its current position) or an async iterator of byte chunks.
+"""
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+"""
+Called with the number of bytes that have been transferred and the total number of bytes (if it
+is known).
+"""
+
+
+@dataclass
+class DownloadStats:
+    size: int
+    """The size of the downloaded file."""
+    downloaded: int
+    """The number of bytes that were downloaded, which excludes any that were resumed from."""
+    retries: int
+    """The number of times that the download was resumed after the connection failed."""
+    elapsed: float
+    """The number of seconds that the download took."""
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.downloaded / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def parse_content_range_total(value: Optional[str]) -> Optional[int]:
+    """
+    Get the complete length of the resource from a ``Content-Range`` header.
+
+    >>> parse_content_range_total("bytes 100-199/1000")
+    1000
+    >>> parse_content_range_total("bytes 100-199/*")
+    """
+    if not value:
+        return None
+    total = value.rpartition("/")[2].strip()
+    return int(total) if total.isdigit() else None
+
+
+def get_media_size(source: MediaSource) -> Optional[int]:
+    """
+    Get the number of bytes in a media source, or ``None`` if it can't be determined without
+    consuming it.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    if isinstance(source, (str, os.PathLike)):
+        return os.stat(source).st_size
+    if hasattr(source, "read"):
+        try:
+            return os.fstat(source.fileno()).st_size - source.tell()  # type: ignore
+        except (AttributeError, OSError, ValueError):
+            pass
+        if source.seekable():  # type: ignore
+            position = source.tell()  # type: ignore
+            size = source.seek(0, os.SEEK_END) - position  # type: ignore
+            source.seek(position)  # type: ignore
+            return size
+    return None
+
+
+async def iter_media(
+    source: MediaSource,
+    chunk_size: int = MEDIA_CHUNK_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Iterate over the contents of a media source in chunks of at most ``chunk_size`` bytes
+    (chunks from an async iterator are passed through as they are). Files are read in the
+    default executor so that reading from disk doesn't block the event loop.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start : start + chunk_size])
+    elif isinstance(source, (str, os.PathLike)):
+        loop = asyncio.get_running_loop()
+        file = await loop.run_in_executor(None, open, source, "rb")
+        try:
+            while chunk := await loop.run_in_executor(None, file.read, chunk_size):
+                yield chunk
+        finally:
+            file.close()
+    elif hasattr(source, "read"):
+        loop = asyncio.get_running_loop()
+        while chunk := await loop.run_in_executor(None, source.read, chunk_size):  # type: ignore
+            yield chunk
+    else:
+        async for chunk in source:  # type: ignore
+            yield chunk
+
+
+async def track_progress(
+    chunks: AsyncIterable[bytes],
+    total: Optional[int],
+    progress: ProgressCallback,
+) -> AsyncGenerator[bytes, None]:
+    """Call ``progress`` after each chunk has been consumed."""
+    transferred = 0
+    async for chunk in chunks:
+        yield chunk
+        transferred += len(chunk)
+        progress(transferred, total)
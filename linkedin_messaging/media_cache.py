@@ -0,0 +1,189 @@
+"""
+An on-disk cache of downloaded media.
+
+Media URLs from LinkedIn are signed, and the signature changes every time the URL is fetched,
+so entries are keyed by the URL without its query string (see :func:`media_cache_key`).
+The contents are stored in files named after their SHA-256 digest, so identical media is only
+stored once even if it is available at multiple URLs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from .api_objects import encoder_functions
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at INTEGER,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+"""
+
+_encode_datetime = encoder_functions[datetime]
+
+
+def media_cache_key(url: str) -> str:
+    """
+    Get the cache key for a media URL, which is the URL without its query string and fragment.
+
+    >>> media_cache_key("https://media.licdn.com/dms/image/C56/100_100/0/1516?e=1645&v=beta&t=x1")
+    'https://media.licdn.com/dms/image/C56/100_100/0/1516'
+    """
+    scheme, netloc, path, _, _ = urlsplit(url)
+    return urlunsplit((scheme, netloc, path, "", ""))
+
+
+@dataclass
+class MediaCacheStats:
+    entries: int
+    """The number of cached URLs."""
+    size: int
+    """The number of bytes of media stored in the cache."""
+    max_size: int
+    """The maximum number of bytes of media to store in the cache."""
+    hits: int
+    """The number of lookups that were served from the cache."""
+    misses: int
+    """The number of lookups that were not in the cache or had expired."""
+
+
+class MediaCache:
+    """
+    A least-recently-used cache of media on disk.
+
+    The methods do blocking file I/O, so they should be run in an executor when called from
+    the event loop (which is what :class:`linkedin_messaging.LinkedInMessaging` does).
+
+    :param directory: the directory to store the cache in. It is created if it doesn't exist.
+    :param max_size: the maximum number of bytes of media to store. When it is exceeded, the
+        least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_size: int = 512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory.joinpath("index.db"), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory.joinpath(digest[:2], digest)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Get the cached media for the URL, if it is cached and hasn't expired."""
+        key = media_cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] is not None and row[1] <= now * 1000:
+                with self._db:
+                    self._delete_entry(key, row[0])
+                row = None
+            data = None
+            if row:
+                try:
+                    data = self._blob_path(row[0]).read_bytes()
+                except FileNotFoundError:
+                    with self._db:
+                        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if data is None:
+                self.misses += 1
+                return None
+            with self._db:
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return data
+
+    def put(self, url: str, data: bytes, expires_at: Optional[datetime] = None):
+        """
+        Cache media for the URL.
+
+        :param expires_at: when the cached media should no longer be used, such as the
+            ``expires_at`` of an :class:`linkedin_messaging.api_objects.Artifact`.
+        """
+        if len(data) > self.max_size:
+            return
+        key = media_cache_key(url)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                # Write to a temporary file first so a partially written file is never read.
+                temp_path = path.with_suffix(".tmp")
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
+            with self._db:
+                old = self._db.execute(
+                    "SELECT digest FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, digest, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, digest, len(data), _encode_datetime(expires_at), time.time()),
+                )
+                if old and old[0] != digest:
+                    self._delete_blob_if_unused(old[0])
+                self._evict()
+
+    def _size(self) -> int:
+        # Each digest is only stored once, no matter how many entries refer to it.
+        (size,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        ).fetchone()
+        return size
+
+    def _evict(self):
+        size = self._size()
+        if size <= self.max_size:
+            return
+        for key, digest, entry_size in self._db.execute(
+            "SELECT key, digest, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            if self._delete_entry(key, digest):
+                size -= entry_size
+                if size <= self.max_size:
+                    return
+
+    def _delete_entry(self, key: str, digest: str) -> bool:
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return self._delete_blob_if_unused(digest)
+
+    def _delete_blob_if_unused(self, digest: str) -> bool:
+        if self._db.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone():
+            return False
+        self._blob_path(digest).unlink(missing_ok=True)
+        return True
+
+    def stats(self) -> MediaCacheStats:
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return MediaCacheStats(
+                entries=entries,
+                size=self._size(),
+                max_size=self.max_size,
+                hits=self.hits,
+                misses=self.misses,
+            )
@@ -0,0 +1,248 @@
+"""
+Counters and histograms of the requests that a client makes and the real-time events that it
+handles, which can be exported in the Prometheus text format.
+
+Metrics are only recorded if a :class:`Metrics` is passed to
+:class:`linkedin_messaging.LinkedInMessaging`. Otherwise, the only cost is checking whether it
+was. A :class:`Metrics` can be shared by multiple clients to record them together.
+"""
+
+import bisect
+import json
+import math
+from collections import defaultdict
+from typing import Any, Iterator, Sequence, Union
+from urllib.parse import urlsplit
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""The upper bounds of the buckets of a :class:`Histogram`, in seconds."""
+
+_ROUTE_SEGMENTS = frozenset(
+    {
+        "api",
+        "challenge",
+        "checkpoint",
+        "connect",
+        "conversations",
+        "dms",
+        "events",
+        "image",
+        "lg",
+        "login",
+        "login-submit",
+        "logout",
+        "me",
+        "messaging",
+        "realtime",
+        "uas",
+        "verify",
+        "voyager",
+        "voyagerMediaUploadMetadata",
+        "voyagerMessagingDashReactors",
+    }
+)
+"""The path segments of the routes that the client requests. Every other segment is an ID."""
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Get the label for the endpoint that a URL is for. Every path segment that isn't part of a
+    known route is replaced with ``:id``, so that requests for different conversations, messages,
+    etc. have the same label however their IDs are encoded.
+
+    >>> endpoint_label(
+    ...     "https://www.linkedin.com/voyager/api/messaging/conversations/2-YWJj/events?count=20"
+    ... )
+    'www.linkedin.com/voyager/api/messaging/conversations/:id/events'
+    """
+    parts = urlsplit(url)
+    path = "/".join(s if not s or s in _ROUTE_SEGMENTS else ":id" for s in parts.path.split("/"))
+    return parts.netloc + path
+
+
+def request_size(kwargs: dict[str, Any]) -> int:
+    """Get the number of bytes in the body of a request from the arguments for it."""
+    if isinstance(data := kwargs.get("data"), (bytes, str)):
+        return len(data)
+    if content_length := (kwargs.get("headers") or {}).get("content-length"):
+        return int(content_length)
+    if (body := kwargs.get("json")) is not None:
+        return len(json.dumps(body).encode())
+    return 0
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    """
+    A value per combination of labels that only goes up.
+
+    >>> requests = Counter("requests_total", "Requests made.", ("status",))
+    >>> requests.inc("200")
+    >>> requests.inc("200", amount=2)
+    >>> print("\\n".join(requests.export()))
+    # HELP requests_total Requests made.
+    # TYPE requests_total counter
+    requests_total{status="200"} 3
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: defaultdict[tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] += amount
+
+    def export(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """
+    The distribution of observed values per combination of labels, counted in buckets.
+
+    >>> latency = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    >>> latency.observe(0.1)
+    >>> latency.observe(0.5)
+    >>> print("\\n".join(latency.export()))
+    # HELP latency_seconds Latency.
+    # TYPE latency_seconds histogram
+    latency_seconds_bucket{le="0.1"} 1
+    latency_seconds_bucket{le="1"} 2
+    latency_seconds_bucket{le="+Inf"} 2
+    latency_seconds_sum 0.6
+    latency_seconds_count 2
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: defaultdict[tuple[str, ...], float] = defaultdict(float)
+
+    def observe(self, value: float, *labels: str):
+        if (counts := self._counts.get(labels)) is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+        # Buckets are inclusive of their upper bound.
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def count(self, *labels: str) -> int:
+        """The number of values observed with the given labels."""
+        return sum(self._counts.get(labels, ()))
+
+    def export(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        bucket_labelnames = (*self.labelnames, "le")
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                bucket_labels = _format_labels(bucket_labelnames, (*labels, _format_value(bound)))
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            label_string = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_string} {_format_value(round(self._sums[labels], 9))}"
+            yield f"{self.name}_count{label_string} {cumulative}"
+
+
+class Metrics:
+    """The metrics of one or more :class:`linkedin_messaging.LinkedInMessaging` clients."""
+
+    def __init__(
+        self, prefix: str = "linkedin_messaging", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.requests = Counter(
+            f"{prefix}_requests_total",
+            "HTTP requests by method, endpoint and response status.",
+            ("method", "endpoint", "status"),
+        )
+        self.request_duration = Histogram(
+            f"{prefix}_request_duration_seconds",
+            "Time from sending an HTTP request to reading the whole response.",
+            ("method", "endpoint"),
+            buckets,
+        )
+        self.request_bytes = Counter(
+            f"{prefix}_request_bytes_total",
+            "Bytes sent in HTTP request bodies.",
+            ("endpoint",),
+        )
+        self.response_bytes = Counter(
+            f"{prefix}_response_bytes_total",
+            "Bytes received in HTTP response bodies.",
+            ("endpoint",),
+        )
+        self.decode_duration = Histogram(
+            f"{prefix}_decode_duration_seconds",
+            "Time spent deserialising responses and real-time events, by type.",
+            ("type",),
+            buckets,
+        )
+        self.stream_frames = Counter(
+            f"{prefix}_stream_frames_total",
+            "Frames received from the real-time event stream, by frame type.",
+            ("type",),
+        )
+        self.events = Counter(
+            f"{prefix}_events_total",
+            "Real-time events received, by payload key.",
+            ("payload_key",),
+        )
+        self.handler_duration = Histogram(
+            f"{prefix}_event_handler_duration_seconds",
+            "Time spent in event listeners, by payload key.",
+            ("payload_key",),
+            buckets,
+        )
+
+    def collectors(self) -> list[Union[Counter, Histogram]]:
+        return [m for m in vars(self).values() if isinstance(m, (Counter, Histogram))]
+
+    def record_request(
+        self,
+        method: str,
+        url: str,
+        status: str,
+        duration: float,
+        sent: int = 0,
+        received: int = 0,
+    ):
+        endpoint = endpoint_label(url)
+        self.requests.inc(method, endpoint, status)
+        self.request_duration.observe(duration, method, endpoint)
+        if sent:
+            self.request_bytes.inc(endpoint, amount=sent)
+        if received:
+            self.response_bytes.inc(endpoint, amount=received)
+
+    def export(self) -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        return "".join(f"{line}\n" for m in self.collectors() for line in m.export())
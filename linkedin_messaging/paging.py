@@ -0,0 +1,50 @@
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, TypeVar
+
+T = TypeVar("T")
+
+
+async def prefetch(pages: AsyncIterator[T], lookahead: int = 1) -> AsyncGenerator[T, None]:
+    """
+    Iterate over ``pages`` while fetching up to ``lookahead`` pages ahead of the consumer in a
+    background task. This allows the next request to be in flight while the current page is
+    being processed.
+
+    If ``lookahead`` is 0, the pages are fetched on demand.
+    """
+    if lookahead < 1:
+        async for page in pages:
+            yield page
+        return
+
+    slots = asyncio.Semaphore(lookahead)
+    queue: asyncio.Queue[tuple[bool, object]] = asyncio.Queue()
+
+    async def produce():
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    break
+                queue.put_nowait((True, page))
+            queue.put_nowait((False, None))
+        except Exception as e:
+            queue.put_nowait((False, e))
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            has_page, item = await queue.get()
+            if not has_page:
+                if isinstance(item, Exception):
+                    raise item
+                return
+            slots.release()
+            yield item  # type: ignore
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        if aclose := getattr(pages, "aclose", None):
+            await aclose()
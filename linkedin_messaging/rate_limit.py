@@ -0,0 +1,195 @@
+"""
+Client-side rate limiting of requests to LinkedIn.
+
+Every request belongs to an :class:`EndpointClass`, and each endpoint class has its own token
+bucket. When LinkedIn responds with ``429 Too Many Requests`` (or its own ``999`` status), the
+rate of the bucket is halved and any ``Retry-After`` is honoured. After that, each successful
+response raises the rate a bit until it is back at the configured rate.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Optional
+
+
+class EndpointClass(Enum):
+    MESSAGING_WRITE = "messaging_write"
+    """Sending messages, reactions, read receipts, typing notifications, etc."""
+    CONVERSATION_READ = "conversation_read"
+    """Fetching conversations, events, reactors and profiles."""
+    MEDIA = "media"
+    """Uploading and downloading attachments and profile pictures."""
+    REALTIME_CONNECT = "realtime_connect"
+    """Connecting to the real-time event stream."""
+
+
+RATE_LIMITED_STATUSES = frozenset((429, 999))
+
+
+@dataclass
+class RateLimit:
+    rate: float
+    """The number of requests per second."""
+    burst: int
+    """The number of requests that can be made at once after a period of inactivity."""
+
+
+DEFAULT_RATE_LIMITS = {
+    EndpointClass.MESSAGING_WRITE: RateLimit(rate=5, burst=10),
+    EndpointClass.CONVERSATION_READ: RateLimit(rate=10, burst=20),
+    EndpointClass.MEDIA: RateLimit(rate=5, burst=10),
+    EndpointClass.REALTIME_CONNECT: RateLimit(rate=0.2, burst=2),
+}
+
+
+@dataclass
+class RateLimitStats:
+    rate: float
+    """The current (possibly reduced) number of requests per second."""
+    max_rate: float
+    """The configured number of requests per second."""
+    queued: int
+    """The number of requests that are currently waiting for the rate limiter."""
+    throttled: int
+    """The total number of requests that had to wait for the rate limiter."""
+    rate_limited: int
+    """The total number of responses that indicated that LinkedIn was rate limiting."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header into a number of seconds.
+
+    >>> parse_retry_after("120")
+    120.0
+    >>> parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT")
+    0.0
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """
+    A token bucket whose rate backs off multiplicatively when rate limited and recovers
+    additively on success.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        backoff_factor: float = 0.5,
+        min_rate_factor: float = 0.05,
+        recovery_factor: float = 0.05,
+    ):
+        self.max_rate = limit.rate
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self.min_rate = limit.rate * min_rate_factor
+        self.backoff_factor = backoff_factor
+        self.recovery_step = limit.rate * recovery_factor
+        self.tokens = float(limit.burst)
+        self.blocked_until = 0.0
+        self.updated = time.monotonic()
+        self.queued = 0
+        self.throttled = 0
+        self.rate_limited = 0
+        # The lock is created by the first acquire, because on Python 3.9, a lock that is
+        # created outside of a running event loop can't be used by the loop that runs later.
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request can be made."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        self.queued += 1
+        try:
+            # The lock makes waiting requests go in FIFO order.
+            async with self._lock:
+                throttled = False
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    delay = self.blocked_until - now
+                    if delay <= 0:
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            return
+                        delay = (1 - self.tokens) / self.rate
+                    if not throttled:
+                        throttled = True
+                        self.throttled += 1
+                    await asyncio.sleep(delay)
+        finally:
+            self.queued -= 1
+
+    def record(self, status: int, retry_after: Optional[float] = None):
+        """Adapt the rate to the response to a request."""
+        now = time.monotonic()
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+        if status in RATE_LIMITED_STATUSES:
+            self.rate_limited += 1
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self.tokens = min(self.tokens, 0)
+        elif status < 400 and self.rate < self.max_rate:
+            self._refill(now)
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def stats(self) -> RateLimitStats:
+        return RateLimitStats(
+            rate=self.rate,
+            max_rate=self.max_rate,
+            queued=self.queued,
+            throttled=self.throttled,
+            rate_limited=self.rate_limited,
+        )
+
+
+class RateLimiter:
+    """
+    Rate limits requests per :class:`EndpointClass`.
+
+    :param limits: the rate limit for each endpoint class. Requests for endpoint classes that
+        are not in the dictionary are not rate limited, so ``RateLimiter({})`` disables rate
+        limiting. Defaults to :data:`DEFAULT_RATE_LIMITS`.
+    """
+
+    def __init__(self, limits: Optional[dict[EndpointClass, RateLimit]] = None):
+        if limits is None:
+            limits = DEFAULT_RATE_LIMITS
+        self.buckets = {endpoint: TokenBucket(limit) for endpoint, limit in limits.items()}
+
+    async def acquire(self, endpoint: EndpointClass):
+        if bucket := self.buckets.get(endpoint):
+            await bucket.acquire()
+
+    def record(self, endpoint: EndpointClass, status: int, retry_after: Optional[str] = None):
+        """
+        Record the response status (and ``Retry-After`` header, if any) of a request to the
+        given endpoint class.
+        """
+        if bucket := self.buckets.get(endpoint):
+            bucket.record(status, parse_retry_after(retry_after))
+
+    def stats(self) -> dict[EndpointClass, RateLimitStats]:
+        return {endpoint: bucket.stats() for endpoint, bucket in self.buckets.items()}
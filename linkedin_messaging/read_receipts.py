@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from .api_objects import URN
+
+
+class ReadReceiptBatcher:
+    """
+    Collects requests to mark conversations as read and sends them in batches.
+
+    The first call to :meth:`mark` starts a window of ``delay`` seconds. Marking the same
+    conversation again within the window doesn't send another request. When the window ends,
+    the marked conversations are sent with at most ``concurrency`` requests at a time.
+
+    :param mark_as_read: marks a conversation as read and returns whether it succeeded.
+    """
+
+    def __init__(
+        self,
+        mark_as_read: Callable[[URN], Awaitable[bool]],
+        delay: float = 1.0,
+        concurrency: int = 4,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._mark_as_read = mark_as_read
+        self.delay = delay
+        self.concurrency = concurrency
+        self._pending: dict[URN, asyncio.Future] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """The number of conversations that are waiting to be marked as read."""
+        return len(self._pending)
+
+    def mark(self, conversation_urn: URN) -> "asyncio.Future[bool]":
+        """
+        Mark the conversation as read at the end of the current window.
+
+        :returns: a future that resolves to whether the conversation was marked as read.
+            Marking the same conversation more than once in a window returns the same future.
+        """
+        if future := self._pending.get(conversation_urn):
+            return future
+        future = asyncio.get_running_loop().create_future()
+        self._pending[conversation_urn] = future
+        if not self._timer:
+            self._timer = asyncio.create_task(self._flush_later())
+            self._tasks.add(self._timer)
+            self._timer.add_done_callback(self._tasks.discard)
+        return future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.delay)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> dict[URN, bool]:
+        """
+        Send the pending read receipts now.
+
+        :returns: whether each conversation was marked as read.
+        """
+        if self._timer and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(conversation_urn: URN, future: asyncio.Future) -> tuple[URN, bool]:
+            async with semaphore:
+                try:
+                    success = await self._mark_as_read(conversation_urn)
+                except Exception:
+                    logging.exception(f"Failed to mark {conversation_urn} as read")
+                    success = False
+            if not future.done():
+                future.set_result(success)
+            return conversation_urn, success
+
+        return dict(await asyncio.gather(*(send(urn, f) for urn, f in pending.items())))
+
+    async def close(self):
+        """Send the pending read receipts and wait for the ones that are being sent."""
+        await self.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,84 @@
+"""
+A short-lived cache of responses to GET requests.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Mapping, Optional
+
+import aiohttp
+
+RequestKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def request_key(relative_url: str, params: Optional[Mapping[str, Any]] = None) -> RequestKey:
+    """
+    Identify a GET request by its URL and query parameters.
+
+    >>> request_key("/me")
+    ('/me', ())
+    >>> request_key("/messaging/conversations", {"count": 20, "keyVersion": "LEGACY_INBOX"})
+    ('/messaging/conversations', (('count', '20'), ('keyVersion', 'LEGACY_INBOX')))
+    """
+    if not params:
+        return (relative_url, ())
+    return (relative_url, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+
+class ResponseCache:
+    """
+    Caches successful responses to GET requests for a time that depends on the endpoint.
+
+    :param ttls: the number of seconds to cache responses for, by URL prefix relative to the
+        API base URL (for example, ``{"/me": 300, "/voyagerMessagingDashReactors": 10}``). If
+        more than one prefix matches a URL, the longest one is used. Responses for URLs that
+        don't match any prefix are not cached.
+    :param max_entries: the maximum number of responses to cache. When it is exceeded, the
+        least recently used response is evicted.
+    """
+
+    def __init__(self, ttls: Mapping[str, float], max_entries: int = 1024):
+        # Sorted so that the first matching prefix is the longest one.
+        self._ttls = sorted(ttls.items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: OrderedDict[RequestKey, tuple[float, aiohttp.ClientResponse]] = (
+            OrderedDict()
+        )
+
+    def ttl(self, relative_url: str) -> Optional[float]:
+        for prefix, ttl in self._ttls:
+            if relative_url.startswith(prefix):
+                return ttl
+        return None
+
+    def get(self, key: RequestKey) -> Optional[aiohttp.ClientResponse]:
+        if not (entry := self._entries.get(key)):
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: RequestKey, response: aiohttp.ClientResponse, generation: int):
+        """
+        Cache a response to the request with the given key.
+
+        :param generation: the value of :attr:`generation` when the request was made. If the
+            cache has been invalidated since then, the response may be stale, so it is not
+            cached.
+        """
+        if generation != self.generation or not (ttl := self.ttl(key[0])):
+            return
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, prefix: str = ""):
+        """Remove the cached responses for URLs that start with ``prefix``."""
+        self.generation += 1
+        for key in [key for key in self._entries if key[0].startswith(prefix)]:
+            del self._entries[key]
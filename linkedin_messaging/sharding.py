@@ -0,0 +1,415 @@
+"""
+Runs the clients for many accounts on a pool of worker processes.
+
+Each worker process runs an :class:`linkedin_messaging.accounts.AccountManager` with the
+clients for its share of the accounts, so reading the event streams and deserialising the
+events is spread across CPU cores. The events and the results of sending messages are sent
+back to the supervisor over a pipe as tuples of already deserialised objects. Both ends write
+to the pipe from a thread, so a full pipe never blocks an event loop.
+
+Messages from the supervisor to a worker:
+
+* ``("add", account_id, li_at, jsessionid)``
+* ``("remove", account_id)``
+* ``("send", request_id, account_id, conversation_urn_or_recipients, message_create)``
+* ``("stop",)``
+
+Messages from a worker to the supervisor:
+
+* ``("event", account_id, conversation_id, event)``
+* ``("result", request_id, response, error)``
+* ``("error", account_id, error)`` when adding or removing an account failed
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Awaitable, Callable, Coroutine, Hashable, Optional, Union
+
+from .accounts import AccountManager
+from .api_objects import URN, MessageCreate, RealTimeEventStreamEvent, SendMessageResponse
+from .decoders import from_dict
+from .dispatch import ConcurrentDispatcher, conversation_id
+from .linkedin import LinkedInMessaging
+
+EventHandler = Callable[[Hashable, RealTimeEventStreamEvent], Awaitable[None]]
+AccountErrorHandler = Callable[[Hashable, Exception], Awaitable[None]]
+
+# Forking a process that has a running event loop copies the loop's state into the child, so
+# the workers are always started from a fresh interpreter.
+_mp_context = multiprocessing.get_context("spawn")
+
+# The number of messages that a worker queues for the supervisor before the events and results
+# that it sends wait for the supervisor to catch up.
+_WRITE_QUEUE_SIZE = 1024
+
+
+class WorkerDiedError(Exception):
+    """The worker process that was handling a request exited before responding."""
+
+
+def _read_messages(
+    conn: Connection,
+    loop: asyncio.AbstractEventLoop,
+    handle: Callable[[Any], Coroutine[Any, Any, None]],
+):
+    """
+    Read messages from ``conn`` on a thread and handle them on ``loop`` one at a time. The
+    thread waits for each message to be handled, so a slow handler stops reading from the pipe
+    and the other end blocks when the pipe is full. ``None`` is handled when the pipe closes.
+    """
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            message = None
+        try:
+            asyncio.run_coroutine_threadsafe(handle(message), loop).result()
+        except RuntimeError:
+            # The event loop is closed.
+            return
+        if message is None:
+            return
+
+
+class _MessageWriter:
+    """
+    Writes messages to ``conn`` on a thread, so that the event loop never blocks when the pipe
+    is full because the other end is slow to read from it.
+
+    :meth:`send` waits without blocking the event loop while ``maxsize`` of the messages that
+    it queued haven't been written yet. :meth:`send_nowait` doesn't count towards this and
+    never waits. Once the pipe is closed, the messages are dropped.
+    """
+
+    def __init__(self, conn: Connection, maxsize: int = _WRITE_QUEUE_SIZE):
+        self._conn = conn
+        self._loop = asyncio.get_running_loop()
+        self._queue: queue.SimpleQueue[Optional[tuple[bytes, bool]]] = queue.SimpleQueue()
+        self._space = asyncio.Semaphore(maxsize)
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    async def send(self, message: Any):
+        """Queue a message. Raises an exception if the message can't be pickled."""
+        data = bytes(ForkingPickler.dumps(message))
+        await self._space.acquire()
+        self._queue.put((data, True))
+
+    def send_nowait(self, message: Any):
+        self._queue.put((bytes(ForkingPickler.dumps(message)), False))
+
+    def _write(self):
+        closed = False
+        while item := self._queue.get():
+            data, counted = item
+            if not closed:
+                try:
+                    self._conn.send_bytes(data)
+                except OSError:
+                    closed = True
+            if counted:
+                try:
+                    self._loop.call_soon_threadsafe(self._space.release)
+                except RuntimeError:
+                    # The event loop is closed.
+                    return
+
+    def close(self):
+        """Stop the thread once it has written the messages that are already queued."""
+        self._queue.put(None)
+
+    async def wait_closed(self):
+        await self._loop.run_in_executor(None, self._thread.join)
+
+
+def _run_worker(conn: Connection, client_class: type[LinkedInMessaging], client_kwargs: dict):
+    asyncio.run(_worker_main(conn, client_class, client_kwargs))
+
+
+async def _worker_main(
+    conn: Connection,
+    client_class: type[LinkedInMessaging],
+    client_kwargs: dict,
+):
+    manager = AccountManager(client_class=client_class)
+    commands: asyncio.Queue = asyncio.Queue()
+    threading.Thread(
+        target=_read_messages,
+        args=(conn, asyncio.get_running_loop(), commands.put),
+        daemon=True,
+    ).start()
+    writer = _MessageWriter(conn)
+    sends: set[asyncio.Task] = set()
+
+    def forward_events(account_id: Hashable) -> Callable[[Any], Awaitable[None]]:
+        async def forward(data: Any):
+            payload = data.get("com.linkedin.realtimefrontend.DecoratedEvent", {}).get("payload")
+            if payload:
+                event = from_dict(RealTimeEventStreamEvent, payload)
+                await writer.send(("event", account_id, conversation_id(data), event))
+
+        return forward
+
+    async def send(
+        request_id: int,
+        account_id: Hashable,
+        conversation_urn_or_recipients: Union[URN, list[URN]],
+        message_create: MessageCreate,
+    ):
+        response, error = None, None
+        try:
+            response = await manager[account_id].send_message(
+                conversation_urn_or_recipients, message_create
+            )
+        except Exception as e:
+            error = e
+        try:
+            await writer.send(("result", request_id, response, error))
+        except Exception:
+            # The error can't be pickled.
+            await writer.send(("result", request_id, None, RuntimeError(repr(error))))
+
+    async def account_failed(account_id: Hashable, error: Exception):
+        try:
+            await writer.send(("error", account_id, error))
+        except Exception:
+            # The error can't be pickled.
+            await writer.send(("error", account_id, RuntimeError(repr(error))))
+
+    try:
+        while (command := await commands.get()) and command[0] != "stop":
+            kind, *args = command
+            if kind in ("add", "remove"):
+                # An account that can't be added (for example, because its cookies are
+                # invalid) is reported to the supervisor rather than taking down the other
+                # accounts of the worker.
+                account_id = args[0]
+                try:
+                    if kind == "add":
+                        _, li_at, jsessionid = args
+                        linkedin = manager.add_account(
+                            account_id, li_at, jsessionid, **client_kwargs
+                        )
+                        linkedin.add_event_listener("ALL_EVENTS", forward_events(account_id))
+                        manager.start_account(account_id)
+                    else:
+                        await manager.remove_account(account_id)
+                except Exception as e:
+                    logging.exception(f"Failed to {kind} account {account_id}")
+                    if kind == "add":
+                        await manager.remove_account(account_id)
+                    await account_failed(account_id, e)
+            elif kind == "send":
+                task = asyncio.create_task(send(*args))
+                sends.add(task)
+                task.add_done_callback(sends.discard)
+    finally:
+        await asyncio.gather(*sends, return_exceptions=True)
+        await manager.close()
+        writer.close()
+        await writer.wait_closed()
+        conn.close()
+
+
+@dataclass
+class _Worker:
+    process: BaseProcess
+    writer: _MessageWriter
+    accounts: dict[Hashable, tuple[str, str]] = field(default_factory=dict)
+    """The credentials of the accounts that the worker runs."""
+    requests: dict[int, asyncio.Future] = field(default_factory=dict)
+    """The send requests that the worker hasn't responded to."""
+    exited: asyncio.Event = field(default_factory=asyncio.Event)
+    """Set once all of the messages from the worker have been handled and it has exited."""
+
+
+class ShardSupervisor:
+    """
+    Spreads accounts across a pool of worker processes.
+
+    Each account is added to the worker that runs the fewest accounts. When a worker exits
+    unexpectedly, a new worker is started in its place and the accounts of the worker that
+    exited are spread across the pool again. Requests that the worker hadn't responded to fail
+    with :class:`WorkerDiedError`.
+
+    ``on_event`` is called with the account ID and the event for every real-time event of
+    every account. Events for the same conversation of an account are handled in order, while
+    other events are handled by up to ``handler_concurrency`` tasks at a time.
+
+    If a worker fails to add an account, the account is removed and ``on_account_error`` is
+    called with the account ID and the error. The other accounts of the worker keep running.
+
+    :param processes: the number of worker processes. Defaults to the number of CPUs.
+    :param client_class: the class of the clients in the workers. It must be importable by the
+        worker processes.
+    :param client_kwargs: passed to the clients in the workers.
+    """
+
+    def __init__(
+        self,
+        on_event: EventHandler,
+        processes: Optional[int] = None,
+        client_class: type[LinkedInMessaging] = LinkedInMessaging,
+        handler_concurrency: int = 8,
+        handler_queue_size: int = 256,
+        on_account_error: Optional[AccountErrorHandler] = None,
+        **client_kwargs: Any,
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.client_class = client_class
+        self.client_kwargs = client_kwargs
+        self._on_event = on_event
+        self._on_account_error = on_account_error
+        self._dispatcher = ConcurrentDispatcher(
+            self._handle_event, handler_concurrency, handler_queue_size
+        )
+        self._workers: list[_Worker] = []
+        self._next_request_id = 0
+        self._closing = False
+
+    @property
+    def assignments(self) -> dict[Hashable, int]:
+        """The PID of the worker process that runs each account."""
+        return {
+            account_id: worker.process.pid or 0
+            for worker in self._workers
+            for account_id in worker.accounts
+        }
+
+    def start(self):
+        """Start the worker processes."""
+        while len(self._workers) < self.processes:
+            self._start_worker()
+
+    def _start_worker(self) -> _Worker:
+        conn, child_conn = _mp_context.Pipe()
+        process = _mp_context.Process(
+            target=_run_worker,
+            args=(child_conn, self.client_class, self.client_kwargs),
+            daemon=True,
+        )
+        process.start()
+        # Closing the parent's copy of the child's end means that reading from the pipe fails
+        # when the worker exits.
+        child_conn.close()
+        worker = _Worker(process, _MessageWriter(conn))
+        self._workers.append(worker)
+
+        async def handle(message: Any):
+            await self._handle_message(worker, message)
+
+        threading.Thread(
+            target=_read_messages,
+            args=(conn, asyncio.get_running_loop(), handle),
+            daemon=True,
+        ).start()
+        return worker
+
+    def add_account(self, account_id: Hashable, li_at: str, jsessionid: str):
+        """Start running an account on the worker that runs the fewest accounts."""
+        if account_id in self.assignments:
+            raise ValueError(f"Account {account_id} already exists")
+        self.start()
+        worker = min(self._workers, key=lambda w: len(w.accounts))
+        worker.accounts[account_id] = (li_at, jsessionid)
+        worker.writer.send_nowait(("add", account_id, li_at, jsessionid))
+
+    def remove_account(self, account_id: Hashable):
+        """Stop running an account."""
+        for worker in self._workers:
+            if worker.accounts.pop(account_id, None):
+                worker.writer.send_nowait(("remove", account_id))
+
+    async def send_message(
+        self,
+        account_id: Hashable,
+        conversation_urn_or_recipients: Union[URN, list[URN]],
+        message_create: MessageCreate,
+    ) -> SendMessageResponse:
+        """Send a message from an account using :meth:`LinkedInMessaging.send_message`."""
+        for worker in self._workers:
+            if account_id in worker.accounts:
+                break
+        else:
+            raise KeyError(account_id)
+
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        future = worker.requests[request_id] = asyncio.get_running_loop().create_future()
+        worker.writer.send_nowait(
+            ("send", request_id, account_id, conversation_urn_or_recipients, message_create)
+        )
+        return await future
+
+    async def _handle_event(self, item: tuple[Hashable, RealTimeEventStreamEvent]):
+        await self._on_event(*item)
+
+    async def _handle_message(self, worker: _Worker, message: Any):
+        if message is None:
+            await self._worker_exited(worker)
+            return
+
+        kind, *args = message
+        if kind == "event":
+            account_id, conversation, event = args
+            await self._dispatcher.submit((account_id, conversation), (account_id, event))
+        elif kind == "result":
+            request_id, response, error = args
+            if (future := worker.requests.pop(request_id, None)) and not future.done():
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(response)
+        elif kind == "error":
+            account_id, error = args
+            logging.warning(f"Worker {worker.process.pid} failed to run account {account_id}")
+            # The account isn't moved to another worker if this one exits.
+            worker.accounts.pop(account_id, None)
+            if self._on_account_error:
+                try:
+                    await self._on_account_error(account_id, error)
+                except Exception:
+                    logging.exception(f"Failed to handle the error for account {account_id}")
+
+    async def _worker_exited(self, worker: _Worker):
+        await asyncio.get_running_loop().run_in_executor(None, worker.process.join, 1)
+        for future in worker.requests.values():
+            if not future.done():
+                future.set_exception(WorkerDiedError(f"Worker {worker.process.pid} exited"))
+        worker.requests.clear()
+        worker.writer.close()
+        worker.exited.set()
+        if worker not in self._workers or self._closing:
+            return
+
+        logging.warning(
+            f"Worker {worker.process.pid} exited with code {worker.process.exitcode}, "
+            f"moving {len(worker.accounts)} accounts"
+        )
+        self._workers.remove(worker)
+        self._start_worker()
+        for account_id, (li_at, jsessionid) in worker.accounts.items():
+            self.add_account(account_id, li_at, jsessionid)
+
+    async def close(self, timeout: float = 10):
+        """Stop the workers and wait for the events that they sent to be handled."""
+        self._closing = True
+        loop = asyncio.get_running_loop()
+        for worker in self._workers:
+            worker.writer.send_nowait(("stop",))
+        for worker in self._workers:
+            await loop.run_in_executor(None, worker.process.join, timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            await worker.exited.wait()
+            await worker.writer.wait_closed()
+        self._workers.clear()
+        await self._dispatcher.close()
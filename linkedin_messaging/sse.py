@@ -0,0 +1,116 @@
+"""
+An incremental parser for `Server-Sent Events
+<https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation>`_.
+
+The parser operates on the raw byte chunks read from the connection. Field values are kept as
+``bytes`` so the ``data`` of an event can be passed straight to :func:`json.loads` without
+decoding each line first.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+_BOM = b"\xef\xbb\xbf"
+_CR = 0x0D
+_LF = 0x0A
+
+
+@dataclass
+class ServerSentEvent:
+    data: bytes
+    event: str = "message"
+    last_event_id: Optional[str] = None
+
+
+class SSEParser:
+    """
+    Parses a ``text/event-stream`` incrementally. Feed it byte chunks as they arrive with
+    :meth:`feed`, which returns the events that were completed by the chunk. Chunks do not have
+    to end on a line boundary.
+
+    >>> parser = SSEParser()
+    >>> parser.feed(b"id: 1\\ndata: {\\"a\\":")
+    []
+    >>> parser.feed(b" 1}\\ndata: [2]\\n\\n")
+    [ServerSentEvent(data=b'{"a": 1}\\n[2]', event='message', last_event_id='1')]
+    """
+
+    last_event_id: Optional[str]
+    """The ID of the last event that was seen. Use it for the ``Last-Event-ID`` header."""
+
+    retry: Optional[int]
+    """The reconnection time (in milliseconds) requested by the server, if any."""
+
+    def __init__(self, last_event_id: Optional[str] = None):
+        self.last_event_id = last_event_id
+        self.retry = None
+        self._buffer = b""
+        self._started = False
+        self._skip_lf = False
+        self._data: list[bytes] = []
+        self._event = ""
+
+    def feed(self, chunk: bytes) -> list[ServerSentEvent]:
+        if self._skip_lf:
+            # The previous chunk ended with a CR, so a leading LF is part of the same CRLF.
+            self._skip_lf = False
+            if chunk[:1] == b"\n":
+                chunk = chunk[1:]
+        buffer = self._buffer + chunk if self._buffer else chunk
+        if not buffer:
+            return []
+
+        if not self._started:
+            if len(buffer) < len(_BOM) and _BOM.startswith(buffer):
+                self._buffer = buffer
+                return []
+            self._started = True
+            if buffer.startswith(_BOM):
+                buffer = buffer[len(_BOM) :]
+                if not buffer:
+                    self._buffer = b""
+                    return []
+
+        # bytes.splitlines splits on exactly the line endings that the spec allows (CRLF, LF
+        # and CR). If the buffer doesn't end with one of them, the last line is incomplete.
+        lines = buffer.splitlines()
+        last = buffer[-1]
+        if last == _LF or last == _CR:
+            self._buffer = b""
+            self._skip_lf = last == _CR
+        else:
+            self._buffer = lines.pop()
+
+        events = []
+        for line in lines:
+            if line.startswith(b"data:"):
+                self._data.append(line[6:] if line[5:6] == b" " else line[5:])
+            elif not line:
+                if self._data:
+                    events.append(
+                        ServerSentEvent(
+                            self._data[0] if len(self._data) == 1 else b"\n".join(self._data),
+                            self._event or "message",
+                            self.last_event_id,
+                        )
+                    )
+                    self._data = []
+                self._event = ""
+            elif line[0] != 0x3A:  # Lines that start with a colon are comments.
+                self._process_field(line)
+        return events
+
+    def _process_field(self, line: bytes):
+        name, colon, value = line.partition(b":")
+        if colon and value[:1] == b" ":
+            value = value[1:]
+        if name == b"data":
+            self._data.append(value)
+        elif name == b"event":
+            self._event = value.decode("utf-8", "replace")
+        elif name == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
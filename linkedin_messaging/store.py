@@ -0,0 +1,171 @@
+"""
+A local SQLite store of conversations and their events.
+
+The store lets a client pick up where it left off after a restart instead of downloading the
+whole inbox again. See :meth:`linkedin_messaging.LinkedInMessaging.incremental_sync`.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Union, cast
+
+from dataclasses_json import DataClassJsonMixin
+
+from .api_objects import URN, Conversation, ConversationEvent, decoder_functions, encoder_functions
+from .decoders import from_json
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    last_activity_at INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_last_activity_at
+    ON conversations (last_activity_at);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    created_at INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_conversation_id_created_at
+    ON events (conversation_id, created_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_encode_datetime = encoder_functions[datetime]
+_decode_datetime = cast(Callable[[Any], Optional[datetime]], decoder_functions[datetime])
+
+
+class ConversationStore:
+    """
+    Persists :class:`Conversation` and :class:`ConversationEvent` objects in an SQLite
+    database, keyed by their ``entity_urn``.
+
+    Storing an object with the same ``entity_urn`` as an existing one replaces it, so it is
+    safe to store the same object more than once (for example, from both a sync and the
+    real-time event stream).
+
+    The methods do blocking I/O, so they should be run in an executor when called from the
+    event loop (which is what :class:`linkedin_messaging.LinkedInMessaging` does).
+
+    :param path: the path of the database file. Defaults to an in-memory database.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike] = ":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @property
+    def high_water_mark(self) -> Optional[datetime]:
+        """
+        The ``last_activity_at`` of the most recently active conversation as of the last
+        completed sync.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM sync_state WHERE key = 'high_water_mark'"
+            ).fetchone()
+        return _decode_datetime(row[0]) if row else None
+
+    @high_water_mark.setter
+    def high_water_mark(self, value: Optional[datetime]):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('high_water_mark', ?)",
+                (_encode_datetime(value),),
+            )
+
+    def save_conversations(
+        self,
+        conversations: Iterable[Conversation],
+        events: Iterable[ConversationEvent] = (),
+    ):
+        """
+        Store the conversations, along with the events that they contain and ``events``, in
+        one transaction.
+        """
+        rows = []
+        all_events = list(events)
+        for conversation in conversations:
+            if not conversation.entity_urn:
+                continue
+            rows.append(
+                (
+                    conversation.entity_urn.id_str(),
+                    _encode_datetime(conversation.last_activity_at),
+                    cast(DataClassJsonMixin, conversation).to_json(),
+                )
+            )
+            all_events.extend(conversation.events)
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO conversations (id, last_activity_at, data) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._save_events(all_events)
+
+    def save_events(self, events: Iterable[ConversationEvent]):
+        with self._lock, self._db:
+            self._save_events(events)
+
+    def _save_events(self, events: Iterable[ConversationEvent]):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO events (id, conversation_id, created_at, data) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (
+                    event.entity_urn.id_str(),
+                    # Event URNs are (conversation ID, event ID) pairs.
+                    event.entity_urn.id_parts[0],
+                    _encode_datetime(event.created_at),
+                    cast(DataClassJsonMixin, event).to_json(),
+                )
+                for event in events
+                if event.entity_urn
+            ),
+        )
+
+    def get_conversation(self, conversation_urn: URN) -> Optional[Conversation]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM conversations WHERE id = ?", (conversation_urn.id_str(),)
+            ).fetchone()
+        return from_json(Conversation, row[0]) if row else None
+
+    def get_conversations(self) -> list[Conversation]:
+        """Get all of the stored conversations, from most to least recently active."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM conversations ORDER BY last_activity_at DESC"
+            ).fetchall()
+        return [from_json(Conversation, data) for (data,) in rows]
+
+    def get_events(
+        self,
+        conversation_urn: URN,
+        limit: Optional[int] = None,
+    ) -> list[ConversationEvent]:
+        """
+        Get the stored events in the given conversation, from oldest to newest.
+
+        :param limit: only get this many of the newest events.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM events WHERE conversation_id = ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (conversation_urn.get_id(), -1 if limit is None else limit),
+            ).fetchall()
+        return [from_json(ConversationEvent, data) for (data,) in reversed(rows)]
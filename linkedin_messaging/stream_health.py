@@ -0,0 +1,86 @@
+"""
+Tracks the health of the connection to the real-time event stream.
+
+The event stream is kept open for as long as the server keeps sending data. While there are no
+events, the server sends heartbeat frames, so a stream that sends nothing at all for longer than
+the read-idle timeout is considered dead and is reconnected.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+HEARTBEAT_KEY = "com.linkedin.realtimefrontend.Heartbeat"
+
+
+@dataclass
+class StreamStats:
+    connected: bool
+    """Whether the event stream is currently open."""
+    connects: int
+    """The number of times the event stream was opened."""
+    reconnects: int
+    """The number of times the event stream was opened again after the first time."""
+    failures: int
+    """The number of attempts to open the event stream that failed."""
+    frames: int
+    """The number of frames received over all connections, including heartbeats."""
+    heartbeats: int
+    """The number of heartbeat frames received over all connections."""
+    stream_age: Optional[float]
+    """The number of seconds that the current event stream has been open for."""
+    idle_time: Optional[float]
+    """The number of seconds since anything was read from the current event stream."""
+    since_heartbeat: Optional[float]
+    """The number of seconds since the last heartbeat on the current event stream."""
+
+
+class StreamHealth:
+    """Records what happens to the event stream connections of a client."""
+
+    def __init__(self):
+        self.connects = 0
+        self.failures = 0
+        self.frames = 0
+        self.heartbeats = 0
+        self.connected_at: Optional[float] = None
+        self.last_read_at: Optional[float] = None
+        self.last_heartbeat_at: Optional[float] = None
+
+    def on_connect(self):
+        self.connects += 1
+        self.connected_at = self.last_read_at = time.monotonic()
+        self.last_heartbeat_at = None
+
+    def on_failure(self):
+        self.failures += 1
+
+    def on_read(self):
+        self.last_read_at = time.monotonic()
+
+    def on_frame(self, heartbeat: bool):
+        self.frames += 1
+        if heartbeat:
+            self.heartbeats += 1
+            self.last_heartbeat_at = time.monotonic()
+
+    def on_disconnect(self):
+        self.connected_at = self.last_read_at = self.last_heartbeat_at = None
+
+    def stats(self) -> StreamStats:
+        now = time.monotonic()
+
+        def since(t: Optional[float]) -> Optional[float]:
+            return None if t is None else now - t
+
+        return StreamStats(
+            connected=self.connected_at is not None,
+            connects=self.connects,
+            reconnects=max(0, self.connects - 1),
+            failures=self.failures,
+            frames=self.frames,
+            heartbeats=self.heartbeats,
+            stream_age=since(self.connected_at),
+            idle_time=since(self.last_read_at),
+            since_heartbeat=since(self.last_heartbeat_at),
+        )
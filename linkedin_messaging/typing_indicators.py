@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from .api_objects import URN
+
+
+class TypingManager:
+    """
+    Throttles typing notifications to at most one per conversation every ``interval`` seconds.
+
+    Call :meth:`typing` whenever the user types (for example, on every keystroke). The first
+    call sends a typing notification straight away. If typing continues, another notification
+    is sent when the interval is up, which keeps the indicator alive for as long as the user is
+    typing. :meth:`stop` stops sending notifications for the conversation, which should be done
+    when a message is sent.
+
+    :param set_typing: sends a typing notification to a conversation.
+    """
+
+    def __init__(self, set_typing: Callable[[URN], Awaitable[None]], interval: float = 5.0):
+        self._set_typing = set_typing
+        self.interval = interval
+        self._tasks: dict[URN, asyncio.Task] = {}
+        self._typed: set[URN] = set()
+
+    def typing(self, conversation_urn: URN):
+        """Record that the user is typing in the conversation."""
+        if conversation_urn in self._tasks:
+            self._typed.add(conversation_urn)
+            return
+        task = asyncio.create_task(self._send(conversation_urn))
+        self._tasks[conversation_urn] = task
+        task.add_done_callback(lambda t: self._remove(conversation_urn, t))
+
+    def _remove(self, conversation_urn: URN, task: asyncio.Task):
+        if self._tasks.get(conversation_urn) is task:
+            del self._tasks[conversation_urn]
+
+    async def _send(self, conversation_urn: URN):
+        while True:
+            self._typed.discard(conversation_urn)
+            sent_at = time.monotonic()
+            try:
+                await self._set_typing(conversation_urn)
+            except Exception:
+                logging.exception(f"Failed to send typing notification to {conversation_urn}")
+            await asyncio.sleep(self.interval - (time.monotonic() - sent_at))
+            if conversation_urn not in self._typed:
+                return
+
+    def stop(self, conversation_urn: URN):
+        """Stop sending typing notifications to the conversation."""
+        self._typed.discard(conversation_urn)
+        if task := self._tasks.pop(conversation_urn, None):
+            task.cancel()
+
+    async def close(self):
+        tasks = list(self._tasks.values())
+        for conversation_urn in list(self._tasks):
+            self.stop(conversation_urn)
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,14 @@
+import time
+from typing import Iterator
+
+import pytest
+
+
+@pytest.fixture(params=["America/New_York", "Asia/Tokyo"])
+def local_timezone(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator:
+    """Run the test with the local timezone set to one that isn't UTC."""
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
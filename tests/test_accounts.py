@@ -0,0 +1,105 @@
+import asyncio
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging.accounts import AccountManager
+from linkedin_messaging.rate_limit import RateLimiter
+
+
+def test_accounts_share_connector_but_not_sessions():
+    async def run():
+        running = 0
+        max_running = 0
+        csrf_tokens: list[str] = []
+
+        async def handler(request: web.Request) -> web.Response:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            csrf_tokens.append(request.headers["csrf-token"])
+            await asyncio.sleep(0.02)
+            running -= 1
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_get("/me", handler)
+        async with TestServer(app) as server:
+            manager = AccountManager(limit=10, max_concurrent_requests=3)
+            accounts = [manager.add_account(i, f"li_at{i}", f"jsessionid{i}") for i in range(5)]
+            assert len(manager) == 5
+            assert all(a.connector is manager.connector for a in accounts)
+            assert len({id(a.session) for a in accounts}) == 5
+
+            # Each account makes its own requests, but no more than 3 are in flight.
+            url = str(server.make_url("/me"))
+            await asyncio.gather(*(a._request("GET", url, None) for a in accounts * 3))
+            assert max_running == 3
+            assert sorted(set(csrf_tokens)) == [f"jsessionid{i}" for i in range(5)]
+
+            listener = manager.start_account(0)
+            sessions = [a.session for a in accounts]
+            await manager.remove_account(0)
+            assert listener.done()
+            assert sessions[0].closed and not sessions[1].closed
+            await manager.close()
+            assert all(s.closed for s in sessions)
+            assert manager.connector.closed and manager.stream_connector.closed
+
+    asyncio.run(run())
+
+
+def test_event_streams_dont_use_request_connections():
+    async def run():
+        connected = 0
+        media_running = 0
+        max_media_running = 0
+
+        async def realtime_connect(request: web.Request) -> web.StreamResponse:
+            nonlocal connected
+            assert request.headers["csrf-token"].startswith("jsessionid")
+            response = web.StreamResponse()
+            await response.prepare(request)
+            connected += 1
+            await asyncio.sleep(10)
+            return response
+
+        async def media(request: web.Request) -> web.Response:
+            nonlocal media_running, max_media_running
+            media_running += 1
+            max_media_running = max(max_media_running, media_running)
+            await asyncio.sleep(0.02)
+            media_running -= 1
+            return web.Response(body=b"media")
+
+        app = web.Application()
+        app.router.add_get("/realtime/connect", realtime_connect)
+        app.router.add_get("/media", media)
+        async with TestServer(app) as server:
+            manager = AccountManager(limit=2, max_concurrent_requests=1)
+            accounts = [
+                manager.add_account(i, f"li_at{i}", f"jsessionid{i}", rate_limiter=RateLimiter({}))
+                for i in range(4)
+            ]
+            with mock.patch(
+                "linkedin_messaging.linkedin.REALTIME_CONNECT_URL",
+                str(server.make_url("/realtime/connect")),
+            ):
+                for i in range(4):
+                    manager.start_account(i)
+                while connected < 4:
+                    await asyncio.sleep(0.01)
+
+            # More accounts are listening than the connection limit, but requests can still
+            # be made, and media downloads count against max_concurrent_requests.
+            url = str(server.make_url("/media"))
+            data = await asyncio.wait_for(
+                asyncio.gather(*(a.download_linkedin_media(url) for a in accounts)), 10
+            )
+            assert data == [b"media"] * 4
+            assert max_media_running == 1
+            assert manager.pool_stats().in_use == 0
+            await manager.close()
+
+    asyncio.run(run())
@@ -0,0 +1,61 @@
+import asyncio
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+
+
+def test_logged_in_uses_observed_auth_state():
+    async def run():
+        requests: list[str] = []
+        status = {"/conversations": 200}
+
+        async def me(request: web.Request) -> web.Response:
+            requests.append(request.path)
+            return web.json_response({"miniProfile": {"firstName": "Jane"}})
+
+        async def conversations(request: web.Request) -> web.Response:
+            requests.append(request.path)
+            if status["/conversations"] == 302:
+                raise web.HTTPFound("/login")
+            return web.json_response({}, status=status["/conversations"])
+
+        async def login(request: web.Request) -> web.Response:
+            return web.Response(text="Sign in")
+
+        app = web.Application()
+        app.router.add_get("/me", me)
+        app.router.add_get("/conversations", conversations)
+        app.router.add_get("/login", login)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging.from_cookies("li_at", "jsessionid")
+            with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", str(server.make_url(""))):
+                # There is no observed state yet, so the profile is fetched.
+                assert await linkedin.logged_in()
+                assert await linkedin.logged_in()
+                profile = await linkedin.get_user_profile()
+                assert profile.mini_profile and profile.mini_profile.first_name == "Jane"
+                assert requests == ["/me"]
+
+                status["/conversations"] = 401
+                await linkedin._get("/conversations")
+                assert not await linkedin.logged_in()
+
+                status["/conversations"] = 200
+                await linkedin._get("/conversations")
+                assert await linkedin.logged_in()
+
+                status["/conversations"] = 302
+                await linkedin._get("/conversations")
+                assert linkedin.auth_valid is False
+                assert not await linkedin.logged_in()
+
+                # Once the state is stale, the profile is fetched again.
+                linkedin.auth_state_ttl = 0
+                assert await linkedin.logged_in()
+                assert requests.count("/me") == 2
+            await linkedin.close()
+
+    asyncio.run(run())
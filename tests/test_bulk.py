@@ -0,0 +1,122 @@
+import asyncio
+import random
+from typing import AsyncGenerator, Union
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import (
+    URN,
+    AttributedBody,
+    MessageCreate,
+    SendMessageResponse,
+)
+from linkedin_messaging.bulk import BulkMessage
+
+
+def test_send_messages():
+    async def run():
+        linkedin = LinkedInMessaging()
+        sent: dict[str, list[str]] = {}
+        running = 0
+        max_running = 0
+
+        async def send_message(
+            conversation_urn_or_recipients: Union[URN, list[URN]],
+            message_create: MessageCreate,
+        ) -> SendMessageResponse:
+            nonlocal running, max_running
+            assert isinstance(conversation_urn_or_recipients, URN)
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(random.random() / 100)
+            running -= 1
+            assert message_create.attributed_body is not None
+            text = message_create.attributed_body.text
+            if text == "fail":
+                raise ValueError("failed")
+            sent.setdefault(conversation_urn_or_recipients.get_id(), []).append(text)
+            return SendMessageResponse()
+
+        linkedin.send_message = send_message  # type: ignore
+
+        def message(conversation_id: int, text: str, key: str) -> BulkMessage:
+            return BulkMessage(
+                URN(f"urn:li:fs_conversation:{conversation_id}"),
+                MessageCreate(AttributedBody(text)),
+                idempotency_key=key,
+            )
+
+        async def messages() -> AsyncGenerator[BulkMessage, None]:
+            for i in range(100):
+                yield message(i % 10, str(i), str(i))
+            # Duplicates are skipped.
+            yield message(0, "0", "0")
+            yield message(0, "fail", "fail")
+
+        sent_keys: set[str] = set()
+        results = [r async for r in linkedin.send_messages(messages(), 4, sent_keys=sent_keys)]
+        assert len(results) == 101
+        errors = [r for r in results if r.error]
+        assert len(errors) == 1 and isinstance(errors[0].error, ValueError)
+        assert all(r.response for r in results if not r.error)
+        assert max_running <= 4
+        for i in range(10):
+            # Messages to each conversation are sent in order.
+            assert sent[str(i)] == [str(j) for j in range(i, 100, 10)]
+        # The key of the message that failed can be used again.
+        assert sent_keys == {str(i) for i in range(100)}
+
+        # Keys from previous calls are skipped.
+        results = [
+            r
+            async for r in linkedin.send_messages(
+                [message(0, "0", "0"), message(0, "new", "new")], sent_keys=sent_keys
+            )
+        ]
+        assert [r.message.message_create.attributed_body.text for r in results] == ["new"]
+        await linkedin.close()
+
+    asyncio.run(run())
+
+
+def test_send_messages_resumes_after_stopping_early():
+    async def run():
+        linkedin = LinkedInMessaging()
+        sent: list[str] = []
+
+        async def send_message(
+            conversation_urn_or_recipients: Union[URN, list[URN]],
+            message_create: MessageCreate,
+        ) -> SendMessageResponse:
+            await asyncio.sleep(0.01)
+            assert message_create.attributed_body is not None
+            sent.append(message_create.attributed_body.text)
+            return SendMessageResponse()
+
+        linkedin.send_message = send_message  # type: ignore
+
+        messages = [
+            BulkMessage(
+                URN("urn:li:fs_conversation:0"),
+                MessageCreate(AttributedBody(str(i))),
+                idempotency_key=str(i),
+            )
+            for i in range(10)
+        ]
+        sent_keys: set[str] = set()
+        async for result in linkedin.send_messages(messages, sent_keys=sent_keys):
+            # Messages that are still queued when the caller stops aren't sent.
+            break
+        assert 1 <= len(sent) < len(messages)
+        assert sent_keys == set(sent)
+
+        # Only the messages that weren't sent are sent when resuming.
+        already_sent = list(sent)
+        results = [r async for r in linkedin.send_messages(messages, sent_keys=sent_keys)]
+        assert [r.message.idempotency_key for r in results] == [
+            str(i) for i in range(len(already_sent), len(messages))
+        ]
+        assert sent == [str(i) for i in range(len(messages))]
+        assert sent_keys == set(sent)
+        await linkedin.close()
+
+    asyncio.run(run())
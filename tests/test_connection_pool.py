@@ -0,0 +1,34 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.rate_limit import EndpointClass
+
+
+def test_responses_are_released():
+    async def run():
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response({"ok": True})
+
+        app = web.Application()
+        app.router.add_route("*", "/", handler)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging(limit=2)
+            url = str(server.make_url("/"))
+            # More requests than the pool has connections, none of which read the response.
+            responses = await asyncio.gather(
+                *(linkedin._request("POST", url, EndpointClass.MESSAGING_WRITE) for _ in range(10))
+            )
+            stats = linkedin.pool_stats()
+            await linkedin.close()
+
+        assert all(r.status == 200 for r in responses)
+        assert await responses[0].json() == {"ok": True}
+        assert stats.limit == 2
+        assert stats.in_use == 0
+        assert stats.waiters == 0
+        assert 1 <= stats.idle <= 2
+
+    asyncio.run(run())
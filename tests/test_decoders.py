@@ -0,0 +1,93 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+import pytest
+from dataclasses_json import dataclass_json
+
+from linkedin_messaging import decoders
+from linkedin_messaging.api_objects import (
+    URN,
+    ConversationsResponse,
+    MessageAttachment,
+    RealTimeEventStreamEvent,
+    SeenReceipt,
+)
+from linkedin_messaging.decoders import from_dict, from_json
+
+conversations_json = Path(__file__).parent.joinpath("data", "conversations.json").read_text()
+
+
+def test_decode_matches_dataclasses_json():
+    assert from_json(ConversationsResponse, conversations_json) == (
+        ConversationsResponse.from_json(conversations_json)
+    )
+
+
+def test_decode_field_name_overrides():
+    response = from_json(ConversationsResponse, conversations_json)
+    event = response.elements[0].events[0]
+    assert event.from_ and event.from_.messaging_member
+    assert event.from_.messaging_member.mini_profile
+    assert event.from_.messaging_member.mini_profile.first_name == "John"
+    assert event.event_content and event.event_content.message_event
+    attribute = event.event_content.message_event.attributed_body.attributes[0]  # type: ignore
+    assert attribute.type_ and attribute.type_.text_entity
+    assert attribute.type_.text_entity.urn == URN(
+        "urn:li:fs_miniProfile:ACoAAB1x2y3z4a5b6c7d8e9f0"
+    )
+
+
+def test_decode_urn_and_datetime():
+    response = from_json(ConversationsResponse, conversations_json)
+    conversation = response.elements[0]
+    assert isinstance(conversation.entity_urn, URN)
+    assert conversation.last_activity_at
+    assert conversation.last_activity_at.isoformat() == "2021-12-17T17:56:53.468000"
+    assert from_dict(MessageAttachment, {"id": "urn:li:digitalmediaAsset:1"}).id_ == URN("1")
+
+
+def test_decode_union_and_required_fields():
+    for payload in (
+        {"conversation": "urn:li:fs_conversation:123"},
+        {"conversation": {"entityUrn": "urn:li:fs_conversation:123"}},
+        {"seenReceipt": {"eventUrn": "urn:li:fs_event:(1,2)", "seenAt": 1639763813468}},
+    ):
+        assert from_dict(RealTimeEventStreamEvent, payload) == (
+            RealTimeEventStreamEvent.from_dict(payload)
+        )
+
+    with pytest.raises(KeyError):
+        from_dict(SeenReceipt, json.loads("{}"))
+
+
+@dataclass_json
+@dataclass
+class Counts:
+    counts: dict[str, int]
+
+
+@dataclass_json
+@dataclass
+class WithCounts:
+    receipt: SeenReceipt
+    counts: Optional[Counts] = None
+
+
+def test_decode_without_decode_type():
+    # dataclasses_json 0.6.3 doesn't have _decode_type, so classes with fields that need it are
+    # decoded with from_dict.
+    payload = {
+        "receipt": {"eventUrn": "urn:li:fs_event:(1,2)", "seenAt": 1639763813468},
+        "counts": {"counts": {"a": 1}},
+    }
+    with mock.patch.object(decoders, "_decode_type", None), mock.patch.object(
+        decoders, "_decoders", {}
+    ):
+        assert from_dict(WithCounts, payload) == WithCounts.from_dict(payload)
+        assert decoders._decoders[Counts] is not decoders._decoders[WithCounts]
+        assert from_json(ConversationsResponse, conversations_json) == (
+            ConversationsResponse.from_json(conversations_json)
+        )
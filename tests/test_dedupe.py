@@ -0,0 +1,78 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest import mock
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import RealTimeEventStreamEvent
+from linkedin_messaging.dedupe import DedupeIndex, event_key
+from linkedin_messaging.sse import SSEParser
+
+recorded_stream = Path(__file__).parent.joinpath("data", "realtime_stream.txt").read_bytes()
+frames = [json.loads(e.data) for e in SSEParser().feed(recorded_stream)]
+
+
+def test_dedupe_index_is_bounded():
+    index = DedupeIndex(max_entries=3)
+    assert not any(index.seen(str(i)) for i in range(4))
+    # The oldest key was evicted.
+    assert not index.seen("0")
+    assert index.seen("3")
+    # A new version of a key is not a duplicate.
+    assert not index.seen("3", "edited")
+    assert index.seen("3", "edited")
+    stats = index.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (3, 2, 6)
+
+
+def test_dedupe_index_expires_keys():
+    index = DedupeIndex(ttl=60)
+    with mock.patch("time.time", return_value=1000):
+        assert not index.seen("a")
+    with mock.patch("time.time", return_value=1059):
+        assert index.seen("a")
+    with mock.patch("time.time", return_value=1060):
+        assert not index.seen("a")
+
+
+def test_dedupe_index_persists(tmp_path: Path):
+    path = tmp_path.joinpath("dedupe.db")
+    index = DedupeIndex(max_entries=2, path=path)
+    for key in ("a", "b", "c"):
+        index.seen(key)
+    index.close()
+
+    index = DedupeIndex(max_entries=2, path=path)
+    assert index.seen("b") and index.seen("c")
+    assert not index.seen("a")
+    index.close()
+
+
+def test_duplicate_frames_are_dispatched_once():
+    async def run() -> tuple[list[RealTimeEventStreamEvent], list[dict]]:
+        linkedin = LinkedInMessaging()
+        events: list[RealTimeEventStreamEvent] = []
+        all_events: list[dict] = []
+
+        async def on_event(event: RealTimeEventStreamEvent):
+            events.append(event)
+
+        async def on_all_events(data: dict):
+            all_events.append(data)
+
+        linkedin.add_event_listener("event", on_event)
+        linkedin.add_event_listener("seenReceipt", on_event)
+        linkedin.add_event_listener("ALL_EVENTS", on_all_events)  # type: ignore
+        for _ in range(2):
+            for frame in frames:
+                await linkedin._handle_frame(frame)
+        stats = linkedin.dedupe.stats()
+        assert (stats.hits, stats.misses) == (3, 3)
+        await linkedin.close()
+        return events, all_events
+
+    events, all_events = asyncio.run(run())
+    assert len(events) == 2
+    # Frames without a key, such as heartbeats, are always dispatched.
+    keyed = [f for f in frames if event_key(f)]
+    assert len(all_events) == 2 * len(frames) - len(keyed)
@@ -0,0 +1,52 @@
+import json
+from typing import Any
+
+from linkedin_messaging.api_objects import (
+    URN,
+    Attribute,
+    AttributedBody,
+    AttributeType,
+    MessageAttachmentCreate,
+    MessageCreate,
+    TextEntity,
+)
+from linkedin_messaging.encoders import encode_conversation_create, encode_message_event
+
+MESSAGE_CREATE_KEY = "com.linkedin.voyager.messaging.create.MessageCreate"
+
+message_creates = [
+    MessageCreate(),
+    MessageCreate(AttributedBody("Hello"), body="Hello"),
+    MessageCreate(
+        AttributedBody(
+            'Hey @Jane, "quoted" \\ tab\t ünïcödé 👍',
+            [
+                Attribute(4, 5, AttributeType(TextEntity(URN("urn:li:fs_miniProfile:ACoA")))),
+                Attribute(10, 2, AttributeType()),
+                Attribute(),
+            ],
+        ),
+        attachments=[
+            MessageAttachmentCreate(
+                1234, URN("urn:li:digitalmediaAsset:C4"), "image/png", "a.png"
+            ),
+            MessageAttachmentCreate(),
+        ],
+    ),
+]
+
+
+def test_encoders_match_to_dict():
+    for message_create in message_creates:
+        message_event: dict[str, Any] = {
+            "eventCreate": {"value": {MESSAGE_CREATE_KEY: message_create.to_dict()}}
+        }
+        assert encode_message_event(message_create) == json.dumps(message_event).encode()
+
+        recipients = [URN("urn:li:fs_miniProfile:a"), URN("urn:li:fs_miniProfile:b")]
+        message_event["recipients"] = [r.get_id() for r in recipients]
+        message_event["subtype"] = "MEMBER_TO_MEMBER"
+        payload = {"keyVersion": "LEGACY_INBOX", "conversationCreate": message_event}
+        assert (
+            encode_conversation_create(message_create, recipients) == json.dumps(payload).encode()
+        )
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import RealTimeEventStreamEvent
+from linkedin_messaging.dispatch import ConcurrentDispatcher, conversation_id
+from linkedin_messaging.sse import SSEParser
+
+recorded_stream = Path(__file__).parent.joinpath("data", "realtime_stream.txt").read_bytes()
+frames = [json.loads(e.data) for e in SSEParser().feed(recorded_stream)]
+
+
+async def dispatch_recorded_stream(linkedin: LinkedInMessaging):
+    for frame in frames:
+        await linkedin._dispatch_event(frame)
+
+
+def test_payload_is_decoded_once_per_frame():
+    async def run() -> list[tuple[str, RealTimeEventStreamEvent]]:
+        linkedin = LinkedInMessaging()
+        received: list[tuple[str, RealTimeEventStreamEvent]] = []
+
+        def listener(key: str) -> Any:
+            async def on_event(event: RealTimeEventStreamEvent):
+                received.append((key, event))
+
+            return on_event
+
+        for key in ("event", "previousEventInConversation", "reactionSummary", "eventUrn"):
+            linkedin.add_event_listener(key, listener(key))
+
+        await dispatch_recorded_stream(linkedin)
+        await linkedin.close()
+        return received
+
+    received = asyncio.run(run())
+    assert [key for key, _ in received] == [
+        "previousEventInConversation",
+        "event",
+        "eventUrn",
+        "reactionSummary",
+    ]
+    # Listeners for the same frame get the same decoded event.
+    assert received[0][1] is received[1][1]
+    assert received[2][1] is received[3][1]
+    assert received[3][1].reaction_summary and received[3][1].reaction_summary.count == 3
+
+
+def test_all_events_only_does_not_decode():
+    async def run() -> tuple[list[dict[str, Any]], mock.MagicMock]:
+        linkedin = LinkedInMessaging()
+        received: list[dict[str, Any]] = []
+
+        # ALL_EVENTS listeners are called with the raw frame rather than a decoded event.
+        async def all_events(data: Any):
+            received.append(data)
+
+        linkedin.add_event_listener("ALL_EVENTS", all_events)
+        with mock.patch("linkedin_messaging.linkedin.from_dict") as from_dict:
+            await dispatch_recorded_stream(linkedin)
+        await linkedin.close()
+        return received, from_dict
+
+    received, from_dict = asyncio.run(run())
+    assert received == frames
+    from_dict.assert_not_called()
+
+
+def test_conversation_id():
+    conversation = "2-ZTU2NjQ1MmYtNWQ0Mi00YjFhLWE0YzItZmQ1YjE0NmQ3ZjQ4XzAxMA=="
+    assert [conversation_id(frame) for frame in frames] == [
+        None,  # ClientConnection
+        conversation,
+        None,  # Heartbeat
+        conversation,
+        conversation,
+        conversation,
+        None,  # Heartbeat
+    ]
+
+
+def test_concurrent_dispatcher_orders_per_key():
+    async def run() -> list[tuple[str, int]]:
+        handled: list[tuple[str, int]] = []
+
+        async def handle(item: tuple[str, int]):
+            # The first events of "slow" take longer than all of the events of "fast".
+            await asyncio.sleep(0.05 if item == ("slow", 0) else 0)
+            handled.append(item)
+
+        dispatcher = ConcurrentDispatcher(handle, concurrency=2, queue_size=1)
+
+        async def produce(name: str, key: int):
+            for i in range(3):
+                await dispatcher.submit(key, (name, i))
+
+        # The keys have the same hash modulo the concurrency, so they would be handled by the
+        # same worker if keys were assigned to workers by hash.
+        await asyncio.gather(produce("slow", 0), produce("fast", 2))
+        await dispatcher.close()
+        return handled
+
+    handled = asyncio.run(run())
+    assert [item for item in handled if item[0] == "slow"] == [("slow", i) for i in range(3)]
+    assert [item for item in handled if item[0] == "fast"] == [("fast", i) for i in range(3)]
+    # Different keys are handled in parallel, so "fast" didn't wait for "slow".
+    assert handled.index(("fast", 2)) < handled.index(("slow", 0))
@@ -0,0 +1,259 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from unittest import mock
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import (
+    URN,
+    Conversation,
+    ConversationEvent,
+    ConversationResponse,
+    ConversationsResponse,
+    Paging,
+    RealTimeEventStreamEvent,
+)
+from linkedin_messaging.exceptions import TooManyRequestsError
+from linkedin_messaging.rate_limit import RateLimiter
+
+
+def event_frame(event: ConversationEvent) -> bytes:
+    assert event.created_at and event.entity_urn
+    created_at = int(event.created_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    data = {
+        "com.linkedin.realtimefrontend.DecoratedEvent": {
+            "payload": {"event": {"createdAt": created_at, "entityUrn": str(event.entity_urn)}}
+        }
+    }
+    return f"data: {json.dumps(data)}\n\n".encode()
+
+
+def test_reconnect_backfills_missed_events():
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(minutes=10)
+
+    def event(conversation_id: str, event_id: int, minutes: int) -> ConversationEvent:
+        return ConversationEvent(
+            created_at=start + timedelta(minutes=minutes),
+            entity_urn=URN(f"urn:li:fs_event:({conversation_id},{event_id})"),
+        )
+
+    events = {
+        "1": [
+            event("1", 0, -1),
+            event("1", 1, 0),  # Received from the first stream
+            event("1", 2, 1),  # Missed
+            event("1", 3, 2),  # Missed
+            event("1", 5, 60),  # Created after reconnecting
+        ],
+        "2": [event("2", 0, -60)],
+    }
+    live = event("1", 4, 3)
+    conversations = [
+        Conversation(
+            last_activity_at=start + timedelta(minutes=2),
+            entity_urn=URN("urn:li:fs_conversation:1"),
+        ),
+        Conversation(
+            last_activity_at=start - timedelta(minutes=60),
+            entity_urn=URN("urn:li:fs_conversation:2"),
+        ),
+    ]
+    connects = 0
+
+    async def realtime_connect(request: web.Request) -> web.StreamResponse:
+        nonlocal connects
+        connects += 1
+        if connects == 2:
+            return web.Response(status=500)
+        response = web.StreamResponse()
+        await response.prepare(request)
+        if connects == 1:
+            await response.write(event_frame(events["1"][1]))
+        else:
+            await response.write(event_frame(live))
+            await asyncio.sleep(10)
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/realtime/connect", realtime_connect)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging(rate_limiter=RateLimiter({}))
+            fetched: list[str] = []
+
+            async def get_conversations(
+                last_activity_before: Optional[datetime] = None,
+                count: Optional[int] = None,
+            ) -> ConversationsResponse:
+                return ConversationsResponse(conversations, Paging(count=20))
+
+            async def get_conversation(
+                conversation_urn: URN,
+                created_before: Optional[datetime] = None,
+            ) -> ConversationResponse:
+                fetched.append(conversation_urn.get_id())
+                return ConversationResponse(events[conversation_urn.get_id()], Paging(count=20))
+
+            linkedin.get_conversations = get_conversations  # type: ignore
+            linkedin.get_conversation = get_conversation  # type: ignore
+
+            received: list[URN] = []
+            done = asyncio.Event()
+
+            async def on_event(event: RealTimeEventStreamEvent):
+                assert event.event and event.event.entity_urn
+                received.append(event.event.entity_urn)
+                if len(received) == 4:
+                    done.set()
+
+            linkedin.add_event_listener("event", on_event)
+            with mock.patch(
+                "linkedin_messaging.linkedin.REALTIME_CONNECT_URL",
+                str(server.make_url("/realtime/connect")),
+            ):
+                listener = asyncio.create_task(linkedin.start_listener(reconnect_delay=0.01))
+                await asyncio.wait_for(done.wait(), 10)
+                listener.cancel()
+                await asyncio.gather(listener, return_exceptions=True)
+            await linkedin.close()
+
+        # The connection that failed was retried.
+        assert connects == 3
+        # Only the conversation that was active while disconnected was fetched.
+        assert fetched == ["1"]
+        assert received == [
+            events["1"][1].entity_urn,
+            events["1"][2].entity_urn,
+            events["1"][3].entity_urn,
+            live.entity_urn,
+        ]
+        assert linkedin.last_event_urn == live.entity_urn
+
+    asyncio.run(run())
+
+
+def test_reconnect_gives_up_after_max_attempts():
+    connects = 0
+
+    async def realtime_connect(request: web.Request) -> web.Response:
+        nonlocal connects
+        connects += 1
+        return web.Response(status=500)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/realtime/connect", realtime_connect)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging(rate_limiter=RateLimiter({}))
+            with mock.patch(
+                "linkedin_messaging.linkedin.REALTIME_CONNECT_URL",
+                str(server.make_url("/realtime/connect")),
+            ):
+                with pytest.raises(TooManyRequestsError):
+                    await linkedin.start_listener(reconnect_delay=0.001, max_reconnect_attempts=3)
+            await linkedin.close()
+
+    asyncio.run(run())
+    assert connects == 4
+
+
+def test_reconnect_gives_up_after_max_attempts_timing_out():
+    connects = 0
+
+    async def realtime_connect(request: web.Request) -> web.Response:
+        nonlocal connects
+        connects += 1
+        # The response never starts, so connecting times out.
+        await asyncio.sleep(10)
+        return web.Response()
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/realtime/connect", realtime_connect)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging(rate_limiter=RateLimiter({}))
+            timeouts = 0
+
+            async def on_timeout(error: Exception):
+                nonlocal timeouts
+                timeouts += 1
+
+            linkedin.add_event_listener("TIMEOUT", on_timeout)
+            with mock.patch(
+                "linkedin_messaging.linkedin.REALTIME_CONNECT_URL",
+                str(server.make_url("/realtime/connect")),
+            ):
+                with pytest.raises(aiohttp.ServerTimeoutError):
+                    await asyncio.wait_for(
+                        linkedin.start_listener(
+                            reconnect_delay=0.001, max_reconnect_attempts=2, idle_timeout=0.05
+                        ),
+                        10,
+                    )
+            await linkedin.close()
+        assert timeouts == 2
+        assert linkedin.stream_health.stats().failures == 2
+
+    asyncio.run(run())
+    assert connects == 3
+
+
+def test_idle_stream_is_reconnected():
+    heartbeat = b'data: {"com.linkedin.realtimefrontend.Heartbeat": {}}\n\n'
+    connects = 0
+
+    async def realtime_connect(request: web.Request) -> web.StreamResponse:
+        nonlocal connects
+        connects += 1
+        response = web.StreamResponse()
+        await response.prepare(request)
+        if connects == 1:
+            # Heartbeats keep the stream open for longer than the idle timeout.
+            for _ in range(10):
+                await response.write(heartbeat)
+                await asyncio.sleep(0.05)
+        else:
+            await response.write(heartbeat)
+        # Then it stops sending anything without closing.
+        await asyncio.sleep(10)
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/realtime/connect", realtime_connect)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging(rate_limiter=RateLimiter({}))
+            timed_out = asyncio.Event()
+
+            async def on_timeout(error: Exception):
+                timed_out.set()
+
+            linkedin.add_event_listener("TIMEOUT", on_timeout)
+            with mock.patch(
+                "linkedin_messaging.linkedin.REALTIME_CONNECT_URL",
+                str(server.make_url("/realtime/connect")),
+            ):
+                listener = asyncio.create_task(
+                    linkedin.start_listener(reconnect_delay=0.01, idle_timeout=0.2)
+                )
+                await asyncio.wait_for(timed_out.wait(), 10)
+                while not linkedin.stream_health.stats().connected:
+                    await asyncio.sleep(0.01)
+                stats = linkedin.stream_health.stats()
+                listener.cancel()
+                await asyncio.gather(listener, return_exceptions=True)
+            await linkedin.close()
+
+        assert connects == 2
+        assert stats.connects == 2 and stats.reconnects == 1 and stats.failures == 0
+        assert stats.heartbeats >= 10
+        assert stats.stream_age is not None and stats.stream_age < 0.2
+        assert stats.idle_time is not None
+
+    asyncio.run(run())
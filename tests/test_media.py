@@ -0,0 +1,186 @@
+import asyncio
+import io
+from pathlib import Path
+from typing import AsyncGenerator, Optional
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.media import MediaSource, get_media_size
+
+CONTENTS = bytes(range(256)) * 4096
+
+
+def test_get_media_size(tmp_path: Path):
+    path = tmp_path.joinpath("file")
+    path.write_bytes(CONTENTS)
+    assert get_media_size(CONTENTS) == len(CONTENTS)
+    assert get_media_size(path) == len(CONTENTS)
+    with path.open("rb") as file:
+        file.seek(10)
+        assert get_media_size(file) == len(CONTENTS) - 10
+    assert get_media_size(io.BytesIO(CONTENTS)) == len(CONTENTS)
+
+
+def test_upload_media_streams(tmp_path: Path):
+    path = tmp_path.joinpath("file")
+    path.write_bytes(CONTENTS)
+
+    async def chunks() -> AsyncGenerator[bytes, None]:
+        for i in range(0, len(CONTENTS), 100_000):
+            yield CONTENTS[i : i + 100_000]
+
+    async def run(data: MediaSource, size: Optional[int] = None) -> list[int]:
+        metadata = []
+        uploads = []
+
+        async def upload_metadata(request: web.Request) -> web.Response:
+            metadata.append(await request.json())
+            return web.json_response(
+                {
+                    "value": {
+                        "singleUploadUrl": str(request.url.with_path("/upload")),
+                        "urn": "urn:li:digitalmediaAsset:123",
+                    }
+                }
+            )
+
+        async def upload(request: web.Request) -> web.Response:
+            assert request.headers["content-length"] == str(len(CONTENTS))
+            uploads.append(await request.read())
+            return web.Response(status=201)
+
+        # The default client_max_size of 1 MiB is smaller than the upload.
+        app = web.Application(client_max_size=2 * len(CONTENTS))
+        app.router.add_post("/voyagerMediaUploadMetadata", upload_metadata)
+        app.router.add_put("/upload", upload)
+
+        progress: list[int] = []
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging()
+            with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", str(server.make_url(""))):
+                attachment = await linkedin.upload_media(
+                    data,
+                    "file.mp4",
+                    "video/mp4",
+                    media_upload_type="MESSAGING_FILE_ATTACHMENT",
+                    size=size,
+                    progress=lambda sent, total: progress.append(sent),
+                )
+            await linkedin.close()
+
+        assert metadata == [
+            {
+                "mediaUploadType": "MESSAGING_FILE_ATTACHMENT",
+                "fileSize": len(CONTENTS),
+                "filename": "file.mp4",
+            }
+        ]
+        assert uploads == [CONTENTS]
+        assert attachment.byte_size == len(CONTENTS)
+        assert progress[-1] == len(CONTENTS)
+        return progress
+
+    assert len(asyncio.run(run(CONTENTS))) == 4
+    assert len(asyncio.run(run(path))) == 4
+    with path.open("rb") as file:
+        asyncio.run(run(file))
+    assert len(asyncio.run(run(chunks(), size=len(CONTENTS)))) == 11
+
+
+def test_download_to_resumes(tmp_path: Path):
+    async def run():
+        ranges: list[Optional[str]] = []
+
+        async def download(request: web.Request) -> web.StreamResponse:
+            range_header = request.headers.get("range")
+            ranges.append(range_header)
+            start = int(range_header[len("bytes=") : -1]) if range_header else 0
+            body = CONTENTS[start:]
+            response = web.StreamResponse(status=206 if start else 200)
+            response.content_length = len(body)
+            if start:
+                response.headers["content-range"] = (
+                    f"bytes {start}-{len(CONTENTS) - 1}/{len(CONTENTS)}"
+                )
+            await response.prepare(request)
+            if len(ranges) == 1:
+                # Drop the connection half way through the first response.
+                await response.write(body[: len(body) // 2])
+                assert request.transport
+                request.transport.close()
+                return response
+            await response.write(body)
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_get("/media", download)
+        progress: list[tuple[int, Optional[int]]] = []
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging()
+            url = str(server.make_url("/media"))
+            stats = await linkedin.download_to(
+                url,
+                tmp_path.joinpath("media"),
+                progress=lambda done, total: progress.append((done, total)),
+            )
+            chunks = [c async for c in linkedin.iter_linkedin_media(url, chunk_size=1 << 16)]
+            await linkedin.close()
+
+        assert tmp_path.joinpath("media").read_bytes() == CONTENTS
+        assert not tmp_path.joinpath("media.part").exists()
+        assert ranges[0] is None
+        # The download resumes from however much was received before the connection dropped.
+        assert ranges[1] and 0 < int(ranges[1][len("bytes=") : -1]) <= len(CONTENTS) // 2
+        assert stats.size == stats.downloaded == len(CONTENTS)
+        assert stats.retries == 1
+        assert stats.bytes_per_second > 0
+        assert progress[-1] == (len(CONTENTS), len(CONTENTS))
+        assert b"".join(chunks) == CONTENTS
+        assert all(len(c) <= 1 << 16 for c in chunks)
+
+    asyncio.run(run())
+
+
+def test_download_to_with_leftover_part_file(tmp_path: Path):
+    async def run():
+        ranges: list[Optional[str]] = []
+
+        async def download(request: web.Request) -> web.Response:
+            range_header = request.headers.get("range")
+            ranges.append(range_header)
+            start = int(range_header[len("bytes=") : -1]) if range_header else 0
+            if start >= len(CONTENTS):
+                return web.Response(
+                    status=416, headers={"content-range": f"bytes */{len(CONTENTS)}"}
+                )
+            return web.Response(body=CONTENTS)
+
+        app = web.Application()
+        app.router.add_get("/media", download)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging()
+            url = str(server.make_url("/media"))
+
+            # The .part file is already complete, so it is only moved.
+            tmp_path.joinpath("complete.part").write_bytes(CONTENTS)
+            stats = await linkedin.download_to(url, tmp_path.joinpath("complete"))
+            assert stats.size == len(CONTENTS) and stats.downloaded == 0
+            assert tmp_path.joinpath("complete").read_bytes() == CONTENTS
+            assert ranges == [f"bytes={len(CONTENTS)}-"]
+
+            # The .part file is bigger than the media, so it is downloaded again.
+            ranges.clear()
+            tmp_path.joinpath("other.part").write_bytes(CONTENTS + b"extra")
+            stats = await linkedin.download_to(url, tmp_path.joinpath("other"))
+            assert stats.size == stats.downloaded == len(CONTENTS)
+            assert tmp_path.joinpath("other").read_bytes() == CONTENTS
+            assert ranges == [f"bytes={len(CONTENTS) + 5}-", None]
+            await linkedin.close()
+
+        assert not list(tmp_path.glob("*.part"))
+
+    asyncio.run(run())
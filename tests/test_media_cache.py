@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import Artifact, Picture, VectorImage
+from linkedin_messaging.media_cache import MediaCache
+
+
+def test_media_cache_eviction(tmp_path: Path):
+    cache = MediaCache(tmp_path, max_size=250)
+    cache.put("https://example.com/a?t=1", b"a" * 100)
+    cache.put("https://example.com/b?t=1", b"b" * 100)
+    # The signature in the query string is not part of the key.
+    assert cache.get("https://example.com/a?t=2") == b"a" * 100
+
+    # "b" is the least recently used entry, so it is evicted.
+    cache.put("https://example.com/c", b"c" * 100)
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/c") == b"c" * 100
+
+    # Identical content is only stored once.
+    cache.put("https://example.com/d", b"c" * 100)
+    stats = cache.stats()
+    assert (stats.entries, stats.size, stats.hits, stats.misses) == (3, 200, 2, 1)
+    cache.close()
+
+    cache = MediaCache(tmp_path, max_size=250)
+    assert cache.get("https://example.com/d") == b"c" * 100
+    cache.close()
+
+
+def test_media_cache_expiry(tmp_path: Path):
+    cache = MediaCache(tmp_path)
+    cache.put("https://example.com/a", b"a", expires_at=datetime.utcnow() - timedelta(minutes=1))
+    cache.put("https://example.com/b", b"b", expires_at=datetime.utcnow() + timedelta(minutes=1))
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://example.com/b") == b"b"
+    assert cache.stats().entries == 1
+    cache.close()
+
+
+def test_download_profile_picture_is_cached(tmp_path: Path):
+    async def run():
+        requests = []
+
+        async def picture(request: web.Request) -> web.Response:
+            requests.append(request.query_string)
+            return web.Response(body=b"picture")
+
+        app = web.Application()
+        app.router.add_get("/400_400/0/1", picture)
+        async with TestServer(app) as server:
+            linkedin = LinkedInMessaging(media_cache=MediaCache(tmp_path))
+
+            def make_picture(signature: str) -> Picture:
+                artifact = Artifact(
+                    file_identifying_url_path_segment=f"400_400/0/1?t={signature}",
+                    expires_at=datetime.utcnow() + timedelta(days=1),
+                )
+                return Picture(VectorImage([artifact], str(server.make_url("/"))))
+
+            assert await linkedin.download_profile_picture(make_picture("a")) == b"picture"
+            assert await linkedin.download_profile_picture(make_picture("b")) == b"picture"
+            await linkedin.close()
+
+        assert requests == ["t=a"]
+
+    asyncio.run(run())
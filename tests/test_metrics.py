@@ -0,0 +1,95 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest import mock
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import RealTimeEventStreamEvent
+from linkedin_messaging.metrics import Metrics, endpoint_label
+from linkedin_messaging.sse import SSEParser
+
+data_dir = Path(__file__).parent.joinpath("data")
+
+
+def test_requests_and_events_are_recorded():
+    conversations = data_dir.joinpath("conversations.json").read_bytes()
+    stream = data_dir.joinpath("realtime_stream.txt").read_bytes()
+
+    async def get_conversations(request: web.Request) -> web.Response:
+        return web.Response(body=conversations, content_type="application/json")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/messaging/conversations", get_conversations)
+        async with TestServer(app) as server:
+            endpoint = f"{server.host}:{server.port}/messaging/conversations"
+            metrics = Metrics()
+            linkedin = LinkedInMessaging(metrics=metrics)
+
+            async def on_event(event: RealTimeEventStreamEvent):
+                pass
+
+            linkedin.add_event_listener("event", on_event)
+            with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", str(server.make_url(""))):
+                await linkedin.get_conversations()
+            for event in SSEParser().feed(stream):
+                await linkedin._dispatch_event(json.loads(event.data))
+            await linkedin.close()
+
+        assert metrics.requests.values == {("GET", endpoint, "200"): 1}
+        assert metrics.request_duration.count("GET", endpoint) == 1
+        assert metrics.response_bytes.values[(endpoint,)] == len(conversations)
+        assert metrics.decode_duration.count("ConversationsResponse") == 1
+        assert metrics.decode_duration.count("RealTimeEventStreamEvent") == 1
+        assert metrics.events.values[("event",)] == 1
+        assert metrics.events.values[("reactionSummary",)] == 1
+        assert metrics.handler_duration.count("event") == 1
+
+        exported = metrics.export()
+        assert (
+            f'linkedin_messaging_requests_total{{method="GET",endpoint="{endpoint}",status="200"}}'
+            " 1\n" in exported
+        )
+        assert (
+            "linkedin_messaging_event_handler_duration_seconds_bucket"
+            '{payload_key="event",le="+Inf"} 1\n' in exported
+        )
+
+    asyncio.run(run())
+
+
+def test_failed_requests_are_recorded():
+    async def run():
+        metrics = Metrics()
+        linkedin = LinkedInMessaging(metrics=metrics)
+        with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", "http://127.0.0.1:1"):
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await linkedin.get_conversations()
+        await linkedin.close()
+        assert metrics.requests.values == {
+            ("GET", "127.0.0.1:1/messaging/conversations", "error"): 1
+        }
+
+    asyncio.run(run())
+
+
+def test_endpoint_label_has_no_ids():
+    base = "https://www.linkedin.com/voyager/api/messaging/conversations"
+    for url in (
+        f"{base}/2-YWJj/events",
+        f"{base}/abcDEF/events",
+        f"{base}/urn%3Ali%3Afs_conversation%3AabcDEF/events",
+        f"{base}/(urn:li:fsd_profile:ACoAAB,urn:li:fsd_profile:ACoAAC)/events",
+    ):
+        assert (
+            endpoint_label(url)
+            == "www.linkedin.com/voyager/api/messaging/conversations/:id/events"
+        )
+    assert endpoint_label(f"{base}?keyVersion=LEGACY_INBOX") == (
+        "www.linkedin.com/voyager/api/messaging/conversations"
+    )
@@ -0,0 +1,226 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Optional, Union
+
+import pytest
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import (
+    URN,
+    Conversation,
+    ConversationEvent,
+    ConversationResponse,
+    ConversationsResponse,
+    Paging,
+)
+from linkedin_messaging.paging import prefetch
+
+
+def test_prefetch_is_bounded():
+    async def run():
+        fetched = []
+
+        async def pages() -> AsyncGenerator[int, None]:
+            for i in range(5):
+                await asyncio.sleep(0)
+                fetched.append(i)
+                yield i
+
+        consumed = []
+        async for page in prefetch(pages(), lookahead=2):
+            # Let the producer run as far ahead as it is allowed to.
+            await asyncio.sleep(0.01)
+            assert len(fetched) <= page + 3
+            consumed.append(page)
+        assert consumed == [0, 1, 2, 3, 4]
+
+    asyncio.run(run())
+
+
+def test_prefetch_propagates_errors():
+    async def run():
+        async def pages() -> AsyncGenerator[int, None]:
+            yield 1
+            raise ValueError("failed")
+
+        consumed = []
+        with pytest.raises(ValueError):
+            async for page in prefetch(pages()):
+                consumed.append(page)
+        assert consumed == [1]
+
+    asyncio.run(run())
+
+
+def test_get_all_conversations_uses_paging_count():
+    async def run():
+        linkedin = LinkedInMessaging()
+        start = datetime(2021, 12, 17)
+        all_conversations = [
+            Conversation(name=str(i), last_activity_at=start - timedelta(minutes=i))
+            for i in range(25)
+        ]
+        requests = []
+
+        async def get_conversations(
+            last_activity_before: Optional[datetime] = None,
+            count: Optional[int] = None,
+        ) -> ConversationsResponse:
+            assert last_activity_before
+            requests.append(count)
+            elements = [
+                c
+                for c in all_conversations
+                if c.last_activity_at and c.last_activity_at < last_activity_before
+            ][:count]
+            return ConversationsResponse(elements, Paging(count=count or 0))
+
+        linkedin.get_conversations = get_conversations  # type: ignore
+        names = [c.name async for c in linkedin.get_all_conversations(count=10)]
+        await linkedin.close()
+
+        assert names == [str(i) for i in range(25)]
+        assert requests == [10, 10, 10]
+
+    asyncio.run(run())
+
+
+def test_get_all_conversation_events():
+    async def run(since: Union[datetime, URN, None]) -> list[str]:
+        linkedin = LinkedInMessaging()
+        start = datetime(2021, 12, 17)
+        all_events = [
+            ConversationEvent(
+                created_at=start - timedelta(minutes=i),
+                entity_urn=URN(f"urn:li:fs_event:(1,{i})"),
+            )
+            for i in range(45)
+        ]
+
+        async def get_conversation(
+            conversation_urn: URN,
+            created_before: Optional[datetime] = None,
+        ) -> ConversationResponse:
+            assert created_before
+            # The boundary is inclusive, and events are returned from oldest to newest.
+            elements = [e for e in all_events if e.created_at and e.created_at <= created_before]
+            return ConversationResponse(elements[:20][::-1], Paging(count=20))
+
+        linkedin.get_conversation = get_conversation  # type: ignore
+        events = [
+            e.entity_urn.id_parts[1]
+            async for e in linkedin.get_all_conversation_events(URN("1"), since=since)
+            if e.entity_urn
+        ]
+        await linkedin.close()
+        return events
+
+    assert asyncio.run(run(None)) == [str(i) for i in range(45)]
+    assert asyncio.run(run(URN("urn:li:fs_event:(1,30)"))) == [str(i) for i in range(30)]
+    assert asyncio.run(run(datetime(2021, 12, 16, 23, 50))) == [str(i) for i in range(10)]
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, body: str):
+        self.body = body
+
+    async def text(self) -> str:
+        return self.body
+
+
+def test_get_all_conversation_events_in_local_timezone(local_timezone: None):
+    async def run() -> tuple[list[str], list[int]]:
+        linkedin = LinkedInMessaging()
+        start = datetime(2021, 12, 17)
+        all_events = [
+            ConversationEvent(
+                created_at=start - timedelta(minutes=i),
+                entity_urn=URN(f"urn:li:fs_event:(1,{i})"),
+            )
+            for i in range(45)
+        ]
+        requested: list[int] = []
+
+        async def get(relative_url: str, *args: Any, **kwargs: Any) -> FakeResponse:
+            created_before = kwargs["params"]["createdBefore"]
+            requested.append(created_before)
+            elements = [
+                e
+                for e in all_events
+                if e.created_at
+                and e.created_at <= datetime.utcfromtimestamp(created_before / 1000)
+            ]
+            return FakeResponse(ConversationResponse(elements[:20], Paging(count=20)).to_json())
+
+        linkedin._get = get  # type: ignore
+        events = [
+            e.entity_urn.id_parts[1]
+            async for e in linkedin.get_all_conversation_events(URN("1"))
+            if e.entity_urn
+        ]
+        await linkedin.close()
+        return events, requested
+
+    events, requested = asyncio.run(run())
+    assert events == [str(i) for i in range(45)]
+    # Each page starts at the oldest event of the previous one.
+    assert requested[1:] == [
+        int((datetime(2021, 12, 17, tzinfo=timezone.utc) - timedelta(minutes=i)).timestamp())
+        * 1000
+        for i in (19, 38)
+    ]
+
+
+def test_backfill_events_only_fetches_needed_pages():
+    async def run():
+        linkedin = LinkedInMessaging()
+        since = datetime(2021, 12, 17)
+        conversation_requests: list[Optional[datetime]] = []
+        event_requests: list[Optional[datetime]] = []
+
+        async def get_conversations(
+            last_activity_before: Optional[datetime] = None,
+            count: Optional[int] = None,
+        ) -> ConversationsResponse:
+            conversation_requests.append(last_activity_before)
+            # Only the first conversation has been active since the backfill started.
+            conversations = [
+                Conversation(
+                    last_activity_at=since + timedelta(minutes=1 - 2 * i),
+                    entity_urn=URN(f"urn:li:fs_conversation:{i}"),
+                )
+                for i in range(20)
+            ]
+            return ConversationsResponse(conversations, Paging(count=20))
+
+        async def get_conversation(
+            conversation_urn: URN,
+            created_before: Optional[datetime] = None,
+        ) -> ConversationResponse:
+            event_requests.append(created_before)
+            events = [
+                ConversationEvent(
+                    created_at=since + timedelta(minutes=1 - i),
+                    entity_urn=URN(f"urn:li:fs_event:(0,{i})"),
+                )
+                for i in range(20)
+            ]
+            return ConversationResponse(events[::-1], Paging(count=20))
+
+        linkedin.get_conversations = get_conversations  # type: ignore
+        linkedin.get_conversation = get_conversation  # type: ignore
+        events = await linkedin.backfill_events(since)
+        # Give pages that were fetched ahead of time a chance to be requested.
+        await asyncio.sleep(0.01)
+        await linkedin.close()
+
+        assert [e.entity_urn for e in events] == [
+            URN("urn:li:fs_event:(0,1)"),
+            URN("urn:li:fs_event:(0,0)"),
+        ]
+        assert len(conversation_requests) == 1
+        assert len(event_requests) == 1
+
+    asyncio.run(run())
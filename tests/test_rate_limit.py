@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from linkedin_messaging.rate_limit import EndpointClass, RateLimit, RateLimiter, TokenBucket
+
+
+def test_bucket_throttles_after_burst():
+    async def run():
+        bucket = TokenBucket(RateLimit(rate=50, burst=2))
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        elapsed = time.monotonic() - start
+
+        # Two requests go through immediately, the other three wait for 1/50 s each.
+        assert 0.05 <= elapsed < 0.5
+        stats = bucket.stats()
+        assert stats.throttled == 3
+        assert stats.queued == 0
+
+    asyncio.run(run())
+
+
+def test_bucket_backs_off_and_recovers():
+    bucket = TokenBucket(RateLimit(rate=10, burst=10))
+    bucket.record(429)
+    bucket.record(999)
+    assert bucket.rate == 2.5
+    assert bucket.tokens <= 0
+    assert bucket.stats().rate_limited == 2
+
+    for _ in range(100):
+        bucket.record(200)
+    assert bucket.rate == 10
+
+    bucket.record(503, retry_after=60)
+    assert bucket.rate == 10
+    assert bucket.blocked_until - time.monotonic() > 59
+
+
+def test_retry_after_blocks_requests():
+    async def run():
+        limiter = RateLimiter({EndpointClass.MESSAGING_WRITE: RateLimit(rate=1000, burst=10)})
+        limiter.record(EndpointClass.MESSAGING_WRITE, 429, "0")
+        limiter.buckets[EndpointClass.MESSAGING_WRITE].blocked_until = time.monotonic() + 0.05
+
+        start = time.monotonic()
+        await limiter.acquire(EndpointClass.MESSAGING_WRITE)
+        assert time.monotonic() - start >= 0.05
+
+        # Endpoint classes without a limit are not rate limited.
+        await limiter.acquire(EndpointClass.MEDIA)
+        assert EndpointClass.MEDIA not in limiter.stats()
+
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+import asyncio
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import URN
+from linkedin_messaging.read_receipts import ReadReceiptBatcher
+
+
+def test_read_receipts_are_collapsed():
+    async def run():
+        marked: list[str] = []
+        running = 0
+        max_running = 0
+
+        async def mark_as_read(conversation_urn: URN) -> bool:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            marked.append(conversation_urn.get_id())
+            if conversation_urn.get_id() == "bad":
+                raise ValueError("failed")
+            return conversation_urn.get_id() != "4"
+
+        batcher = ReadReceiptBatcher(mark_as_read, delay=0.05, concurrency=2)
+        futures = [batcher.mark(URN(f"urn:li:fs_conversation:{i % 5}")) for i in range(20)]
+        bad = batcher.mark(URN("urn:li:fs_conversation:bad"))
+        assert batcher.pending == 6
+        assert futures[0] is futures[5]
+
+        results = await asyncio.gather(*futures[:5], bad)
+        assert results == [True, True, True, True, False, False]
+        assert sorted(marked) == ["0", "1", "2", "3", "4", "bad"]
+        assert max_running == 2
+
+        # Explicitly flushing returns the result for each conversation.
+        batcher.mark(URN("urn:li:fs_conversation:1"))
+        batcher.mark(URN("urn:li:fs_conversation:4"))
+        assert await batcher.flush() == {
+            URN("urn:li:fs_conversation:1"): True,
+            URN("urn:li:fs_conversation:4"): False,
+        }
+        assert batcher.pending == 0
+
+    asyncio.run(run())
+
+
+def test_close_sends_pending_read_receipts():
+    async def run():
+        linkedin = LinkedInMessaging(read_receipt_delay=60)
+        marked: list[URN] = []
+
+        async def mark_conversation_as_read(conversation_urn: URN) -> bool:
+            marked.append(conversation_urn)
+            return True
+
+        linkedin.read_receipts._mark_as_read = mark_conversation_as_read
+        future = linkedin.mark_conversation_as_read_later(URN("urn:li:fs_conversation:1"))
+        linkedin.mark_conversation_as_read_later(URN("urn:li:fs_conversation:1"))
+        await linkedin.close()
+        assert marked == [URN("urn:li:fs_conversation:1")]
+        assert future.result()
+
+    asyncio.run(run())
@@ -0,0 +1,107 @@
+import asyncio
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.request_cache import ResponseCache, request_key
+
+
+def make_app(requests: list[str], delay: float = 0) -> web.Application:
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request.path_qs)
+        await asyncio.sleep(delay)
+        return web.json_response({"count": len(requests)})
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handler)
+    return app
+
+
+def test_concurrent_gets_are_coalesced():
+    async def run():
+        requests: list[str] = []
+        async with TestServer(make_app(requests, delay=0.05)) as server:
+            linkedin = LinkedInMessaging()
+            with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", str(server.make_url(""))):
+                responses = await asyncio.gather(
+                    *(linkedin._get("/me") for _ in range(5)),
+                    *(linkedin._get("/reactors", params={"emoji": e}) for e in "aab"),
+                )
+
+                # Cancelling one caller doesn't cancel the request for the others.
+                first = asyncio.create_task(linkedin._get("/me"))
+                second = asyncio.create_task(linkedin._get("/me"))
+                await asyncio.sleep(0.01)
+                first.cancel()
+                assert (await second).status == 200
+
+                # Requests that aren't in flight at the same time aren't coalesced.
+                await linkedin._get("/me")
+            await linkedin.close()
+
+        assert sorted(requests) == ["/me", "/me", "/me", "/reactors?emoji=a", "/reactors?emoji=b"]
+        # Coalesced callers share the same response.
+        assert all(r is responses[0] for r in responses[:5])
+        assert responses[5] is responses[6] is not responses[7]
+        assert not linkedin._pending_gets
+
+    asyncio.run(run())
+
+
+def test_gets_are_not_coalesced_across_sessions():
+    async def run():
+        requests: list[str] = []
+        async with TestServer(make_app(requests, delay=0.05)) as server:
+            linkedin = LinkedInMessaging.from_cookies("li_at", "jsessionid")
+            with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", str(server.make_url(""))):
+                before = asyncio.create_task(linkedin._get("/me"))
+                await asyncio.sleep(0.01)
+                await linkedin.login_manual("other_li_at", "other_jsessionid")
+                after = await linkedin._get("/me")
+                await before
+            await linkedin.close()
+
+        # The GET after logging in is made with the new session rather than joining the one
+        # that was in flight.
+        assert requests == ["/me", "/me"]
+        assert before.result() is not after
+        assert not linkedin._pending_gets
+
+    asyncio.run(run())
+
+
+def test_response_cache():
+    async def run():
+        requests: list[str] = []
+        async with TestServer(make_app(requests)) as server:
+            linkedin = LinkedInMessaging(response_cache_ttls={"/me": 60, "/reactors": 0.2})
+            with mock.patch("linkedin_messaging.linkedin.API_BASE_URL", str(server.make_url(""))):
+                for _ in range(3):
+                    await linkedin._get("/me")
+                    await linkedin._get("/reactors")
+                    await linkedin._get("/other")
+                await asyncio.sleep(0.2)
+                await linkedin._get("/reactors")
+
+                linkedin.invalidate_cache("/me")
+                await linkedin._get("/me")
+            await linkedin.close()
+
+        assert requests.count("/me") == 2
+        assert requests.count("/reactors") == 2
+        assert requests.count("/other") == 3
+
+    asyncio.run(run())
+
+
+def test_response_cache_ignores_stale_responses():
+    cache = ResponseCache({"/me": 60})
+    response = mock.Mock()
+    generation = cache.generation
+    cache.invalidate()
+    cache.put(request_key("/me"), response, generation)
+    assert cache.get(request_key("/me")) is None
+    cache.put(request_key("/me"), response, cache.generation)
+    assert cache.get(request_key("/me")) is response
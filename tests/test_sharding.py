@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+from typing import Any, Hashable, Union
+
+import pytest
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import (
+    URN,
+    AttributedBody,
+    MessageCreate,
+    MessageCreatedInfo,
+    RealTimeEventStreamEvent,
+    SendMessageResponse,
+)
+from linkedin_messaging.sharding import ShardSupervisor, _MessageWriter
+
+
+class FakeLinkedIn(LinkedInMessaging):
+    """Emits one event when the listener starts and echoes sent messages."""
+
+    async def _listen_to_event_stream(self):
+        conversation_id = self.session.cookie_jar.filter_cookies(
+            "https://www.linkedin.com"  # type: ignore
+        )["li_at"].value
+        await self._dispatch_event(
+            {
+                "com.linkedin.realtimefrontend.DecoratedEvent": {
+                    "payload": {
+                        "reactionAdded": True,
+                        "eventUrn": f"urn:li:fs_event:({conversation_id},1)",
+                    }
+                }
+            }
+        )
+        await asyncio.Event().wait()
+
+    @classmethod
+    def from_cookies(cls, li_at: str, jsessionid: str, **kwargs: Any) -> LinkedInMessaging:
+        if li_at == "invalid":
+            raise ValueError("invalid cookies")
+        return super().from_cookies(li_at, jsessionid, **kwargs)
+
+    async def send_message(
+        self,
+        conversation_urn_or_recipients: Union[URN, list[URN]],
+        message_create: MessageCreate,
+    ) -> SendMessageResponse:
+        if message_create.body == "fail":
+            raise ValueError("failed")
+        assert isinstance(conversation_urn_or_recipients, URN)
+        return SendMessageResponse(
+            MessageCreatedInfo(conversation_urn=conversation_urn_or_recipients)
+        )
+
+
+def test_shard_supervisor():
+    async def run():
+        events: asyncio.Queue[tuple[Hashable, RealTimeEventStreamEvent]] = asyncio.Queue()
+
+        async def on_event(account_id: Hashable, event: RealTimeEventStreamEvent):
+            await events.put((account_id, event))
+
+        async def next_events(count: int) -> dict[Hashable, URN]:
+            received = {}
+            for _ in range(count):
+                account_id, event = await asyncio.wait_for(events.get(), 30)
+                assert event.event_urn
+                received[account_id] = event.event_urn
+            return received
+
+        supervisor = ShardSupervisor(on_event, processes=2, client_class=FakeLinkedIn)
+        supervisor.start()
+        for i in range(4):
+            supervisor.add_account(i, str(i), "ajax:0")
+        assignments = supervisor.assignments
+        assert len(set(assignments.values())) == 2
+
+        # Events are deserialised in the workers.
+        assert await next_events(4) == {i: URN(f"urn:li:fs_event:({i},1)") for i in range(4)}
+
+        response = await supervisor.send_message(
+            1, URN("urn:li:fs_conversation:1"), MessageCreate(AttributedBody("hi"), body="hi")
+        )
+        assert response.value and response.value.conversation_urn == URN(
+            "urn:li:fs_conversation:1"
+        )
+        with pytest.raises(ValueError):
+            await supervisor.send_message(
+                1, URN("urn:li:fs_conversation:1"), MessageCreate(body="fail")
+            )
+
+        # The accounts of a worker that dies are started again on the other workers.
+        dead_pid = assignments[0]
+        moved = {a for a, pid in assignments.items() if pid == dead_pid}
+        os.kill(dead_pid, signal.SIGKILL)
+        assert set(await next_events(len(moved))) == moved
+        assignments = supervisor.assignments
+        assert set(assignments) == set(range(4))
+        assert dead_pid not in assignments.values()
+        assert len(set(assignments.values())) == 2
+
+        await supervisor.close()
+
+    asyncio.run(run())
+
+
+def test_message_writer_doesnt_block_the_event_loop():
+    async def run():
+        loop = asyncio.get_running_loop()
+        reader, conn = multiprocessing.Pipe(duplex=False)
+        writer = _MessageWriter(conn, maxsize=2)
+        # Each message is bigger than the pipe's buffer, so writing it blocks until the other
+        # end reads it.
+        message = b"x" * (1 << 20)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await writer.send(message)
+        await writer.send(message)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(writer.send(message), 0.2)
+        # The event loop kept running while the pipe was full.
+        assert ticks > 5
+
+        received = loop.run_in_executor(None, lambda: [reader.recv() for _ in range(3)])
+        await asyncio.wait_for(writer.send(message), 10)
+        writer.close()
+        await asyncio.wait_for(writer.wait_closed(), 10)
+        assert await received == [message] * 3
+        ticker.cancel()
+        reader.close()
+        conn.close()
+
+    asyncio.run(run())
+
+
+def test_account_that_fails_to_start_doesnt_stop_the_worker():
+    async def run():
+        events: asyncio.Queue[Hashable] = asyncio.Queue()
+        errors: asyncio.Queue[tuple[Hashable, Exception]] = asyncio.Queue()
+
+        async def on_event(account_id: Hashable, event: RealTimeEventStreamEvent):
+            await events.put(account_id)
+
+        async def on_account_error(account_id: Hashable, error: Exception):
+            await errors.put((account_id, error))
+
+        supervisor = ShardSupervisor(
+            on_event, processes=1, client_class=FakeLinkedIn, on_account_error=on_account_error
+        )
+        supervisor.add_account("bad", "invalid", "ajax:0")
+        supervisor.add_account("good", "1", "ajax:0")
+        pid = supervisor.assignments["good"]
+
+        account_id, error = await asyncio.wait_for(errors.get(), 30)
+        assert account_id == "bad" and isinstance(error, ValueError)
+        assert await asyncio.wait_for(events.get(), 30) == "good"
+        # The worker kept running, without the account that failed.
+        assert supervisor.assignments == {"good": pid}
+
+        await supervisor.close()
+
+    asyncio.run(run())
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+from linkedin_messaging.sse import ServerSentEvent, SSEParser
+
+recorded_stream = Path(__file__).parent.joinpath("data", "realtime_stream.txt").read_bytes()
+
+
+def feed_in_chunks(data: bytes, chunk_size: int) -> tuple[SSEParser, list[ServerSentEvent]]:
+    parser = SSEParser()
+    events = []
+    for i in range(0, len(data), chunk_size):
+        events.extend(parser.feed(data[i : i + chunk_size]))
+    return parser, events
+
+
+def test_recorded_stream_any_chunk_size():
+    _, expected = feed_in_chunks(recorded_stream, len(recorded_stream))
+    assert len(expected) == 7
+    assert all(json.loads(e.data) for e in expected)
+    for chunk_size in (1, 2, 3, 5, 64, 1000):
+        parser, events = feed_in_chunks(recorded_stream, chunk_size)
+        assert events == expected
+        assert parser.last_event_id == "7f0c4d2a-5e1b-4a8e-9c1d-000000000004"
+
+
+def test_multiline_data_and_fields():
+    parser = SSEParser()
+    events = parser.feed(
+        b': heartbeat\nevent: update\nid: 42\nretry: 3000\ndata: {\ndata:  "a": 1\ndata:}\n\n'
+    )
+    assert events == [ServerSentEvent(b'{\n "a": 1\n}', "update", "42")]
+    assert parser.retry == 3000
+    # The event type is reset after each event, but the ID is not.
+    assert parser.feed(b"data\n\n") == [ServerSentEvent(b"", "message", "42")]
+
+
+def test_line_endings():
+    for data in (b"data: 1\r\n\r\n", b"data: 1\r\r", b"\xef\xbb\xbfdata: 1\n\n"):
+        _, events = feed_in_chunks(data, 1)
+        assert events == [ServerSentEvent(b"1")], data
+
+
+def test_incomplete_event_is_not_dispatched():
+    parser = SSEParser()
+    assert parser.feed(b"data: 1\n") == []
+    assert parser.feed(b"id\x00: x\nid: a\x00b\n") == []
+    assert parser.last_event_id is None
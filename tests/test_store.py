@@ -0,0 +1,226 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+from unittest import mock
+
+import pytest
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import (
+    URN,
+    Conversation,
+    ConversationEvent,
+    ConversationResponse,
+    ConversationsResponse,
+    Paging,
+)
+from linkedin_messaging.decoders import from_json
+from linkedin_messaging.sse import SSEParser
+from linkedin_messaging.store import ConversationStore
+
+data_dir = Path(__file__).parent.joinpath("data")
+
+
+def test_store_round_trip(tmp_path: Path):
+    conversations = from_json(
+        ConversationsResponse, data_dir.joinpath("conversations.json").read_text()
+    ).elements
+
+    store = ConversationStore(tmp_path.joinpath("store.db"))
+    store.save_conversations(conversations)
+    store.high_water_mark = conversations[0].last_activity_at
+    store.close()
+
+    store = ConversationStore(tmp_path.joinpath("store.db"))
+    assert store.get_conversations() == sorted(
+        conversations, key=lambda c: c.last_activity_at or datetime.min, reverse=True
+    )
+    assert store.high_water_mark == conversations[0].last_activity_at
+    conversation_urn = conversations[0].entity_urn
+    assert conversation_urn
+    assert store.get_conversation(conversation_urn) == conversations[0]
+    assert store.get_events(conversation_urn) == conversations[0].events
+    store.close()
+
+
+def test_incremental_sync():
+    start = datetime(2021, 12, 17)
+    events: dict[str, list[ConversationEvent]] = {}
+    conversations: list[Conversation] = []
+
+    def add_event(conversation_id: str, created_at: datetime):
+        conversation_events = events.setdefault(conversation_id, [])
+        conversation_events.append(
+            ConversationEvent(
+                created_at=created_at,
+                entity_urn=URN(f"urn:li:fs_event:({conversation_id},{len(conversation_events)})"),
+            )
+        )
+        conversations[:] = [c for c in conversations if c.name != conversation_id]
+        conversations.insert(
+            0,
+            Conversation(
+                name=conversation_id,
+                last_activity_at=created_at,
+                entity_urn=URN(f"urn:li:fs_conversation:{conversation_id}"),
+            ),
+        )
+
+    for i in range(5):
+        add_event(str(i), start + timedelta(minutes=i))
+        add_event(str(i), start + timedelta(minutes=i, seconds=30))
+
+    async def sync(linkedin: LinkedInMessaging) -> list[str]:
+        async def get_conversations(
+            last_activity_before: Optional[datetime] = None,
+            count: Optional[int] = None,
+        ) -> ConversationsResponse:
+            assert last_activity_before
+            elements = [
+                c
+                for c in conversations
+                if c.last_activity_at and c.last_activity_at < last_activity_before
+            ]
+            return ConversationsResponse(elements[:2], Paging(count=2))
+
+        async def get_conversation(
+            conversation_urn: URN,
+            created_before: Optional[datetime] = None,
+        ) -> ConversationResponse:
+            assert created_before
+            elements = [
+                e
+                for e in events[conversation_urn.get_id()]
+                if e.created_at and e.created_at <= created_before
+            ]
+            return ConversationResponse(elements, Paging(count=20))
+
+        linkedin.get_conversations = get_conversations  # type: ignore
+        linkedin.get_conversation = get_conversation  # type: ignore
+        updated = await linkedin.incremental_sync()
+        return [c.name for c in updated]
+
+    async def run():
+        store = ConversationStore()
+        linkedin = LinkedInMessaging(store=store)
+        assert await sync(linkedin) == ["4", "3", "2", "1", "0"]
+        assert len(store.get_events(URN("urn:li:fs_conversation:3"))) == 2
+
+        # Nothing has changed, so nothing is fetched.
+        assert await sync(linkedin) == []
+
+        add_event("1", start + timedelta(hours=1))
+        add_event("3", start + timedelta(hours=2))
+        assert await sync(linkedin) == ["3", "1"]
+        assert store.high_water_mark == start + timedelta(hours=2)
+        assert [e.created_at for e in store.get_events(URN("urn:li:fs_conversation:1"))] == [
+            start + timedelta(minutes=1),
+            start + timedelta(minutes=1, seconds=30),
+            start + timedelta(hours=1),
+        ]
+        await linkedin.close()
+
+    asyncio.run(run())
+
+
+def test_realtime_events_are_stored():
+    async def run():
+        store = ConversationStore()
+        linkedin = LinkedInMessaging(store=store)
+        stream = data_dir.joinpath("realtime_stream.txt").read_bytes()
+        for event in SSEParser().feed(stream):
+            await linkedin._dispatch_event(json.loads(event.data))
+        await linkedin.close()
+
+        stored = store.get_events(
+            URN(
+                "urn:li:fs_conversation:"
+                "2-ZTU2NjQ1MmYtNWQ0Mi00YjFhLWE0YzItZmQ1YjE0NmQ3ZjQ4XzAxMA=="
+            )
+        )
+        assert stored
+        assert all(e.entity_urn for e in stored)
+
+    asyncio.run(run())
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, body: str):
+        self.body = body
+
+    async def text(self) -> str:
+        return self.body
+
+
+def test_incremental_sync_in_local_timezone(local_timezone: None):
+    start = datetime(2021, 12, 17)
+    conversations = [
+        Conversation(
+            name=str(i),
+            last_activity_at=start - timedelta(hours=i),
+            entity_urn=URN(f"urn:li:fs_conversation:{i}"),
+        )
+        for i in range(5)
+    ]
+    events = {
+        str(i): [
+            ConversationEvent(
+                created_at=start - timedelta(hours=i, minutes=j),
+                entity_urn=URN(f"urn:li:fs_event:({i},{j})"),
+            )
+            for j in range(25)
+        ]
+        for i in range(5)
+    }
+
+    async def get(relative_url: str, *args: Any, **kwargs: Any) -> FakeResponse:
+        params = kwargs["params"]
+        created_before = datetime.utcfromtimestamp(params["createdBefore"] / 1000)
+        if relative_url == "/messaging/conversations":
+            elements = [
+                c
+                for c in conversations
+                if c.last_activity_at and c.last_activity_at < created_before
+            ]
+            return FakeResponse(ConversationsResponse(elements[:2], Paging(count=2)).to_json())
+        conversation_id = relative_url.split("/")[3]
+        page = [
+            e for e in events[conversation_id] if e.created_at and e.created_at <= created_before
+        ][:10]
+        return FakeResponse(ConversationResponse(page, Paging(count=10)).to_json())
+
+    async def run():
+        store = ConversationStore()
+        linkedin = LinkedInMessaging(store=store)
+        linkedin._get = get  # type: ignore
+        updated = await linkedin.incremental_sync()
+        assert [c.name for c in updated] == [str(i) for i in range(5)]
+        for i in range(5):
+            assert store.get_events(URN(f"urn:li:fs_conversation:{i}"), limit=100) == sorted(
+                events[str(i)], key=lambda e: e.created_at or datetime.min
+            )
+        assert store.high_water_mark == start
+        await linkedin.close()
+
+    asyncio.run(run())
+
+
+def test_conversation_is_saved_with_its_events():
+    conversations = from_json(
+        ConversationsResponse, data_dir.joinpath("conversations.json").read_text()
+    ).elements
+    conversation = conversations[0]
+    assert conversation.entity_urn
+
+    store = ConversationStore()
+    with mock.patch.object(store, "_save_events", side_effect=sqlite3.OperationalError):
+        with pytest.raises(sqlite3.OperationalError):
+            store.save_conversations([conversation], conversation.events)
+    # Nothing is stored if the events can't be.
+    assert store.get_conversation(conversation.entity_urn) is None
+    store.close()
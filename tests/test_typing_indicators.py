@@ -0,0 +1,59 @@
+import asyncio
+
+from linkedin_messaging import LinkedInMessaging
+from linkedin_messaging.api_objects import URN, MessageCreate
+from linkedin_messaging.typing_indicators import TypingManager
+
+
+def test_typing_is_throttled():
+    async def run():
+        sent: list[str] = []
+
+        async def set_typing(conversation_urn: URN):
+            sent.append(conversation_urn.get_id())
+
+        manager = TypingManager(set_typing, interval=0.1)
+        # Typing for one and a half intervals keeps the indicator alive until the end of the
+        # second one.
+        for _ in range(15):
+            manager.typing(URN("urn:li:fs_conversation:1"))
+            manager.typing(URN("urn:li:fs_conversation:2"))
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.25)
+        assert sent.count("1") == sent.count("2") == 3
+
+        # Typing again after the indicator has lapsed sends straight away.
+        manager.typing(URN("urn:li:fs_conversation:1"))
+        await asyncio.sleep(0)
+        assert sent.count("1") == 4
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_send_message_stops_typing():
+    async def run():
+        linkedin = LinkedInMessaging(typing_interval=0.05)
+        typing: list[URN] = []
+
+        async def set_typing(conversation_urn: URN):
+            typing.append(conversation_urn)
+
+        async def post(*args: object, **kwargs: object) -> object:
+            raise RuntimeError("sent")
+
+        linkedin.typing_indicators._set_typing = set_typing
+        linkedin._post = post  # type: ignore
+        conversation_urn = URN("urn:li:fs_conversation:1")
+        linkedin.notify_typing(conversation_urn)
+        await asyncio.sleep(0.01)
+        linkedin.notify_typing(conversation_urn)
+        try:
+            await linkedin.send_message(conversation_urn, MessageCreate())
+        except RuntimeError:
+            pass
+        await asyncio.sleep(0.1)
+        await linkedin.close()
+        assert typing == [conversation_urn]
+
+    asyncio.run(run())
@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from linkedin_messaging import URN
 
 
@@ -11,3 +15,23 @@ def test_urn_equivalence_in_tuple():
         URN("123"),
         URN("urn:test:(123,456)"),
     )
+
+
+def test_urn_parse_is_cached():
+    urn = URN("urn:li:fs_event:(123,456)")
+    assert urn is URN("urn:li:fs_event:(123,456)")
+    assert urn.prefix == "urn:li:fs_event"
+    assert urn.id_parts == ("123", "456")
+    assert str(urn) == "urn:li:fs_event:(123,456)"
+
+
+def test_urn_is_immutable():
+    urn = URN("urn:li:fs_conversation:123")
+    with pytest.raises(AttributeError):
+        urn.prefix = "urn:li:fs_event"  # type: ignore
+    assert {urn: 1}[URN("urn:li:fsd_conversation:123")] == 1
+
+
+def test_urn_pickle():
+    urn = URN("urn:li:fs_event:(123,456)")
+    assert pickle.loads(pickle.dumps(urn)) == urn